@@ -0,0 +1,491 @@
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from engine.cards import card_lookup, possible_faces
+from engine.game_management import distribute_deck, full_uno_deck
+from engine.movements import (
+    checking_legal_move,
+    livecard_automove,
+    player_available_moves,
+    turn_switcher,
+)
+from engine.printing_functions import frame_lines, print_card
+from engine.simulation import new_headless_game, simulate_games
+
+
+########################################
+# Settings
+########################################
+
+baseline_path = "benchmarks/baseline.json"
+
+# A benchmark regresses when its throughput drops, or its peak memory grows, by more than
+# this fraction of the baseline
+default_threshold = 0.2
+
+# Each benchmark is timed this many times, each right after a short run of the calibration
+# loop, and the median of the paired rates is kept
+repeats = 21
+
+# Size of the short calibration run timed before every run of a benchmark
+calibration_values = list(range(1000))
+calibration_rounds = 4
+
+# A new baseline takes each benchmark's median over this many runs of the suite
+baseline_runs = 3
+
+# A benchmark below the threshold is measured this many more times, and the median of all
+# its measurements decides whether it regressed
+confirm_retries = 2
+
+# Table sizes of the full game benchmarks, as (players, first hand count)
+game_tables = ((2, 7), (4, 7), (8, 7), (4, 15))
+
+
+########################################
+# Timing Helpers
+########################################
+
+
+# A benchmark's median rate, in operations per second and per operation of the calibration loop
+Rate = namedtuple("Rate", ["rate", "calibrated"])
+
+
+def calibration_chunk():
+    """
+    Times one short run of a fixed pure Python loop and returns its operations per second.
+    """
+    start = time.perf_counter()
+    total = 0
+    for _ in range(calibration_rounds):
+        for value in calibration_values:
+            if value & 1:
+                total += value
+    elapsed = time.perf_counter() - start
+    return calibration_rounds * len(calibration_values) / elapsed
+
+
+def paired_rate(timed_run, operations):
+    """
+    Times a benchmark repeatedly, each run paired with the calibration loop timed just before.
+
+    The machines the suite runs on (shared virtual CPUs) speed up and slow down in phases of
+    a fraction of a second, with no steal time showing in the guest, so the same code times
+    up to twice as slow from one run to the next. A calibration run timed right before each
+    run shares its phase: the median of the benchmark's rate over the calibration's rate
+    stays within a few percent where the rates alone swing by half.
+
+    Parameters
+    ----------
+    timed_run : callable
+        Called with no arguments, runs the benchmark once and returns the seconds it took.
+    operations : int
+        Number of operations one run performs.
+
+    Returns
+    -------
+    Rate
+        The median operations per second, and the median of the paired ratios.
+    """
+    rates = []
+    ratios = []
+    for _ in range(repeats):
+        calibration = calibration_chunk()
+        rate = operations / max(timed_run(), 1e-9)
+        rates.append(rate)
+        ratios.append(rate / calibration)
+    return Rate(statistics.median(rates), statistics.median(ratios))
+
+
+def calibrated_rate(run, operations):
+    """
+    Times a benchmark with paired_rate().
+
+    Parameters
+    ----------
+    run : callable
+        Called with no arguments, runs the benchmark once.
+    operations : int
+        Number of operations one call of run performs.
+    """
+
+    def timed_run():
+        start = time.perf_counter()
+        run()
+        return time.perf_counter() - start
+
+    return paired_rate(timed_run, operations)
+
+
+def calibrated_rate_on_copies(template, action, copies):
+    """
+    Times an action that changes the game it runs on, giving each call a fresh copy.
+
+    The copies are made before the clock starts, so only the action is measured.
+    """
+
+    def timed_run():
+        game_states = [template.clone() for _ in range(copies)]
+        start = time.perf_counter()
+        for game_state in game_states:
+            action(game_state)
+        return time.perf_counter() - start
+
+    return paired_rate(timed_run, copies)
+
+
+########################################
+# Micro Benchmarks
+########################################
+
+
+def bench_checking_legal_move(scale):
+    game_state = new_headless_game(4, 15, seed=1)
+    cards = list(game_state.all_players_deck[0]) * 10
+    calls = 20 * scale
+
+    def run():
+        for _ in range(calls):
+            for card in cards:
+                checking_legal_move(card, game_state)
+
+    return calibrated_rate(run, calls * len(cards))
+
+
+def bench_player_available_moves(scale, first_hand_count):
+    # Seat 1 of this deal has legal moves, so the game isn't changed by the call
+    game_state = new_headless_game(4, first_hand_count, seed=1)
+    game_state.livecard = next(iter(game_state.all_players_deck[0]))
+    calls = 2000 * scale
+
+    def run():
+        for _ in range(calls):
+            player_available_moves(game_state)
+
+    return calibrated_rate(run, calls)
+
+
+def bench_distribute_deck(scale, players_no, first_hand_count):
+    game_state = full_uno_deck(new_headless_game(players_no, first_hand_count, seed=1))
+    calls = 100 * scale
+
+    def run():
+        for _ in range(calls):
+            distribute_deck(game_state)
+
+    return calibrated_rate(run, calls)
+
+
+def bench_livecard_automove(scale, face):
+    # The card was just played by seat 1, the turn has already passed to seat 2
+    template = new_headless_game(4, 7, seed=1)
+    color = "black" if face in possible_faces[13:] else "red"
+    template.livecard = card_lookup(face, color)
+    template = turn_switcher(template)
+    return calibrated_rate_on_copies(template, livecard_automove, 500 * scale)
+
+
+def bench_print_card(scale):
+    cards = [card_lookup(face, "blue") for face in possible_faces[:13]]
+    calls = 200 * scale
+
+    def run():
+        for _ in range(calls):
+            for card in cards:
+                print_card(card)
+            frame_lines.clear()
+
+    return calibrated_rate(run, calls * len(cards))
+
+
+def micro_benchmarks(scale=1):
+    """
+    Runs the micro benchmarks of the engine's hot paths.
+
+    Parameters
+    ----------
+    scale : int, optional
+        Multiplies the number of calls of every benchmark, for steadier numbers.
+
+    Returns
+    -------
+    dict
+        The Rate of each benchmark, in calls per second, keyed by benchmark name.
+    """
+    return {name: benchmark(scale) for name, benchmark in micro_benchmark_runs().items()}
+
+
+def micro_benchmark_runs():
+    """
+    Returns the micro benchmarks, each called with the scale and returning its Rate, by name.
+    """
+    runs = {
+        "checking_legal_move": bench_checking_legal_move,
+        "player_available_moves/7": lambda scale: bench_player_available_moves(scale, 7),
+        "player_available_moves/15": lambda scale: bench_player_available_moves(scale, 15),
+        "distribute_deck/4x7": lambda scale: bench_distribute_deck(scale, 4, 7),
+        "distribute_deck/12x15": lambda scale: bench_distribute_deck(scale, 12, 15),
+        "print_card": bench_print_card,
+    }
+    for name, face in (
+        ("number", possible_faces[5]),
+        ("draw_two", possible_faces[10]),
+        ("reverse", possible_faces[11]),
+        ("skip", possible_faces[12]),
+        ("draw_four", possible_faces[13]),
+        ("wild", possible_faces[14]),
+    ):
+        runs[f"livecard_automove/{name}"] = (
+            lambda scale, face=face: bench_livecard_automove(scale, face)
+        )
+    return runs
+
+
+########################################
+# Game Benchmarks
+########################################
+
+
+def game_benchmarks(scale=1):
+    """
+    Plays full headless games at several table sizes.
+
+    Parameters
+    ----------
+    scale : int, optional
+        Multiplies the number of games of every benchmark.
+
+    Returns
+    -------
+    dict
+        The Rate of each table size, in games per second, keyed by benchmark name.
+    """
+    return {name: benchmark(scale) for name, benchmark in game_benchmark_runs().items()}
+
+
+def bench_game(scale, players_no, first_hand_count):
+    games = 200 * scale
+    return calibrated_rate(
+        lambda: simulate_games(games, players_no, first_hand_count, seed=1), games
+    )
+
+
+def game_benchmark_runs():
+    """
+    Returns the game benchmarks, each called with the scale and returning its Rate, by name.
+    """
+    return {
+        f"game/{players_no}x{first_hand_count}": (
+            lambda scale, players_no=players_no, first_hand_count=first_hand_count: bench_game(
+                scale, players_no, first_hand_count
+            )
+        )
+        for players_no, first_hand_count in game_tables
+    }
+
+
+def game_peak_memory(games=20):
+    """
+    Measures the peak memory a headless game allocates, with tracemalloc.
+
+    Parameters
+    ----------
+    games : int, optional
+        Number of games played at each table size, the highest peak is kept. One untraced
+        game runs first, so one-time allocations (lazy caches, imports) are not counted.
+
+    Returns
+    -------
+    dict
+        Peak bytes allocated while playing one game, keyed by benchmark name.
+    """
+    peaks = {}
+    for players_no, first_hand_count in game_tables:
+        simulate_games(1, players_no, first_hand_count, seed=0)
+        peak = 0
+        for seed in range(games):
+            tracemalloc.start()
+            simulate_games(1, players_no, first_hand_count, seed=seed)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        peaks[f"game/{players_no}x{first_hand_count}"] = peak
+    return peaks
+
+
+########################################
+# Baselines
+########################################
+
+
+def run_suite(scale=1):
+    """
+    Runs every benchmark.
+
+    Returns
+    -------
+    dict
+        The throughput of every benchmark, also relative to the calibration loop, the peak
+        memory per game and the environment they were measured in, in the format of the
+        JSON baselines.
+    """
+    rates = micro_benchmarks(scale)
+    rates.update(game_benchmarks(scale))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "throughput": {name: rate.rate for name, rate in rates.items()},
+        "calibrated": {name: rate.calibrated for name, rate in rates.items()},
+        "peak_memory": game_peak_memory(),
+    }
+
+
+def load_baseline(path=baseline_path):
+    """
+    Reads a JSON baseline, None if there is none yet.
+    """
+    try:
+        with open(path, encoding="utf-8") as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(results, path=baseline_path):
+    """
+    Writes benchmark results as the JSON baseline.
+    """
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write("\n")
+
+
+def median_results(runs):
+    """
+    Combines several runs of the suite into one, for recording a baseline.
+
+    Every benchmark gets its median rates over the runs, and its largest peak memory.
+    """
+    combined = dict(runs[0])
+    for key in ("throughput", "calibrated"):
+        combined[key] = {
+            name: statistics.median(run[key][name] for run in runs) for name in runs[0][key]
+        }
+    combined["peak_memory"] = {
+        name: max(run["peak_memory"][name] for run in runs) for name in runs[0]["peak_memory"]
+    }
+    return combined
+
+
+def compare(results, baseline, threshold=default_threshold):
+    """
+    Compares benchmark throughput with a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        Results of run_suite().
+    baseline : dict
+        Baseline results in the same format.
+    threshold : float, optional
+        Largest accepted drop in throughput, as a fraction of the baseline.
+
+    Returns
+    -------
+    list
+        (name, baseline rate, current rate, ratio, regressed) tuples, one per benchmark
+        present in both, where ratio is the current rate over the baseline rate, both
+        relative to the calibration loop timed along with them.
+    """
+    rows = []
+    for name, calibrated in results["calibrated"].items():
+        baseline_calibrated = baseline["calibrated"].get(name)
+        if not baseline_calibrated:
+            continue
+        ratio = calibrated / baseline_calibrated
+        rows.append(
+            (
+                name,
+                baseline["throughput"][name],
+                results["throughput"][name],
+                ratio,
+                ratio < 1 - threshold,
+            )
+        )
+    return rows
+
+
+def compare_memory(results, baseline, threshold=default_threshold):
+    """
+    Compares the peak memory per game with a baseline.
+
+    Returns
+    -------
+    list
+        (name, baseline peak, current peak, ratio, regressed) tuples, one per benchmark
+        present in both, regressed when the peak grew by more than the threshold.
+    """
+    rows = []
+    for name, peak in results["peak_memory"].items():
+        baseline_peak = baseline.get("peak_memory", {}).get(name)
+        if not baseline_peak:
+            continue
+        ratio = peak / baseline_peak
+        rows.append((name, baseline_peak, peak, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def confirm_regressions(results, baseline, threshold=default_threshold, scale=1):
+    """
+    Measures the benchmarks that look regressed again, so one noisy run doesn't fail the suite.
+
+    Each benchmark below the threshold is measured confirm_retries more times, every
+    measurement paired with its own calibration runs, and its rates in results become the
+    median of all its measurements, the first one included. The median doesn't favour the
+    fastest retry, so a real regression still shows.
+
+    Returns
+    -------
+    list
+        The rows of compare() with the confirmed rates.
+    """
+    runs = {**micro_benchmark_runs(), **game_benchmark_runs()}
+    for name, _, _, _, regressed in compare(results, baseline, threshold):
+        if not regressed or name not in runs:
+            continue
+        measurements = [Rate(results["throughput"][name], results["calibrated"][name])]
+        measurements += [runs[name](scale) for _ in range(confirm_retries)]
+        results["throughput"][name] = statistics.median(rate.rate for rate in measurements)
+        results["calibrated"][name] = statistics.median(
+            rate.calibrated for rate in measurements
+        )
+    return compare(results, baseline, threshold)
+
+
+def print_report(results, rows, memory_rows=()):
+    """
+    Prints the throughput and peak memory of each benchmark, against the baseline when
+    there is one.
+    """
+    compared = {row[0]: row for row in rows}
+    for name, rate in results["throughput"].items():
+        line = f"{name:<30} {rate:>14,.0f}/s"
+        if name in compared:
+            _, baseline_rate, _, ratio, regressed = compared[name]
+            line += f"  baseline {baseline_rate:>14,.0f}/s  {ratio:>6.2f}x"
+            if regressed:
+                line += "  REGRESSION"
+        print(line)
+    compared = {row[0]: row for row in memory_rows}
+    for name, peak in results["peak_memory"].items():
+        line = f"{name:<30} peak memory {peak / 1024:>8.1f} KiB per game"
+        if name in compared:
+            _, baseline_peak, _, ratio, regressed = compared[name]
+            line += f"  baseline {baseline_peak / 1024:>8.1f} KiB  {ratio:>6.2f}x"
+            if regressed:
+                line += "  REGRESSION"
+        print(line)
+    sys.stdout.flush()
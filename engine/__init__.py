@@ -1,2 +1,42 @@
-from .game_management import set_game
-from .movements import main_move_manager
+from importlib import import_module
+
+# Public names of the engine and the module defining each. They are imported on first use,
+# so a script only pays for the parts of the engine it uses: headless games never load the
+# prompt library, SQLite or the process pool.
+_exports = {
+    "set_game": "game_management",
+    "main_move_manager": "movements",
+    "simulate_game": "simulation",
+    "simulate_games": "simulation",
+    "run_farm": "farm",
+    "GameState": "game_state",
+    "EventLog": "event_log",
+    "replay_log": "replay",
+    "ResultsStore": "results_store",
+    "Session": "session",
+    "register_rule_set": "rules",
+    "rule_sets": "rules",
+    "Strategy": "strategies",
+    "SeatView": "strategies",
+    "EloLadder": "ladder",
+    "run_ladder": "ladder",
+    "CardTracker": "tracker",
+    "attach_tracker": "tracker",
+    "save_game": "snapshot",
+    "load_game": "snapshot",
+    "GameAnalytics": "analytics",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_exports[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
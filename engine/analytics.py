@@ -0,0 +1,536 @@
+import json
+import math
+from statistics import NormalDist
+from .cards import possible_faces
+
+# Version of the JSON layout written by GameAnalytics.save()
+analytics_version = 1
+
+# Percentiles shown by the report
+report_percentiles = (5, 50, 90, 99)
+
+
+def z_score(confidence):
+    """
+    Returns the two-sided normal critical value of a confidence level, 1.96 for 0.95.
+    """
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(successes, trials, confidence=0.95):
+    """
+    Wilson score interval of a proportion, well behaved for rare events and small samples.
+
+    Returns
+    -------
+    tuple
+        The lower and upper bounds, (0.0, 1.0) when there are no trials.
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    z = z_score(confidence)
+    share = successes / trials
+    denominator = 1 + z * z / trials
+    center = (share + z * z / (2 * trials)) / denominator
+    spread = z * math.sqrt(share * (1 - share) / trials + z * z / (4 * trials * trials))
+    spread /= denominator
+    return max(0.0, center - spread), min(1.0, center + spread)
+
+
+########################################
+# Streaming Statistics
+########################################
+
+
+class RunningStats:
+    """
+    Count, mean, variance, minimum and maximum of a stream of values, in constant memory.
+
+    The mean and variance are updated with Welford's algorithm, and two instances are
+    merged with Chan's parallel formula, so workers can each keep their own and be merged.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        """
+        Adds the values summarized by another RunningStats.
+        """
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        for value in (other.minimum, other.maximum):
+            if self.minimum is None or value < self.minimum:
+                self.minimum = value
+            if self.maximum is None or value > self.maximum:
+                self.maximum = value
+        return self
+
+    @property
+    def variance(self):
+        """
+        Sample variance, 0 with fewer than two values.
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def mean_interval(self, confidence=0.95):
+        """
+        Normal confidence interval of the mean.
+        """
+        if self.count == 0:
+            return math.nan, math.nan
+        spread = z_score(confidence) * math.sqrt(self.variance / self.count)
+        return self.mean - spread, self.mean + spread
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data["count"]
+        stats.mean = data["mean"]
+        stats.m2 = data["m2"]
+        stats.minimum = data["minimum"]
+        stats.maximum = data["maximum"]
+        return stats
+
+
+class Histogram:
+    """
+    Fixed-width histogram of non-negative values, values past the last bin counted apart.
+
+    Parameters
+    ----------
+    bin_width : int
+        Width of each bin.
+    bins : int
+        Number of bins, the histogram covers [0, bin_width * bins).
+    """
+
+    def __init__(self, bin_width, bins):
+        self.bin_width = bin_width
+        self.counts = [0] * bins
+        self.overflow = 0
+
+    def add(self, value):
+        index = int(value // self.bin_width)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        else:
+            self.overflow += 1
+
+    def merge(self, other):
+        """
+        Adds the counts of a histogram with the same bins.
+        """
+        if (other.bin_width, len(other.counts)) != (self.bin_width, len(self.counts)):
+            raise ValueError("Only histograms with the same bins can be merged")
+        self.counts = [count + more for count, more in zip(self.counts, other.counts)]
+        self.overflow += other.overflow
+        return self
+
+    def rows(self, max_rows=12):
+        """
+        Groups the bins holding values into at most max_rows rows.
+
+        Returns
+        -------
+        list
+            (low, high, count) tuples, values in [low, high), and the overflow last as
+            (low, None, count) when there is any.
+        """
+        filled = [index for index, count in enumerate(self.counts) if count]
+        rows = []
+        if filled:
+            first, last = filled[0], filled[-1] + 1
+            step = math.ceil((last - first) / max_rows)
+            for start in range(first, last, step):
+                stop = min(start + step, last)
+                rows.append(
+                    (
+                        start * self.bin_width,
+                        stop * self.bin_width,
+                        sum(self.counts[start:stop]),
+                    )
+                )
+        if self.overflow:
+            rows.append((len(self.counts) * self.bin_width, None, self.overflow))
+        return rows
+
+    def to_dict(self):
+        return {"bin_width": self.bin_width, "counts": self.counts, "overflow": self.overflow}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["bin_width"], len(data["counts"]))
+        histogram.counts = list(data["counts"])
+        histogram.overflow = data["overflow"]
+        return histogram
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch of non-negative values with a bounded relative error (DDSketch).
+
+    Values are counted in logarithmic buckets, bucket i holding (gamma^(i-1), gamma^i], so
+    any quantile is estimated within relative_accuracy of the true value. Zero and negative
+    values share one count. When more than max_buckets buckets are in use the lowest ones
+    are collapsed together, which only blurs the smallest quantiles, so memory stays fixed
+    however many values are added.
+
+    Parameters
+    ----------
+    relative_accuracy : float, optional
+        Relative error of the estimated quantiles.
+    max_buckets : int, optional
+        Maximum number of buckets kept.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        buckets = self.buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self.collapse()
+
+    def collapse(self):
+        """
+        Folds the lowest buckets into the lowest one kept, down to max_buckets buckets.
+        """
+        indexes = sorted(self.buckets)
+        excess = len(indexes) - self.max_buckets
+        if excess > 0:
+            kept = indexes[excess]
+            self.buckets[kept] += sum(self.buckets.pop(index) for index in indexes[:excess])
+
+    def merge(self, other):
+        """
+        Adds the values counted by a sketch with the same relative accuracy.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy can be merged")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.collapse()
+        return self
+
+    def quantile(self, share):
+        """
+        Estimates the value below which share (between 0 and 1) of the values fall.
+        """
+        if self.count == 0:
+            return math.nan
+        rank = share * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "buckets": [[index, count] for index, count in sorted(self.buckets.items())],
+            "zero_count": self.zero_count,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["relative_accuracy"], data["max_buckets"])
+        sketch.buckets = {index: count for index, count in data["buckets"]}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        return sketch
+
+
+class Distribution:
+    """
+    Running stats, a quantile sketch and a histogram of the same stream of values.
+    """
+
+    def __init__(self, bin_width, bins):
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch()
+        self.histogram = Histogram(bin_width, bins)
+
+    def add(self, value):
+        self.stats.add(value)
+        self.sketch.add(value)
+        self.histogram.add(value)
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+        return self
+
+    def to_dict(self):
+        return {
+            "stats": self.stats.to_dict(),
+            "sketch": self.sketch.to_dict(),
+            "histogram": self.histogram.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        distribution = cls.__new__(cls)
+        distribution.stats = RunningStats.from_dict(data["stats"])
+        distribution.sketch = QuantileSketch.from_dict(data["sketch"])
+        distribution.histogram = Histogram.from_dict(data["histogram"])
+        return distribution
+
+
+########################################
+# Game Analytics
+########################################
+
+
+class GameAnalytics:
+    """
+    Streaming sink of headless game results, summarizing any number of games in fixed memory.
+
+    Each GameResult updates the distributions of game length (turns) and cards drawn, the
+    wins of every seat per table size, how often the draw pile runs out, and, per face of
+    the starting card, the games' length and how often the first seat wins. Nothing is kept
+    per game, so runs of 10^8 games take the same memory as runs of ten. Sinks filled by
+    different workers or runs are combined with merge(), and saved to and loaded from JSON.
+
+    Results of engines that don't report the cards drawn, reshuffles or starting card
+    (None fields) are left out of those statistics only.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.turns = Distribution(bin_width=5, bins=200)
+        self.cards_drawn = Distribution(bin_width=5, bins=200)
+        self.cards_played = RunningStats()
+        self.reshuffles = RunningStats()
+        self.exhausted_games = 0
+        # Wins of each seat, keyed by table size
+        self.seat_wins = {}
+        # [games, first seat wins, RunningStats of turns] per starting card face
+        self.starting_faces = {}
+
+    def add(self, result, players_no):
+        """
+        Adds the result of one game.
+
+        Parameters
+        ----------
+        result : GameResult
+            Result of a headless game.
+        players_no : int
+            Total number of players of the game.
+        """
+        self.games += 1
+        self.turns.add(result.turns)
+        self.cards_played.add(result.cards_played)
+        if result.cards_drawn is not None:
+            self.cards_drawn.add(result.cards_drawn)
+        if result.reshuffles is not None:
+            self.reshuffles.add(result.reshuffles)
+            if result.reshuffles:
+                self.exhausted_games += 1
+
+        seat_wins = self.seat_wins.get(players_no)
+        if seat_wins is None:
+            seat_wins = self.seat_wins[players_no] = [0] * players_no
+        seat_wins[result.winner - 1] += 1
+
+        if result.starting_card is not None:
+            face = result.starting_card.face
+            entry = self.starting_faces.get(face)
+            if entry is None:
+                entry = self.starting_faces[face] = [0, 0, RunningStats()]
+            entry[0] += 1
+            entry[1] += result.winner == 1
+            entry[2].add(result.turns)
+
+    def merge(self, other):
+        """
+        Adds the games summarized by another GameAnalytics, e.g. from another worker.
+        """
+        self.games += other.games
+        self.turns.merge(other.turns)
+        self.cards_drawn.merge(other.cards_drawn)
+        self.cards_played.merge(other.cards_played)
+        self.reshuffles.merge(other.reshuffles)
+        self.exhausted_games += other.exhausted_games
+        for players_no, wins in other.seat_wins.items():
+            seat_wins = self.seat_wins.setdefault(players_no, [0] * players_no)
+            self.seat_wins[players_no] = [count + more for count, more in zip(seat_wins, wins)]
+        for face, (games, first_seat_wins, turns) in other.starting_faces.items():
+            entry = self.starting_faces.setdefault(face, [0, 0, RunningStats()])
+            entry[0] += games
+            entry[1] += first_seat_wins
+            entry[2].merge(turns)
+        return self
+
+    def to_dict(self):
+        return {
+            "version": analytics_version,
+            "games": self.games,
+            "turns": self.turns.to_dict(),
+            "cards_drawn": self.cards_drawn.to_dict(),
+            "cards_played": self.cards_played.to_dict(),
+            "reshuffles": self.reshuffles.to_dict(),
+            "exhausted_games": self.exhausted_games,
+            "seat_wins": {str(players_no): wins for players_no, wins in self.seat_wins.items()},
+            "starting_faces": {
+                face: [games, first_seat_wins, turns.to_dict()]
+                for face, (games, first_seat_wins, turns) in self.starting_faces.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != analytics_version:
+            raise ValueError(f"Analytics version {data.get('version')} isn't supported")
+        analytics = cls()
+        analytics.games = data["games"]
+        analytics.turns = Distribution.from_dict(data["turns"])
+        analytics.cards_drawn = Distribution.from_dict(data["cards_drawn"])
+        analytics.cards_played = RunningStats.from_dict(data["cards_played"])
+        analytics.reshuffles = RunningStats.from_dict(data["reshuffles"])
+        analytics.exhausted_games = data["exhausted_games"]
+        analytics.seat_wins = {
+            int(players_no): list(wins) for players_no, wins in data["seat_wins"].items()
+        }
+        analytics.starting_faces = {
+            face: [games, first_seat_wins, RunningStats.from_dict(turns)]
+            for face, (games, first_seat_wins, turns) in data["starting_faces"].items()
+        }
+        return analytics
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as analytics_file:
+            json.dump(self.to_dict(), analytics_file)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as analytics_file:
+            return cls.from_dict(json.load(analytics_file))
+
+    def report(self, confidence=0.95):
+        """
+        Formats the summary with confidence intervals of the means and proportions.
+
+        Parameters
+        ----------
+        confidence : float, optional
+            Confidence level of the intervals.
+
+        Returns
+        -------
+        str
+            The report, one statistic per line.
+        """
+        level = f"{confidence:.0%} CI"
+        lines = [f"Games analysed  : {self.games}"]
+        if not self.games:
+            return "\n".join(lines)
+
+        for label, distribution in (
+            ("Turns per game", self.turns),
+            ("Cards drawn", self.cards_drawn),
+        ):
+            stats = distribution.stats
+            if not stats.count:
+                continue
+            low, high = stats.mean_interval(confidence)
+            lines.append(
+                f"{label:<16}: mean {stats.mean:.2f} ({level} {low:.2f}-{high:.2f}), "
+                f"sd {math.sqrt(stats.variance):.2f}, min {stats.minimum}, max {stats.maximum}"
+            )
+            lines.append(
+                " " * 18
+                + ", ".join(
+                    f"p{percentile} {distribution.sketch.quantile(percentile / 100):.0f}"
+                    for percentile in report_percentiles
+                )
+            )
+        if self.reshuffles.count:
+            low, high = wilson_interval(self.exhausted_games, self.reshuffles.count, confidence)
+            lines.append(
+                f"Draw pile ran out: {self.exhausted_games / self.reshuffles.count:.2%} of games "
+                f"({level} {low:.2%}-{high:.2%}), {self.reshuffles.mean:.3f} reshuffles per game"
+            )
+
+        lines.append("Turns per game histogram:-")
+        rows = self.turns.histogram.rows()
+        widest = max(count for _, _, count in rows)
+        for low, high, count in rows:
+            bounds = f"{low}-{high - 1}" if high is not None else f"{low}+"
+            bar = "#" * max(1, round(40 * count / widest))
+            lines.append(f"  {bounds:>9} {count:>10} {bar}")
+
+        for players_no, wins in sorted(self.seat_wins.items()):
+            games = sum(wins)
+            lines.append(
+                f"Seat win rates, {players_no} players ({games} games, fair share "
+                f"{1 / players_no:.1%}):-"
+            )
+            for seat, seat_wins in enumerate(wins, start=1):
+                low, high = wilson_interval(seat_wins, games, confidence)
+                lines.append(
+                    f"  Seat {seat:<4}{seat_wins / games:>8.2%}  ({level} {low:.2%}-{high:.2%})"
+                )
+
+        if self.starting_faces:
+            lines.append("By starting card face (first seat win rate, turns per game):-")
+            for face in sorted(self.starting_faces, key=possible_faces.index):
+                games, first_seat_wins, turns = self.starting_faces[face]
+                low, high = wilson_interval(first_seat_wins, games, confidence)
+                turns_low, turns_high = turns.mean_interval(confidence)
+                lines.append(
+                    f"  {face.strip():>3} {games:>10} games  seat 1 {first_seat_wins / games:>7.2%} "
+                    f"({low:.2%}-{high:.2%})  turns {turns.mean:.2f} "
+                    f"({turns_low:.2f}-{turns_high:.2f})"
+                )
+        return "\n".join(lines)
@@ -0,0 +1,134 @@
+########################################
+# Card Faces and Colors
+########################################
+
+# Adding a space before to accomodate +2 and +4
+possible_faces = [
+    " 0",
+    " 1",
+    " 2",
+    " 3",
+    " 4",
+    " 5",
+    " 6",
+    " 7",
+    " 8",
+    " 9",
+    "+2",
+    " ↕",
+    " Ø",
+    "+4",
+    " W",
+]
+possible_colors = ["red", "blue", "yellow", "green", "black"]
+
+# Face shown on a wild card once its color has been declared
+recolor_face = "  "
+
+
+########################################
+# Card Flyweights
+########################################
+
+
+class Card:
+    """
+    An immutable UNO card.
+
+    There is exactly one Card object per distinct (face, color) pair, so cards are compared
+    and hashed by identity and every deck, hand and pile shares the same instances.
+    Use card_lookup() or card_from_id() instead of creating cards directly.
+
+    Attributes
+    ----------
+    card_id : int
+        Small integer id of the card, an index into all_cards.
+    face : str
+        Face of the card, one of possible_faces or the recolor face.
+    color : str
+        Color of the card, one of possible_colors.
+    is_wild : bool
+        True for the black +4 and W cards.
+    """
+
+    __slots__ = ("card_id", "face", "color", "is_wild")
+
+    def __init__(self, card_id, face, color):
+        object.__setattr__(self, "card_id", card_id)
+        object.__setattr__(self, "face", face)
+        object.__setattr__(self, "color", color)
+        object.__setattr__(self, "is_wild", color == possible_colors[4])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card objects are immutable")
+
+    def __repr__(self):
+        return f"Card({self.face!r}, {self.color!r})"
+
+    def __reduce__(self):
+        # Unpickling (e.g. results sent back from worker processes) returns the shared flyweight
+        return (card_from_id, (self.card_id,))
+
+    def as_dict(self):
+        """
+        Returns the card in the {"face": ..., "color": ...} form used by the winners report.
+        """
+        return {"face": self.face, "color": self.color}
+
+
+def _build_cards():
+    """
+    Builds the flyweight table: every colored face, the two wild cards and the four recolored wilds.
+    """
+    cards = []
+    for color in possible_colors[:4]:
+        for face in possible_faces[:13]:
+            cards.append(Card(len(cards), face, color))
+    for face in possible_faces[13:]:
+        cards.append(Card(len(cards), face, possible_colors[4]))
+    for color in possible_colors[:4]:
+        cards.append(Card(len(cards), recolor_face, color))
+    return tuple(cards)
+
+
+all_cards = _build_cards()
+_cards_by_key = {(card.face, card.color): card for card in all_cards}
+
+# Live cards standing for a wild card after its color was declared
+wild_recolors = {card.color: card for card in all_cards if card.face == recolor_face}
+
+
+def card_from_id(card_id):
+    """
+    Returns the shared Card with the given id.
+
+    Parameters
+    ----------
+    card_id : int
+        Id of the card, between 0 and len(all_cards) - 1.
+
+    Returns
+    -------
+    Card
+        The flyweight card.
+    """
+    return all_cards[card_id]
+
+
+def card_lookup(face, color):
+    """
+    Returns the shared Card with the given face and color.
+
+    Parameters
+    ----------
+    face : str
+        Face of the card.
+    color : str
+        Color of the card.
+
+    Returns
+    -------
+    Card
+        The flyweight card.
+    """
+    return _cards_by_key[(face, color)]
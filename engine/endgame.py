@@ -0,0 +1,330 @@
+import random
+from collections import OrderedDict
+from . import profiling
+from .event_log import card_id_of
+from .ismcts import apply_action, determinize, legal_actions
+from .movements import player_available_moves
+
+# Outcome of a searched position for the searching player, unknown when the search was cut
+# short (depth, node budget or a reshuffle) before proving a win or a loss
+outcome_loss, outcome_unknown, outcome_win = range(3)
+
+# Share of a win each outcome is scored as when comparing moves
+outcome_scores = (0.0, 0.5, 1.0)
+
+# Number of positions whose sampled hidden cards are kept, so a position seen again is
+# searched on the same samples and finds their positions in the transposition table
+sample_cache_size = 1024
+
+
+########################################
+# Transposition Table
+########################################
+
+
+class TranspositionTable:
+    """
+    Bounded map of searched positions to their outcome, evicting the least recently used.
+
+    Parameters
+    ----------
+    capacity : int
+        Maximum number of positions kept.
+    """
+
+    def __init__(self, capacity=200000):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Returns the entry stored for a position, None if it isn't in the table.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return entry
+
+    def store(self, key, entry):
+        entries = self.entries
+        entries[key] = entry
+        entries.move_to_end(key)
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+
+
+########################################
+# Endgame Solver
+########################################
+
+
+class EndgameSolver:
+    """
+    Exact search of the end of a game, for AI seats and for analysis.
+
+    Once the hands hold few cards in total, every line of play is searched with the engine's
+    own rules (player_available_moves for legality and draws, play_move_management and the
+    card effects for the consequences) until someone wins. A position is a proven win for the
+    searching seat if it has a move that wins against every reply of the other seats, a proven
+    loss if every move loses, and unknown when the search is cut short. The draws of a position
+    are those of its folded deck, so the search is deterministic, and it stops at a reshuffle.
+
+    Searched positions are kept in a bounded LRU transposition table shared by every move the
+    solver makes. In perfect information mode the folded deck of a game only shrinks from its
+    end between reshuffles, so the positions of the next turn were mostly searched already and
+    come from the table. In the default mode the seat doesn't see the other hands and the
+    folded deck: each move is searched on several samples of them (like ISMCTS samples),
+    and the move with the best average outcome is played. Sampled positions are keyed on
+    the sample itself, its hands and the order of its folded deck, and the samples of a
+    position are kept for when the seat sees the same position again, so a repeated
+    position is searched on the same samples and comes from the table.
+
+    Until the hands get down to the threshold, or when the seat has a single move, the
+    fallback strategy decides. In perfect information mode, once the solver has taken over a
+    game it plays it to the end, even when forced draws fill the hands again, so it doesn't
+    throw away a line it proved.
+
+    Parameters
+    ----------
+    threshold : int, optional
+        Total number of cards in hand at or below which the solver takes over.
+    perfect_info : bool, optional
+        Search the actual hands and folded deck, for analysis, instead of samples.
+    samples : int, optional
+        Number of sampled hands searched per move without perfect information.
+    max_depth : int, optional
+        Maximum number of turns searched ahead.
+    max_nodes : int, optional
+        Maximum number of positions searched per move, shared by the samples, beyond which
+        they are unknown.
+    table_size : int, optional
+        Capacity of the transposition table.
+    fallback : object, optional
+        Strategy with a choose_move(game_state, available_moves) method deciding the moves
+        the solver doesn't. By default they are random, like the easy AI.
+    seed : int, optional
+        Seed of the sampling.
+    """
+
+    def __init__(
+        self,
+        threshold=6,
+        perfect_info=False,
+        samples=8,
+        max_depth=8,
+        max_nodes=2000,
+        table_size=200000,
+        fallback=None,
+        seed=None,
+    ):
+        self.threshold = threshold
+        self.perfect_info = perfect_info
+        self.samples = samples
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.table = TranspositionTable(table_size)
+        self.fallback = fallback
+        self.rng = random.Random(seed)
+        self.sampled_roots = TranspositionTable(sample_cache_size)
+        self.nodes = 0
+        self.node_budget = max_nodes
+        self.root_reshuffles = 0
+        self.solved_deal = None
+
+    def is_active(self, game_state):
+        """
+        Checks whether the solver plays the game, because the hands hold few enough cards
+        or it already took the game over in perfect information mode.
+        """
+        if self.perfect_info and game_state.started_at is not None:
+            if game_state.started_at == self.solved_deal:
+                return True
+        return sum(map(len, game_state.all_players_deck)) <= self.threshold
+
+    def choose_move(self, game_state, available_moves):
+        """
+        Plays the move with the best searched outcome in the endgame, the fallback's move before.
+
+        Returns
+        -------
+        tuple
+            The position of the card in available_moves (starting from 1) and the color to declare,
+            None for cards other than wild cards.
+        """
+        if len(legal_actions(available_moves)) > 1 and self.is_active(game_state):
+            self.solved_deal = game_state.started_at
+            scores = self.evaluate(game_state, available_moves)
+            best_score = max(scores.values())
+            card, color = self.rng.choice(
+                [action for action, score in scores.items() if score == best_score]
+            )
+            return available_moves.index(card) + 1, color
+        if self.fallback is not None:
+            return self.fallback.choose_move(game_state, available_moves)
+        return game_state.rng.randint(1, len(available_moves)), None
+
+    def evaluate(self, game_state, available_moves):
+        """
+        Scores every move of the player to move.
+
+        Parameters
+        ----------
+        game_state : GameState
+            State of the game, with the searching seat to move.
+        available_moves : list
+            List of available legal moves for the seat.
+
+        Returns
+        -------
+        dict
+            The score of every (card, color) action of legal_actions(): the share of
+            searched samples it wins, unknown outcomes counting as half a win. In perfect
+            information mode 1.0, 0.5 or 0.0 for a proven win, unknown or proven loss.
+        """
+        actions = legal_actions(available_moves)
+        scores = dict.fromkeys(actions, 0.0)
+        # Search turns are part of the decision phase, they aren't timed as turns of their own
+        profiler = profiling.phase_profiler
+        profiling.phase_profiler = None
+        try:
+            if self.perfect_info:
+                root = game_state.clone(rng=self.rng)
+                root.headless = True
+                root.ai_strategies = {}
+                epoch = (game_state.started_at, game_state.reshuffles)
+                roots = [(root, epoch)]
+            else:
+                roots = [(root, None) for root in self.sample_roots(game_state)]
+            budget = self.max_nodes // len(roots)
+            for root, epoch in roots:
+                self.nodes = 0
+                self.node_budget = budget
+                self.root_reshuffles = root.reshuffles
+                for action in actions:
+                    child = root.clone(rng=self.rng)
+                    apply_action(child, available_moves, action)
+                    outcome = self.search(child, root.move_counter, self.max_depth - 1, epoch)
+                    scores[action] += outcome_scores[outcome]
+        finally:
+            profiling.phase_profiler = profiler
+        return {action: score / len(roots) for action, score in scores.items()}
+
+    def sample_roots(self, game_state):
+        """
+        Returns the samples of the hidden cards searched from a position of the seat to move.
+
+        The samples are drawn the first time the seat sees the position, from what it knows:
+        its own hand, the live card, the table deck and the size of every hand and pile.
+        The roots are never modified by the search, so they are reused as they are.
+        """
+        observer = game_state.move_counter
+        key = (
+            game_state.rule_set,
+            observer,
+            game_state.move_direction,
+            game_state.livecard.card_id,
+            game_state.reshuffles,
+            tuple(sorted(map(card_id_of, game_state.all_players_deck[observer - 1]))),
+            tuple(map(len, game_state.all_players_deck)),
+            tuple(sorted(map(card_id_of, game_state.table_deck))),
+            len(game_state.folded_deck),
+        )
+        roots = self.sampled_roots.get(key)
+        if roots is None:
+            roots = [
+                determinize(game_state, observer, self.rng)
+                for _ in range(max(self.samples, 1))
+            ]
+            self.sampled_roots.store(key, roots)
+        return roots
+
+    def search(self, game_state, player_id, depth, epoch):
+        """
+        Searches a position for the seat player_id, assuming the other seats play against it.
+
+        Parameters
+        ----------
+        game_state : GameState
+            A headless copy of the game, with the turn to play. It isn't modified.
+        player_id : int
+            Id of the searching seat.
+        depth : int
+            Number of turns left to search.
+        epoch : hashable
+            Identifies the order of the folded deck the search draws from, None for a sample,
+            whose positions are keyed on the order of their folded deck itself.
+
+        Returns
+        -------
+        int
+            outcome_win, outcome_loss or outcome_unknown.
+        """
+        if game_state.winner is not None:
+            return outcome_win if game_state.winner == player_id else outcome_loss
+        if depth <= 0 or game_state.reshuffles != self.root_reshuffles:
+            return outcome_unknown
+
+        if epoch is None:
+            folded = tuple(map(card_id_of, game_state.folded_deck))
+        else:
+            # Within an epoch the folded deck is its first cards, so its size stands for its order
+            folded = len(game_state.folded_deck)
+        key = (
+            epoch,
+            player_id,
+            game_state.rule_set,
+            game_state.move_counter,
+            game_state.move_direction,
+            game_state.livecard.card_id,
+            folded,
+            tuple(
+                tuple(sorted(map(card_id_of, hand))) for hand in game_state.all_players_deck
+            ),
+        )
+        entry = self.table.get(key)
+        if entry is not None:
+            outcome, searched_depth = entry
+            if outcome != outcome_unknown or searched_depth >= depth:
+                return outcome
+        if self.nodes >= self.node_budget:
+            return outcome_unknown
+        self.nodes += 1
+
+        hand = game_state.all_players_deck[game_state.move_counter - 1]
+        available_moves = hand.legal_moves(game_state.livecard)
+        if available_moves:
+            # Nothing to draw, the children are copies so the position is left as it is
+            node = game_state
+        else:
+            node = game_state.clone(rng=self.rng)
+            available_moves, node = player_available_moves(node)
+            if node.reshuffles != self.root_reshuffles:
+                return outcome_unknown
+        actions = legal_actions(available_moves)
+        searching = node.move_counter == player_id
+        result = outcome_loss if searching else outcome_win
+        for action in actions:
+            if len(actions) == 1 and node is not game_state:
+                child = node
+            else:
+                child = node.clone(rng=self.rng)
+            apply_action(child, available_moves, action)
+            outcome = self.search(child, player_id, depth - 1, epoch)
+            if outcome == outcome_unknown:
+                result = outcome_unknown
+            elif (outcome == outcome_win) == searching:
+                # The seat to move found a winning line for its side
+                result = outcome
+                break
+
+        if self.nodes < self.node_budget or result != outcome_unknown:
+            self.table.store(key, (result, depth))
+        return result
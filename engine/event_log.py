@@ -0,0 +1,274 @@
+import struct
+from operator import attrgetter
+from .cards import card_from_id
+
+
+########################################
+# Event Kinds
+########################################
+
+# Kind byte of each event, a log is a sequence of games each starting with a deal event
+(
+    deal_event,
+    draw_event,
+    play_event,
+    skip_event,
+    reverse_event,
+    recolor_event,
+    pass_event,
+    win_event,
+    swap_event,
+) = range(9)
+
+event_names = ("deal", "draw", "play", "skip", "reverse", "recolor", "pass", "win", "swap")
+
+# Every log file starts with this, so replay can refuse anything else. The digit is the
+# version of the format.
+log_magic = b"UNOLOG1\n"
+
+# Each event is a kind byte, a 16 bit player id and a little-endian payload length, then the payload
+event_header = struct.Struct("<BHI")
+# Header and payload of an event carrying a single card id, the most common kind
+card_event = struct.Struct("<BHIB")
+# Deal payload header: players, first hand count, deck count and the length of the rule set
+# name, followed by the name and the card ids
+deal_header = struct.Struct("<HHHB")
+# Swap payload: the player id the hands were swapped with
+swap_payload = struct.Struct("<H")
+# Win payload: cards played, reshuffles, folded and table deck sizes, then every hand size
+win_header = struct.Struct("<IIII")
+
+card_id_of = attrgetter("card_id")
+
+# Events are buffered in memory and written out, between games, once this many bytes are waiting
+flush_threshold = 1 << 16
+
+
+########################################
+# Writing Logs
+########################################
+
+
+class EventBuffer:
+    """
+    Packs game events into an in-memory buffer, in the format of the log files.
+
+    Replay attaches one to the games it plays again, to compare the events the engine
+    produces with the logged ones.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def record(self, kind, player, payload=b""):
+        """
+        Adds an event with an arbitrary payload to the log.
+        """
+        self.buffer += event_header.pack(kind, player, len(payload))
+        self.buffer += payload
+
+    def record_card(self, kind, player, card):
+        """
+        Adds an event whose payload is a single card to the log.
+        """
+        self.buffer += card_event.pack(kind, player, 1, card.card_id)
+
+    def record_deal(self, game_state):
+        """
+        Adds the deal of a game: every hand, the live card and the folded deck from bottom to top.
+        """
+        if len(self.buffer) >= flush_threshold:
+            self.flush()
+        rule_set = game_state.rule_set.encode("ascii")
+        card_ids = bytearray(
+            deal_header.pack(
+                game_state.players_no,
+                game_state.first_hand_count,
+                game_state.deck_count,
+                len(rule_set),
+            )
+        )
+        card_ids += rule_set
+        for hand in game_state.all_players_deck:
+            card_ids.extend(map(card_id_of, hand))
+        card_ids.append(game_state.livecard.card_id)
+        card_ids.extend(map(card_id_of, game_state.folded_deck))
+        self.record(deal_event, 0, card_ids)
+
+    def record_win(self, game_state):
+        """
+        Adds the win of the player to move, with a digest of the final state for replay to check.
+        """
+        hand_sizes = [len(hand) for hand in game_state.all_players_deck]
+        payload = win_header.pack(
+            game_state.cards_played,
+            game_state.reshuffles,
+            len(game_state.folded_deck),
+            len(game_state.table_deck),
+        ) + struct.pack(f"<{len(hand_sizes)}I", *hand_sizes)
+        self.record(win_event, game_state.move_counter, payload)
+
+    def flush(self):
+        """
+        Nothing to write, the events stay in the buffer until they are read or cleared.
+        """
+
+
+class EventLog(EventBuffer):
+    """
+    Append-only binary log of game events.
+
+    Events are packed into an in-memory buffer and written to the file in large chunks
+    between games, so an event costs a few bytes of buffer and no system call. Card events
+    are 8 bytes (header and card id), a deal is one byte per card of the game.
+
+    Parameters
+    ----------
+    path : str
+        Path of the log file. Events are appended to an existing log.
+
+    Raises
+    ------
+    ValueError
+        If the file exists but isn't an event log of this format version, which appending
+        to would leave unreadable.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.buffer += log_magic
+            return
+        with open(path, "rb") as log_file:
+            header = log_file.read(len(log_magic))
+        try:
+            check_log_header(path, header)
+        except ValueError:
+            self.file.close()
+            raise
+
+    def flush(self):
+        """
+        Writes the buffered events to the file.
+        """
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        """
+        Writes the buffered events and closes the file.
+        """
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+########################################
+# Reading Logs
+########################################
+
+
+def check_log_header(path, header):
+    """
+    Checks that a file starts with the magic line of this log format version.
+
+    Raises
+    ------
+    ValueError
+        If the header is another version's, or not a log's at all.
+    """
+    if header != log_magic:
+        if header.startswith(log_magic[:-2]):
+            raise ValueError(f"{path} is an event log of an unsupported format version")
+        raise ValueError(f"{path} is not a game event log")
+
+
+def read_events(path):
+    """
+    Reads the events of a log file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the log file.
+
+    Yields
+    ------
+    tuple
+        The kind, the player id and the payload bytes of each event, in order.
+
+    Raises
+    ------
+    ValueError
+        If the file isn't an event log or ends in the middle of an event.
+    """
+    with open(path, "rb") as log_file:
+        data = log_file.read()
+    check_log_header(path, data[: len(log_magic)])
+    try:
+        yield from parse_events(data, len(log_magic))
+    except ValueError:
+        raise ValueError(f"{path} ends in the middle of an event") from None
+
+
+def parse_events(data, offset=0):
+    """
+    Reads the events packed in a buffer, from offset to its end.
+
+    Yields
+    ------
+    tuple
+        The kind, the player id and the payload bytes of each event, in order.
+
+    Raises
+    ------
+    ValueError
+        If the buffer ends in the middle of an event.
+    """
+    header_size = event_header.size
+    while offset < len(data):
+        if offset + header_size > len(data):
+            raise ValueError("The events end in the middle of an event")
+        kind, player, payload_size = event_header.unpack_from(data, offset)
+        offset += header_size
+        payload = bytes(data[offset : offset + payload_size])
+        if len(payload) != payload_size:
+            raise ValueError("The events end in the middle of an event")
+        offset += payload_size
+        yield kind, player, payload
+
+
+def deal_rule_set(payload):
+    """
+    Returns the name of the rule set recorded in the payload of a deal event.
+    """
+    rule_set_size = deal_header.unpack_from(payload)[3]
+    return payload[deal_header.size : deal_header.size + rule_set_size].decode("ascii")
+
+
+def describe_event(kind, player, payload):
+    """
+    Returns a one line description of an event, used by step by step replay.
+    """
+    name = event_names[kind] if kind < len(event_names) else f"unknown({kind})"
+    if kind in (draw_event, play_event, recolor_event):
+        return f"{name:<8} Player-{player} {card_from_id(payload[0])}"
+    if kind == deal_event:
+        players_no, first_hand_count, deck_count, _ = deal_header.unpack_from(payload)
+        return (
+            f"{name:<8} {players_no} players, {first_hand_count} cards each, "
+            f"{deck_count} deck(s), {deal_rule_set(payload)} rules"
+        )
+    if kind == swap_event:
+        (other_player,) = swap_payload.unpack(payload)
+        return f"{name:<8} Player-{player} with Player-{other_player}"
+    return f"{name:<8} Player-{player}"
@@ -0,0 +1,239 @@
+import os
+import time
+from collections import Counter
+from .simulation import simulate_game
+
+
+########################################
+# Report Statistics
+########################################
+
+
+def new_report():
+    """
+    Creates an empty winners report, holding the same statistics as data/report/uno_winners.csv.
+
+    Returns
+    -------
+    dict
+        Dictionary with the number of games, wins per winner name, cards played and turn totals,
+        and the count of each final Card.
+    """
+    return {
+        "games": 0,
+        "wins": Counter(),
+        "cards_played_total": 0,
+        "cards_played_min": None,
+        "cards_played_max": None,
+        "turns_total": 0,
+        "final_cards": Counter(),
+    }
+
+
+def merge_result(report, result):
+    """
+    Adds one game result to a winners report.
+
+    Parameters
+    ----------
+    report : dict
+        Report created by new_report().
+    result : GameResult
+        Result of one headless game.
+
+    Returns
+    -------
+    dict
+        The updated report.
+    """
+    cards_played = result.cards_played
+    report["games"] += 1
+    report["wins"][result.winner_name] += 1
+    report["cards_played_total"] += cards_played
+    report["turns_total"] += result.turns
+    if report["cards_played_min"] is None or cards_played < report["cards_played_min"]:
+        report["cards_played_min"] = cards_played
+    if report["cards_played_max"] is None or cards_played > report["cards_played_max"]:
+        report["cards_played_max"] = cards_played
+    report["final_cards"][result.final_card] += 1
+    return report
+
+
+def merge_reports(report, other):
+    """
+    Merges a second winners report into the first one.
+
+    Parameters
+    ----------
+    report : dict
+        Report that receives the statistics.
+    other : dict
+        Report whose statistics are added.
+
+    Returns
+    -------
+    dict
+        The updated first report.
+    """
+    report["games"] += other["games"]
+    report["wins"].update(other["wins"])
+    report["cards_played_total"] += other["cards_played_total"]
+    report["turns_total"] += other["turns_total"]
+    report["final_cards"].update(other["final_cards"])
+    for key, pick in (("cards_played_min", min), ("cards_played_max", max)):
+        values = [v for v in (report[key], other[key]) if v is not None]
+        report[key] = pick(values) if values else None
+    return report
+
+
+########################################
+# Workers
+########################################
+
+
+def play_batch(players_no, first_hand_count, seeds, rule_set="standard"):
+    """
+    Plays a batch of headless games inside a worker process.
+
+    Parameters
+    ----------
+    players_no : int
+        Total number of players in each game.
+    first_hand_count : int
+        Number of cards distributed to each player in the first hand.
+    seeds : list
+        Seed of every game in the batch, None entries seed from the OS.
+    rule_set : str, optional
+        Name of the rule set the games are played with.
+
+    Returns
+    -------
+    list
+        The GameResult of every game, in the order of seeds.
+    """
+    return [
+        simulate_game(players_no, first_hand_count, seed, rule_set=rule_set)
+        for seed in seeds
+    ]
+
+
+def batch_seeds(games, seed, batch_size):
+    """
+    Splits the seeds of a run into batches, game i is played with seed + i.
+
+    Parameters
+    ----------
+    games : int
+        Total number of games.
+    seed : int or None
+        Seed of the first game, None seeds every game from the OS.
+    batch_size : int
+        Number of games handed to a worker at a time.
+
+    Yields
+    ------
+    list
+        The seeds of one batch.
+    """
+    for start in range(0, games, batch_size):
+        stop = min(start + batch_size, games)
+        if seed is None:
+            yield [None] * (stop - start)
+        else:
+            yield list(range(seed + start, seed + stop))
+
+
+########################################
+# Simulation Farm
+########################################
+
+
+def run_farm(
+    games,
+    players_no,
+    first_hand_count,
+    seed=None,
+    workers=None,
+    batch_size=250,
+    progress=None,
+    on_result=None,
+    rule_set="standard",
+):
+    """
+    Shards headless games across a process pool and merges the results into one report.
+
+    Batches are submitted lazily, at most two per worker are in flight, so memory stays bounded
+    and a cancellation (Ctrl+C) only has to wait for the batches already running.
+
+    Parameters
+    ----------
+    games : int
+        Total number of games.
+    players_no : int
+        Total number of players in each game.
+    first_hand_count : int
+        Number of cards distributed to each player in the first hand.
+    seed : int, optional
+        Seed of the first game, game i is played with seed + i.
+    workers : int, optional
+        Number of worker processes, defaults to the number of CPUs.
+    batch_size : int, optional
+        Number of games per batch sent to a worker.
+    progress : callable, optional
+        Called as progress(games_done, games) each time a batch completes.
+    on_result : callable, optional
+        Called with every GameResult as it is streamed back.
+    rule_set : str, optional
+        Name of the rule set the games are played with. House rules must be registered
+        when engine.rules is imported to exist in the worker processes.
+
+    Returns
+    -------
+    tuple
+        A tuple containing the merged report, the elapsed wall-clock seconds and a cancelled flag.
+    """
+    # Imported here, the process pool machinery is slow to import and only needed by farms
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+    workers = workers or os.cpu_count() or 1
+    report = new_report()
+    seed_batches = batch_seeds(games, seed, batch_size)
+    pending = set()
+    cancelled = False
+    start = time.perf_counter()
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+
+        def submit_next():
+            seeds = next(seed_batches, None)
+            if seeds is not None:
+                pending.add(
+                    executor.submit(
+                        play_batch, players_no, first_hand_count, seeds, rule_set
+                    )
+                )
+
+        for _ in range(2 * workers):
+            submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                for result in future.result():
+                    merge_result(report, result)
+                    if on_result is not None:
+                        on_result(result)
+                submit_next()
+            if progress is not None:
+                progress(report["games"], games)
+    except KeyboardInterrupt:
+        cancelled = True
+        for future in pending:
+            future.cancel()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    return report, elapsed, cancelled
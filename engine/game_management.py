@@ -1,6 +1,9 @@
+import os
 import random
-import csv
-import pyinputplus as pyip
+import time
+from .cards import possible_faces, possible_colors, card_lookup
+from .game_state import GameState
+from .hand import Hand
 from .printing_functions import print_rules, intro_message, begin_print
 
 
@@ -9,8 +12,12 @@ from .printing_functions import print_rules, intro_message, begin_print
 ########################################
 
 file_path = "data/report/uno_winners.csv"
+single_deck_size = 108
 # Make sure the csv template file is saved as 'utf with BOM' to ensure characters like '↕' don't throw error. Did this in notepad save as encoding = utf with BOM.
 
+# AI difficulty levels, the search effort of each is set in engine.ismcts
+difficulty_names = ("easy", "medium", "hard")
+
 ########################################
 # Initializing Inputs
 ########################################
@@ -23,6 +30,9 @@ def rules_input():
     If no, does nothing
     """
 
+    # Imported here, so headless and scripted games never load the prompt library
+    import pyinputplus as pyip
+
     read_input = pyip.inputYesNo("Would you like to read the rules? y/n\n")
     if read_input == "yes":
         print_rules()
@@ -30,54 +40,99 @@ def rules_input():
         pass
 
 
-def initializing_inputs():
+def ai_difficulty_input(game_state, difficulty=None):
     """
-    Function to initialize inputs for the game
+    Function to ask user how strong the AI opponents should be
+    Easy opponents play randomly, medium and hard ones search with ISMCTS,
+    the harder the level the more time they spend thinking on each move
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, including the number of players
+    difficulty : str, optional
+        Difficulty level, one of difficulty_names. Asked for if not given
+
+    Returns
+    -------
+    game_state : GameState
+        Updated game state with the AI strategies set
     """
+    from .ismcts import strategies_for_difficulty
 
-    variable_list = {}
-    move_counter = 1
-    move_direction = +1
+    if difficulty is None:
+        import pyinputplus as pyip
 
-    players_no = pyip.inputInt("How many total players do you want?\n")
-    first_hand_count = pyip.inputInt(
-        "How many cards do you want to be distributed in the first hand?\n"
-    )
+        difficulty = pyip.inputChoice(
+            list(difficulty_names), "Choose the AI difficulty (easy, medium, hard)\n"
+        )
+    elif difficulty not in difficulty_names:
+        raise ValueError(f"Unknown AI difficulty {difficulty!r}")
+    game_state.ai_strategies = strategies_for_difficulty(game_state, difficulty)
+    return game_state
+
+
+def initializing_inputs(players_no=None, first_hand_count=None, players_names=None, seed=None):
+    """
+    Function to initialize inputs for the game
+
+    Anything not given is asked for, so a scripted game can set every input and never prompt.
+
+    Parameters
+    ----------
+    players_no : int, optional
+        Total number of players, by default the number of names if they are given
+    first_hand_count : int, optional
+        Number of cards distributed to each player in the first hand
+    players_names : list, optional
+        Name of every player, the first one being the real player's. The AI opponents'
+        names get the "-AI" suffix, like the names typed at the prompts
+    seed : int, optional
+        Seed of the game's random number generator, which shuffles the cards and plays the easy AI
+
+    Returns
+    -------
+    game_state : GameState
+        A new game with the players set up and no cards dealt yet
+    """
 
-    players_names = []
-    for player in range(players_no):
-        if player == 0:
-            players_names.append(
-                {"player_id": player + 1, "player_name": input("Enter Your Name\n")}
-            )
-        else:
-            players_names.append(
-                {
-                    "player_id": player + 1,
-                    "player_name": input("Enter AI Opponnent Name\n") + "-AI",
-                }
-            )
+    if players_names is not None:
+        if players_no is None:
+            players_no = len(players_names)
+        elif len(players_names) != players_no:
+            raise ValueError(f"{len(players_names)} names given for {players_no} players")
+    if None in (players_no, first_hand_count, players_names):
+        import pyinputplus as pyip
+
+    if players_no is None:
+        players_no = pyip.inputInt("How many total players do you want?\n", min=2)
+    if first_hand_count is None:
+        first_hand_count = pyip.inputInt(
+            "How many cards do you want to be distributed in the first hand?\n", min=1
+        )
+
+    if players_names is None:
+        players_names = [input("Enter Your Name\n")] + [
+            input("Enter AI Opponnent Name\n") for _ in range(players_no - 1)
+        ]
+    players_names = [
+        {
+            "player_id": player + 1,
+            "player_name": player_name if player == 0 else player_name + "-AI",
+        }
+        for player, player_name in enumerate(players_names)
+    ]
 
     ########################################################################################
     # For Testing
-    # players_no = 3
-    # first_hand_count = 4
-
-    # players_names = [{'player_id': 1, 'player_name': 'Abra'},
-    #                  {'player_id': 2, 'player_name': 'Babra'},
-    #                  {'player_id': 3, 'player_name': 'Chabra'}]
+    # python run_game.py --names Abra Babra Chabra --hand 4 --difficulty easy --skip-intro
 
     ########################################################################################
 
-    variable_list_update = {
-        "move_counter": move_counter,
-        "move_direction": move_direction,
-        "players_no": players_no,
-        "first_hand_count": first_hand_count,
-        "players_names": players_names,
-    }
-    variable_list.update(variable_list_update)
-    return variable_list
+    game_state = GameState(
+        players_no, first_hand_count, players_names, rng=random.Random(seed), seed=seed
+    )
+    return game_state
 
 
 ########################################
@@ -85,67 +140,105 @@ def initializing_inputs():
 ########################################
 
 
-def full_uno_deck(variable_list):
-    # Adding a space before to accomodate +2 and +4
+def check_table_size(players_no, first_hand_count):
     """
-    Function to generate the full UNO deck of cards
+    Function to check that a table can be dealt: at least 2 players and 1 card each
+
+    Raises
+    ------
+    ValueError
+        If there are fewer than 2 players or fewer than 1 card per hand
+    """
+    if players_no < 2 or first_hand_count < 1:
+        raise ValueError(
+            f"A game needs at least 2 players and 1 card per hand, got {players_no} players "
+            f"and {first_hand_count} cards"
+        )
+
+
+def decks_needed(players_no, first_hand_count):
+    """
+    Function to find how many 108 card decks a table needs
+
+    At most half of all the cards are dealt in the first hand, so large tables
+    (lots of players or big hands) automatically get more decks shuffled together.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing the game variables
+    players_no : int
+        Total number of players
+    first_hand_count : int
+        Number of cards distributed to each player in the first hand
 
     Returns
     -------
-    variable_list : dict
-        Updated dictionary containing the game variables with the key 'card_deck'
+    int
+        Number of decks, at least 1
+
+    Raises
+    ------
+    ValueError
+        If the table is too small, see check_table_size()
     """
+    check_table_size(players_no, first_hand_count)
+    dealt_count = players_no * first_hand_count
+    return max(1, -(-dealt_count // (single_deck_size // 2)))
 
-    possible_faces = [
-        " 0",
-        " 1",
-        " 2",
-        " 3",
-        " 4",
-        " 5",
-        " 6",
-        " 7",
-        " 8",
-        " 9",
-        "+2",
-        " ↕",
-        " Ø",
-        "+4",
-        " W",
-    ]
-    possible_colors = ["red", "blue", "yellow", "green", "black"]
 
-    # Generating the complete deck of UNO cards
+def single_uno_deck():
+    """
+    Function to generate one 108 card UNO deck
+
+    Returns
+    -------
+    card_deck : list
+        The cards of the deck, sharing the Card flyweights
+    """
+
     card_deck = []
 
     # Add number and action cards for each color
     for color in possible_colors[:4]:
         # Adding one of 0 card
-        card_deck.append({"face": possible_faces[0], "color": color})
+        card_deck.append(card_lookup(possible_faces[0], color))
 
         # Adding two of each card from 1 to 9
         for face in possible_faces[1:13]:
-            for _ in range(2):
-                card_deck.append({"face": face, "color": color})
+            card = card_lookup(face, color)
+            card_deck.extend([card, card])
 
     # Add wild cards
     for face in possible_faces[13:]:
-        for _ in range(4):
-            card_deck.append({"face": face, "color": possible_colors[4]})
+        card_deck.extend([card_lookup(face, possible_colors[4])] * 4)
+
+    return card_deck
+
+
+def full_uno_deck(game_state):
+    """
+    Function to generate the full UNO deck of cards
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game. If it has no 'deck_count', the number of
+        decks is picked by decks_needed() from the number of players and the first hand count
 
-    variable_list_update = {
-        "possible_faces": possible_faces,
-        "possible_colors": possible_colors,
-        "card_deck": card_deck,
-    }
-    variable_list.update(variable_list_update)
+    Returns
+    -------
+    game_state : GameState
+        Updated game state with the 'card_deck' and 'deck_count' set
+    """
+
+    deck_count = game_state.deck_count or decks_needed(
+        game_state.players_no, game_state.first_hand_count
+    )
 
-    return variable_list
+    # Large tables play with several decks shuffled together
+    game_state.card_deck = single_uno_deck() * deck_count
+    game_state.deck_count = deck_count
+
+    return game_state
 
 
 ########################################
@@ -153,147 +246,226 @@ def full_uno_deck(variable_list):
 ########################################
 
 
-def distribute_deck(variable_list):
+def distribute_deck(game_state):
     """
     Distributes the deck of cards among the players and AI.
 
+    The deck is shuffled once with the game's random number generator and dealt in slices,
+    so dealing is linear in the deck size and reproducible from the seed.
+
     Parameters:
-        variable_list (dict): Dictionary containing all game variables.
+        game_state (GameState): State of the game.
 
     Returns:
-        dict: Updated dictionary containing the distributed decks and other game variables.
+        GameState: Updated game state containing the distributed decks.
+
+    Raises:
+        ValueError: If there are fewer than 2 players or 1 card per hand, the deck is too small
+            for the requested hands, or the rule set is unknown.
     """
+    # Imported here, the effects are built on the movements that import this module
+    from .rules import compile_effects
+
+    players_no = game_state.players_no
+    first_hand_count = game_state.first_hand_count
+    card_deck = game_state.card_deck
+    rng = game_state.rng
+    check_table_size(players_no, first_hand_count)
+
+    # One shuffle of the whole deck, then every hand is a slice of it
+    shuffled_deck = list(card_deck)
+    rng.shuffle(shuffled_deck)
 
-    players_no = variable_list.get("players_no")
-    first_hand_count = variable_list.get("first_hand_count")
-    card_deck = variable_list.get("card_deck")
-    possible_faces = variable_list.get("possible_faces")
-
-    def grp_to_deck(player):
-        deck = []
-        for i in player:
-            deck.append(card_deck[i])
-        return deck
-
-    playing_groups = []
-    remaining_range = list(range(0, len(card_deck)))
-    for no in range(players_no):
-        player_grp = random.sample(remaining_range, first_hand_count)
-        playing_groups.append(player_grp)
-        remaining_range = list(set(remaining_range) - set(player_grp))
-    folded_grp = remaining_range
+    dealt_count = players_no * first_hand_count
+    if dealt_count >= len(shuffled_deck):
+        raise ValueError(
+            f"Cannot deal {first_hand_count} cards to {players_no} players from a {len(shuffled_deck)} card deck"
+        )
 
     all_players_deck = []
     for i in range(players_no):
-        all_players_deck.append(grp_to_deck(playing_groups[i]))
-    folded_deck = grp_to_deck(folded_grp)
-    table_deck = []
-    while True:
-        random_card = random.randint(0, len(folded_deck) - 1)
-        if folded_deck[random_card].get("face") not in possible_faces[10:]:
-            livecard = folded_deck.pop(random_card)
-            break
-    table_deck.append(livecard)
+        start = i * first_hand_count
+        all_players_deck.append(Hand(shuffled_deck[start : start + first_hand_count]))
+
+    # The rest is the folded deck, a pre-shuffled pile whose cards are drawn from its end
+    folded_deck = shuffled_deck[dealt_count:]
 
-    variable_list_update = {
-        "all_players_deck": all_players_deck,
-        "folded_deck": folded_deck,
-        "table_deck": table_deck,
-        "livecard": livecard,
-    }
-    variable_list.update(variable_list_update)
+    # The live card is the topmost card that isn't an action or wild card
+    for card_index in range(len(folded_deck) - 1, -1, -1):
+        if folded_deck[card_index].face not in possible_faces[10:]:
+            break
+    else:
+        raise ValueError("The folded deck has no number card to start the game with")
+    livecard = folded_deck[card_index]
+    skipped_cards = folded_deck[card_index + 1 :]
+    del folded_deck[card_index:]
+
+    # The action cards skipped over go back in at random places, an inside-out
+    # Fisher-Yates step each, so the pile stays uniformly shuffled
+    for card in skipped_cards:
+        folded_deck.append(card)
+        swap_index = rng.randrange(len(folded_deck))
+        folded_deck[swap_index], folded_deck[-1] = (
+            folded_deck[-1],
+            folded_deck[swap_index],
+        )
+    table_deck = [livecard]
+
+    game_state.all_players_deck = all_players_deck
+    game_state.folded_deck = folded_deck
+    game_state.table_deck = table_deck
+    game_state.livecard = livecard
+    game_state.cards_played = len(table_deck)
+    game_state.reshuffles = 0
+    game_state.turns = 0
+    game_state.started_at = time.perf_counter()
+    game_state.effects = compile_effects(game_state.rule_set)
+    if game_state.tracker is not None:
+        game_state.tracker.reset(game_state)
+    if game_state.event_log is not None:
+        game_state.event_log.record_deal(game_state)
+
+    return game_state
+
+
+def reset_game(game_state):
+    """
+    Gets a finished game ready to be played again by the same players.
 
-    return variable_list
+    Every card goes back to the game's deck template, which is shuffled and dealt again,
+    so the players, AI strategies and deck are reused with no prompts and no new deck.
 
+    Parameters
+    ----------
+    game_state : GameState
+        State of a finished game.
 
-def set_game():
+    Returns
+    -------
+    GameState
+        The same game state, dealt for a new game.
+    """
+    game_state.move_counter = 1
+    game_state.move_direction = +1
+    game_state.winner = None
+    game_state.declared_color = None
+    # The new deal continues the generator of the last one, the seed alone no longer replays it
+    game_state.seed = None
+    return distribute_deck(game_state)
+
+
+def set_game(
+    rule_set="standard",
+    players_no=None,
+    first_hand_count=None,
+    players_names=None,
+    difficulty=None,
+    seed=None,
+    skip_intro=False,
+):
     """
     Function to set up the game of UNO
+
+    The players, first hand count and AI difficulty are asked for unless they are given.
+
+    Parameters
+    ----------
+    rule_set : str, optional
+        Name of the rule set the game is played with, see engine.rules.
+    players_no, first_hand_count, players_names, seed : optional
+        See initializing_inputs().
+    difficulty : str, optional
+        AI difficulty level, see ai_difficulty_input().
+    skip_intro : bool, optional
+        Skip the welcome screen, the rules prompt and the start banner.
     """
 
-    variable_list = initializing_inputs()
-    variable_list = full_uno_deck(variable_list)
-    variable_list = distribute_deck(variable_list)
-    intro_message()
-    rules_input()
-    begin_print()
-    return variable_list
+    game_state = initializing_inputs(players_no, first_hand_count, players_names, seed)
+    game_state.rule_set = rule_set
+    game_state = ai_difficulty_input(game_state, difficulty)
+    game_state = full_uno_deck(game_state)
+    game_state = distribute_deck(game_state)
+    if not skip_intro:
+        intro_message()
+        rules_input()
+        begin_print()
+    return game_state
 
 
-def data_upload(variable_list):
+def data_upload(game_state):
     """
-    Uploads game data to a CSV file.
+    Records the finished game in the results store.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing the game variables, including the current move counter,
+    game_state : GameState
+        State of the game, including the current move counter,
         list of players' names, the current live card, and the table deck.
 
     Writes to
     ---------
-    A CSV file specified by the global variable `file_path`, appending a row with:
-        - The winner's name
-        - The live card at the end of the game
-        - The total number of moves played
+    The SQLite results store at `results_path`, adding a row with the winner's name and seat,
+    the table size, the turns and cards played, the final live card, the game's seed and its
+    duration.
+    The first time the store is created, the games of the old CSV report at `file_path` are
+    imported into it.
 
     Prints
     ------
-    A message indicating that the winner's name has been added to the CSV file.
+    A message indicating that the winner's name has been added to the results store.
     """
-    global file_path
-    move_counter = variable_list.get("move_counter")
-    player_index = move_counter - 1
-    winner_name = variable_list.get("players_names")[player_index].get("player_name")
+    # Imported here, sqlite3 is only needed once a game is over
+    from .results_store import ResultsStore, import_csv, results_path
 
-    livecard = variable_list.get("livecard")
-    moves_played = len(variable_list.get("table_deck"))
-    # Openning the file in append mode
-    with open(file_path, "a", newline="", encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow([winner_name, livecard, moves_played])
+    new_store = not os.path.exists(results_path)
+    with ResultsStore(results_path) as store:
+        if new_store and os.path.exists(file_path):
+            import_csv(store, file_path)
+        store.add_game(game_state)
 
-    print(f"Added winner '{winner_name}' to {file_path}")
+    winner_name = game_state.player_name(game_state.move_counter)
+    print(f"Added winner '{winner_name}' to {results_path}")
 
 
-def print_game_over(variable_list):
+def print_game_over(game_state):
     """
-    Prints a congratulatory message for the winner and records the winner's name
-    to a CSV file.
+    Prints a congratulatory message for the winner and records the game in the SQLite
+    results store through data_upload().
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing the game variables, including the current move counter,
+    game_state : GameState
+        State of the game, including the current move counter,
         list of players' names, the current live card, and the table deck.
 
+    Writes to
+    ---------
+    The SQLite results store at `results_path`, see data_upload().
+
     Prints
     ------
     A congratulatory message with the winner's name.
     """
-    move_counter = variable_list.get("move_counter")
+    move_counter = game_state.move_counter
     player_index = move_counter - 1
-    winner_name = variable_list.get("players_names")[player_index].get("player_name")
+    winner_name = game_state.players_names[player_index].get("player_name")
     print(f"Congratulations {winner_name}!, You've won the game!")
-    data_upload(variable_list)
+    data_upload(game_state)
 
 
 def play_again():
     """
-    Asks the user if they want to play again and if so, restarts the game by calling set_game().
-    If the user does not want to play again, prints a thank you message and quits the game.
+    Asks the user if they want to play another game.
 
     Returns
     -------
-    list
-        Either a list containing the updated game variables if the user wants to play again,
-        or a list containing the string "GAME OVER" if the user does not want to play again.
+    bool
+        True if the user wants to play again. Otherwise prints a thank you message and returns False.
     """
+    import pyinputplus as pyip
+
     replay_response = pyip.inputYesNo("Game Over, would you like to play again? y/n\n")
     if replay_response == "yes":
-        variable_list = set_game()
-    else:
-        print("Thank you for playing!")
-        variable_list = ["GAME OVER"]
-        quit()
-    return variable_list
+        return True
+    print("Thank you for playing!")
+    return False
@@ -0,0 +1,190 @@
+import random
+
+
+########################################
+# Game State
+########################################
+
+
+class GameState:
+    """
+    Holds every variable of a game of UNO.
+
+    Engine functions take a GameState, update the fields they change in place and return it.
+
+    Attributes
+    ----------
+    move_counter : int
+        Id of the player whose turn it is, between 1 and players_no.
+    move_direction : int
+        +1 for the seat order, -1 once reversed.
+    players_no : int
+        Total number of players.
+    first_hand_count : int
+        Number of cards distributed to each player in the first hand.
+    players_names : list
+        One {"player_id": ..., "player_name": ...} dict per player.
+    rng : random.Random
+        Random number generator of the game, seeding it makes the game reproducible.
+    seed : int or None
+        Seed rng was created from, None when it was seeded from the OS or has already
+        dealt an earlier game.
+    headless : bool
+        True for all-AI games that run with no prompts or printing.
+    deck_count : int
+        Number of 108 card decks shuffled together.
+    card_deck : list
+        Every card of the game, used as the template the hands and piles are dealt from.
+    all_players_deck : list
+        One Hand per player.
+    folded_deck : list
+        Shuffled draw pile, cards are drawn from its end.
+    table_deck : list
+        Played cards, the last one being the live card.
+    livecard : Card
+        Card that must be matched, a recolored wild after a wild card was played.
+    cards_played : int
+        Number of cards played on the table deck, including the starting card.
+    reshuffles : int
+        Number of times the table deck was recycled into the folded deck.
+    turns : int
+        Number of turns played so far, passed turns included.
+    started_at : float or None
+        time.perf_counter() reading taken when the cards were dealt.
+    winner : int or None
+        Id of the winning player of a finished headless game.
+    ai_strategies : dict
+        Strategy deciding the moves of an AI seat, keyed by player id. Seats without one play randomly.
+    declared_color : str or None
+        Color picked by an AI strategy along with the wild card it is playing.
+    event_log : EventLog or None
+        Log the game's events are recorded to, None when the game isn't logged.
+    rule_set : str
+        Name of the rule set the game is played with, "standard" or a registered house rule variant.
+    effects : tuple
+        Effect function of every card under the rule set, indexed by card_id, compiled
+        when the cards are dealt.
+    tracker : CardTracker or None
+        Public card knowledge kept up to date as the game is played, None when the game
+        isn't tracked (see engine.tracker).
+    """
+
+    __slots__ = (
+        "move_counter",
+        "move_direction",
+        "players_no",
+        "first_hand_count",
+        "players_names",
+        "rng",
+        "seed",
+        "headless",
+        "deck_count",
+        "card_deck",
+        "all_players_deck",
+        "folded_deck",
+        "table_deck",
+        "livecard",
+        "cards_played",
+        "reshuffles",
+        "turns",
+        "started_at",
+        "winner",
+        "ai_strategies",
+        "declared_color",
+        "event_log",
+        "rule_set",
+        "effects",
+        "tracker",
+    )
+
+    def __init__(
+        self,
+        players_no,
+        first_hand_count,
+        players_names,
+        rng=None,
+        headless=False,
+        rule_set="standard",
+        seed=None,
+    ):
+        self.move_counter = 1
+        self.move_direction = +1
+        self.players_no = players_no
+        self.first_hand_count = first_hand_count
+        self.players_names = players_names
+        self.rng = rng if rng is not None else random.Random()
+        self.seed = seed
+        self.headless = headless
+        self.deck_count = None
+        self.card_deck = []
+        self.all_players_deck = []
+        self.folded_deck = []
+        self.table_deck = []
+        self.livecard = None
+        self.cards_played = 0
+        self.reshuffles = 0
+        self.turns = 0
+        self.started_at = None
+        self.winner = None
+        self.ai_strategies = {}
+        self.declared_color = None
+        self.event_log = None
+        self.rule_set = rule_set
+        self.effects = ()
+        self.tracker = None
+
+    def clone(self, rng=None):
+        """
+        Returns a copy of the game that can be played on without touching this one.
+
+        Only the mutable containers (hands and piles) are copied. Cards, player names and
+        the card deck template are shared, so forking a game is cheap. The copy is never
+        logged or tracked, so searching ahead doesn't write to the game's event log or tracker.
+
+        Parameters
+        ----------
+        rng : random.Random, optional
+            Random number generator for the copy. By default the copy gets a generator
+            in the same state as this game's, so both continue identically.
+
+        Returns
+        -------
+        GameState
+            The copied game.
+        """
+        game_state = GameState.__new__(GameState)
+        game_state.move_counter = self.move_counter
+        game_state.move_direction = self.move_direction
+        game_state.players_no = self.players_no
+        game_state.first_hand_count = self.first_hand_count
+        game_state.players_names = self.players_names
+        if rng is None:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+        game_state.rng = rng
+        game_state.seed = self.seed
+        game_state.headless = self.headless
+        game_state.deck_count = self.deck_count
+        game_state.card_deck = self.card_deck
+        game_state.all_players_deck = [hand.copy() for hand in self.all_players_deck]
+        game_state.folded_deck = list(self.folded_deck)
+        game_state.table_deck = list(self.table_deck)
+        game_state.livecard = self.livecard
+        game_state.cards_played = self.cards_played
+        game_state.reshuffles = self.reshuffles
+        game_state.turns = self.turns
+        game_state.started_at = self.started_at
+        game_state.winner = self.winner
+        game_state.ai_strategies = self.ai_strategies
+        game_state.declared_color = self.declared_color
+        game_state.event_log = None
+        game_state.rule_set = self.rule_set
+        game_state.effects = self.effects
+        game_state.tracker = None
+        return game_state
+
+    def player_name(self, player_id):
+        """
+        Returns the name of the player with the given id.
+        """
+        return self.players_names[player_id - 1].get("player_name")
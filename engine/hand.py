@@ -0,0 +1,139 @@
+from itertools import chain, repeat, starmap
+from .cards import possible_colors
+
+
+########################################
+# Player Hands
+########################################
+
+
+class Hand:
+    """
+    A player's hand of cards, indexed by color and by face.
+
+    Cards are kept as counts per Card kind, and every kind present in the hand is also
+    filed in a color bucket and a face bucket (wild cards live in the black color bucket),
+    so adding or removing a card is O(1) and the legal moves for a live card are the
+    union of three buckets instead of a scan over the whole hand.
+    """
+
+    __slots__ = ("_counts", "_by_color", "_by_face", "_size")
+
+    def __init__(self, cards=()):
+        self._counts = {}
+        self._by_color = {}
+        self._by_face = {}
+        self._size = 0
+        for card in cards:
+            self.append(card)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        # Each kind repeated by its count, expanded without a Python-level loop
+        return chain.from_iterable(starmap(repeat, self._counts.items()))
+
+    def __contains__(self, card):
+        return card in self._counts
+
+    def __repr__(self):
+        return f"Hand({list(self)!r})"
+
+    def count(self, card):
+        """
+        Returns how many copies of the card are in the hand.
+        """
+        return self._counts.get(card, 0)
+
+    def color_count(self, color):
+        """
+        Returns how many cards of a color are in the hand, wild cards being black.
+        """
+        counts = self._counts
+        return sum(counts[card] for card in self._by_color.get(color, ()))
+
+    def face_count(self, face):
+        """
+        Returns how many cards with a face are in the hand.
+        """
+        counts = self._counts
+        return sum(counts[card] for card in self._by_face.get(face, ()))
+
+    def append(self, card):
+        """
+        Adds a card to the hand.
+
+        Parameters
+        ----------
+        card : Card
+            The card to be added.
+        """
+        count = self._counts.get(card, 0)
+        if count == 0:
+            self._by_color.setdefault(card.color, {})[card] = None
+            self._by_face.setdefault(card.face, {})[card] = None
+        self._counts[card] = count + 1
+        self._size += 1
+
+    def remove(self, card):
+        """
+        Removes one copy of a card from the hand.
+
+        Parameters
+        ----------
+        card : Card
+            The card to be removed.
+
+        Raises
+        ------
+        ValueError
+            If the card isn't in the hand.
+        """
+        count = self._counts.get(card, 0)
+        if count == 0:
+            raise ValueError(f"{card!r} is not in the hand")
+        if count == 1:
+            del self._counts[card]
+            del self._by_color[card.color][card]
+            del self._by_face[card.face][card]
+        else:
+            self._counts[card] = count - 1
+        self._size -= 1
+
+    def copy(self):
+        """
+        Returns an independent copy of the hand.
+        """
+        hand = Hand.__new__(Hand)
+        hand._counts = dict(self._counts)
+        hand._by_color = {color: dict(kinds) for color, kinds in self._by_color.items()}
+        hand._by_face = {face: dict(kinds) for face, kinds in self._by_face.items()}
+        hand._size = self._size
+        return hand
+
+    def legal_moves(self, livecard):
+        """
+        Lists the cards of the hand that can be played on the live card.
+
+        Parameters
+        ----------
+        livecard : Card
+            The card on top of the table deck.
+
+        Returns
+        -------
+        list
+            The legal cards, one entry per copy in the hand.
+        """
+        counts = self._counts
+        moves = []
+        for card in self._by_color.get(livecard.color, ()):
+            moves.extend([card] * counts[card])
+        for card in self._by_face.get(livecard.face, ()):
+            if card.color != livecard.color:
+                moves.extend([card] * counts[card])
+        if livecard.color != possible_colors[4]:
+            for card in self._by_color.get(possible_colors[4], ()):
+                moves.extend([card] * counts[card])
+        return moves
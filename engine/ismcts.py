@@ -0,0 +1,320 @@
+import math
+import random
+import time
+from . import profiling
+from .cards import possible_colors
+from .hand import Hand
+from .movements import (
+    main_move_manager,
+    play_move_management,
+    player_available_moves,
+    turn_switcher,
+)
+
+
+########################################
+# Search Tree
+########################################
+
+
+class _Node:
+    """
+    A node of the information set search tree.
+
+    The node is reached by `action`, played by `player`. Its statistics count the rollouts
+    that went through it, the ones won by `player`, and the number of times it was
+    available for selection (which varies between determinizations).
+    """
+
+    __slots__ = ("parent", "action", "player", "children", "visits", "wins", "avails")
+
+    def __init__(self, parent=None, action=None, player=None):
+        self.parent = parent
+        self.action = action
+        self.player = player
+        self.children = {}
+        self.visits = 0
+        self.wins = 0.0
+        self.avails = 1
+
+    def ucb_score(self, exploration):
+        return self.wins / self.visits + exploration * math.sqrt(
+            math.log(self.avails) / self.visits
+        )
+
+
+########################################
+# Search Helpers
+########################################
+
+
+def legal_actions(available_moves):
+    """
+    Lists the distinct actions for a set of available moves.
+
+    Parameters
+    ----------
+    available_moves : list
+        List of available legal moves for the player to move.
+
+    Returns
+    -------
+    list
+        (card, color) pairs, one per wild card and declarable color, color is None for
+        other cards. A single None action when there is nothing to play.
+    """
+    if not available_moves:
+        return [None]
+    actions = []
+    for card in dict.fromkeys(available_moves):
+        if card.is_wild:
+            for color in possible_colors[:4]:
+                actions.append((card, color))
+        else:
+            actions.append((card, None))
+    return actions
+
+
+def apply_action(game_state, available_moves, action):
+    """
+    Plays an action on a headless game through the rules engine.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of a headless game.
+    available_moves : list
+        List of available legal moves for the player to move.
+    action : tuple or None
+        A (card, color) pair from legal_actions(), or None to pass the turn.
+
+    Returns
+    -------
+    GameState
+        Updated game state.
+    """
+    if action is None:
+        return turn_switcher(game_state)
+    card, color = action
+    game_state.declared_color = color
+    card_no = available_moves.index(card) + 1
+    return play_move_management(card_no, game_state, available_moves)
+
+
+def determinize(game_state, observer, rng):
+    """
+    Samples a full game consistent with what the observer knows.
+
+    The observer sees its own hand, the table and every hand size, so the cards it can't see
+    (the other hands and the folded deck) are shuffled together and dealt back with the same sizes.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the real game.
+    observer : int
+        Id of the player doing the search.
+    rng : random.Random
+        Random number generator of the search.
+
+    Returns
+    -------
+    GameState
+        A headless copy of the game where every seat plays randomly.
+    """
+    sample = game_state.clone(rng=rng)
+    sample.headless = True
+    sample.ai_strategies = {}
+
+    unseen_cards = list(sample.folded_deck)
+    for player_index, hand in enumerate(sample.all_players_deck):
+        if player_index != observer - 1:
+            unseen_cards.extend(hand)
+    rng.shuffle(unseen_cards)
+
+    dealt = 0
+    for player_index, hand in enumerate(sample.all_players_deck):
+        if player_index != observer - 1:
+            hand_size = len(hand)
+            sample.all_players_deck[player_index] = Hand(
+                unseen_cards[dealt : dealt + hand_size]
+            )
+            dealt += hand_size
+    sample.folded_deck = unseen_cards[dealt:]
+    return sample
+
+
+########################################
+# ISMCTS Opponent
+########################################
+
+
+class ISMCTS:
+    """
+    Information set Monte Carlo tree search AI opponent.
+
+    Every iteration samples the cards the AI can't see, walks the shared search tree with UCB
+    over the actions available in that sample, and finishes the game with a random rollout.
+    The search is anytime: it stops when the time budget or the rollout count runs out,
+    whichever comes first, and plays the most visited action.
+
+    Parameters
+    ----------
+    time_budget : float, optional
+        Wall-clock seconds the search may spend on one move.
+    rollouts : int, optional
+        Maximum number of rollouts per move.
+    exploration : float, optional
+        UCB exploration constant.
+    max_rollout_turns : int, optional
+        Turns after which a rollout is scored as a draw between all players.
+    seed : int, optional
+        Seed of the search's random number generator.
+    """
+
+    def __init__(
+        self,
+        time_budget=0.5,
+        rollouts=1000,
+        exploration=0.7,
+        max_rollout_turns=1000,
+        seed=None,
+    ):
+        self.time_budget = time_budget
+        self.rollouts = rollouts
+        self.exploration = exploration
+        self.max_rollout_turns = max_rollout_turns
+        self.rng = random.Random(seed)
+
+    def choose_move(self, game_state, available_moves):
+        """
+        Searches for the best card and, for wild cards, the color to declare.
+
+        Parameters
+        ----------
+        game_state : GameState
+            State of the game, with the searching AI to move.
+        available_moves : list
+            List of available legal moves for the AI.
+
+        Returns
+        -------
+        tuple
+            The position of the card in available_moves (starting from 1) and the color to declare,
+            None for cards other than wild cards.
+        """
+        root_actions = legal_actions(available_moves)
+        if len(root_actions) == 1:
+            card, color = root_actions[0]
+            return available_moves.index(card) + 1, color
+
+        card, color = self.search(game_state, available_moves)
+        return available_moves.index(card) + 1, color
+
+    def search(self, game_state, available_moves):
+        """
+        Runs the search from the current position and returns the most visited root action.
+        """
+        observer = game_state.move_counter
+        root = _Node()
+        deadline = time.perf_counter() + self.time_budget
+
+        # Rollout turns are part of the decision phase, they aren't timed as turns of their own
+        profiler = profiling.phase_profiler
+        profiling.phase_profiler = None
+        try:
+            # At least one rollout, so there is always an action to return
+            for _ in range(max(self.rollouts, 1)):
+                sample = determinize(game_state, observer, self.rng)
+                self.iterate(root, sample, available_moves)
+                if time.perf_counter() >= deadline:
+                    break
+        finally:
+            profiling.phase_profiler = profiler
+
+        best = max(root.children.values(), key=lambda child: child.visits)
+        return best.action
+
+    def iterate(self, root, sample, root_moves):
+        """
+        Runs one selection, expansion, rollout and backpropagation pass on a sampled game.
+        """
+        node = root
+        available_moves = root_moves
+        expanded = False
+
+        # Selection and expansion
+        while sample.winner is None and not expanded:
+            player = sample.move_counter
+            actions = legal_actions(available_moves)
+            untried = [action for action in actions if action not in node.children]
+            for action in actions:
+                child = node.children.get(action)
+                if child is not None:
+                    child.avails += 1
+
+            if untried:
+                action = self.rng.choice(untried)
+                child = _Node(node, action, player)
+                node.children[action] = child
+                expanded = True
+            else:
+                child = max(
+                    (node.children[action] for action in actions),
+                    key=lambda child: child.ucb_score(self.exploration),
+                )
+            apply_action(sample, available_moves, child.action)
+            node = child
+
+            if sample.winner is None and not expanded:
+                # Draws for the next player if needed, like pre_move_management does
+                available_moves, sample = player_available_moves(sample)
+
+        # Rollout
+        turns = 0
+        while sample.winner is None and turns < self.max_rollout_turns:
+            sample = main_move_manager(sample)
+            turns += 1
+
+        # Backpropagation
+        while node is not root:
+            node.visits += 1
+            if sample.winner is None:
+                node.wins += 1 / sample.players_no
+            elif sample.winner == node.player:
+                node.wins += 1
+            node = node.parent
+        root.visits += 1
+
+
+# Search effort of the AI opponents for each difficulty level, easy opponents play randomly
+difficulty_levels = {
+    "easy": None,
+    "medium": {"time_budget": 0.2, "rollouts": 200},
+    "hard": {"time_budget": 1.0, "rollouts": 2000},
+}
+
+
+def strategies_for_difficulty(game_state, difficulty):
+    """
+    Builds the AI strategies of every AI seat for a difficulty level.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, including the number of players.
+    difficulty : str
+        One of the keys of difficulty_levels.
+
+    Returns
+    -------
+    dict
+        An ISMCTS opponent per AI seat keyed by player id, empty for random opponents.
+    """
+    settings = difficulty_levels[difficulty]
+    if settings is None:
+        return {}
+    return {
+        player_id: ISMCTS(**settings)
+        for player_id in range(2, game_state.players_no + 1)
+    }
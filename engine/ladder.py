@@ -0,0 +1,188 @@
+import random
+import time
+from .game_management import reset_game
+from .simulation import new_headless_game
+from .movements import main_move_manager
+from .tracker import attach_tracker
+
+
+########################################
+# Elo Ratings
+########################################
+
+
+def expected_score(rating, other_rating):
+    """
+    Returns the Elo expected score of a player against another, between 0 and 1.
+    """
+    return 1 / (1 + 10 ** ((other_rating - rating) / 400))
+
+
+class EloLadder:
+    """
+    Elo ratings of a set of strategies, updated online after every game.
+
+    A game of several seats counts as one match between the winner and each other strategy
+    at the table, each worth 1 / (distinct opponents) of a game, so a table of any size
+    moves the ratings as much as a single two player game, however many seats a strategy
+    holds.
+
+    The K-factor of a strategy shrinks as it plays more games, down to k_floor, so the
+    ratings settle into a stable ranking over long runs. Only a rating and two counters
+    are kept per strategy, whatever the number of games.
+
+    Parameters
+    ----------
+    names : iterable
+        Names of the rated strategies.
+    initial_rating : float, optional
+        Rating every strategy starts from.
+    k : float, optional
+        K-factor of a strategy that hasn't played yet.
+    k_floor : float, optional
+        Lowest K-factor, reached after many games.
+    k_half_life : int, optional
+        Number of games after which the K-factor is halved.
+    """
+
+    def __init__(self, names, initial_rating=1500.0, k=32.0, k_floor=0.5, k_half_life=500):
+        self.ratings = {name: initial_rating for name in names}
+        self.games = dict.fromkeys(self.ratings, 0)
+        self.wins = dict.fromkeys(self.ratings, 0)
+        self.k = k
+        self.k_floor = k_floor
+        self.k_half_life = k_half_life
+
+    def k_factor(self, name):
+        return max(
+            self.k_floor,
+            self.k * self.k_half_life / (self.k_half_life + self.games[name]),
+        )
+
+    def record_game(self, seated, winner):
+        """
+        Updates the ratings with the outcome of one game.
+
+        Parameters
+        ----------
+        seated : list
+            Name of the strategy of every seat. A strategy seated more than once is rated
+            once, and isn't rated against itself.
+        winner : str
+            Name of the winning strategy.
+        """
+        ratings = self.ratings
+        deltas = dict.fromkeys(seated, 0.0)
+        # Each distinct losing strategy is one match, a table of one strategy rates nothing
+        losers = [name for name in deltas if name != winner]
+        weight = 1 / max(len(losers), 1)
+        winner_rating = ratings[winner]
+        for loser in losers:
+            # Both sides move from the ratings before the game
+            swing = weight * (1 - expected_score(winner_rating, ratings[loser]))
+            deltas[winner] += self.k_factor(winner) * swing
+            deltas[loser] -= self.k_factor(loser) * swing
+        for name, delta in deltas.items():
+            ratings[name] += delta
+            self.games[name] += 1
+        self.wins[winner] += 1
+
+    def ranking(self):
+        """
+        Returns (name, rating, games, wins) for every strategy, best rated first.
+        """
+        return sorted(
+            (
+                (name, rating, self.games[name], self.wins[name])
+                for name, rating in self.ratings.items()
+            ),
+            key=lambda row: row[1],
+            reverse=True,
+        )
+
+
+########################################
+# Ladder Runner
+########################################
+
+
+def run_ladder(
+    strategies,
+    games,
+    players_no,
+    first_hand_count,
+    seed=None,
+    ladder=None,
+    progress=None,
+    rule_set="standard",
+):
+    """
+    Plays strategies against each other in headless games and rates them as it goes.
+
+    Every game seats players_no strategies drawn at random (distinct while there are enough
+    of them) in a random seat order. Games are tracked (engine.tracker) when a strategy uses
+    the tracker. The same game state is reset and dealt again for every game, and nothing
+    but the ratings is kept, so memory stays flat however many games are played.
+
+    Parameters
+    ----------
+    strategies : dict
+        Strategy object of every competitor, keyed by name. An object is seated for any
+        number of seats and games, see engine.strategies.
+    games : int
+        Number of games to play.
+    players_no : int
+        Total number of players in each game.
+    first_hand_count : int
+        Number of cards distributed to each player in the first hand.
+    seed : int, optional
+        Seed of the pairings and of the games.
+    ladder : EloLadder, optional
+        Ladder to keep updating, e.g. to continue an earlier run. By default a new one.
+    progress : callable, optional
+        Called as progress(games_done, ladder) every 1000 games and after the last one.
+    rule_set : str, optional
+        Name of the rule set the games are played with.
+
+    Returns
+    -------
+    tuple
+        A tuple containing the ladder and the elapsed wall-clock seconds.
+    """
+    if ladder is None:
+        ladder = EloLadder(strategies)
+    names = list(strategies)
+    track_cards = any(
+        getattr(strategy, "uses_tracker", False) for strategy in strategies.values()
+    )
+    rng = random.Random(seed)
+    game_state = None
+    start = time.perf_counter()
+
+    for game_no in range(games):
+        if len(names) >= players_no:
+            seated = rng.sample(names, players_no)
+        else:
+            seated = rng.choices(names, k=players_no)
+
+        if game_state is None:
+            game_state = new_headless_game(
+                players_no, first_hand_count, rng.getrandbits(32), rule_set=rule_set
+            )
+            if track_cards:
+                # Later deals reset the tracker along with the game
+                attach_tracker(game_state)
+        else:
+            game_state = reset_game(game_state)
+        game_state.ai_strategies = {
+            seat: strategies[name] for seat, name in enumerate(seated, start=1)
+        }
+        while game_state.winner is None:
+            game_state = main_move_manager(game_state)
+
+        ladder.record_game(seated, seated[game_state.winner - 1])
+        if progress is not None and ((game_no + 1) % 1000 == 0 or game_no + 1 == games):
+            progress(game_no + 1, ladder)
+
+    elapsed = time.perf_counter() - start
+    return ladder, elapsed
@@ -0,0 +1,205 @@
+import math
+
+
+########################################
+# Schema
+########################################
+
+# Summary tables kept next to the games table, updated from the games recorded after the checkpoint
+leaderboard_schema = """
+CREATE TABLE IF NOT EXISTS leaderboard_checkpoint (
+    checkpoint_id INTEGER PRIMARY KEY CHECK (checkpoint_id = 0),
+    last_game_id INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    cards_played_total INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO leaderboard_checkpoint VALUES (0, 0, 0, 0);
+CREATE TABLE IF NOT EXISTS leaderboard_wins (
+    winner_name TEXT PRIMARY KEY,
+    wins INTEGER NOT NULL,
+    games INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leaderboard_lengths (
+    cards_played INTEGER PRIMARY KEY,
+    games INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leaderboard_cards (
+    final_face TEXT NOT NULL,
+    final_color TEXT NOT NULL,
+    wins INTEGER NOT NULL,
+    PRIMARY KEY (final_face, final_color)
+);
+"""
+
+# Each statement folds the games after the checkpoint into one summary table
+update_statements = (
+    # Every player of a game, its winner alone for games recorded without player names
+    """
+    INSERT INTO leaderboard_wins (winner_name, wins, games)
+    SELECT player_name, SUM(player_name = winner_name), COUNT(*) FROM (
+        SELECT DISTINCT game_id, winner_name, value AS player_name
+        FROM games, json_each(COALESCE(player_names, json_array(winner_name)))
+        WHERE game_id > ?
+    )
+    GROUP BY player_name
+    ON CONFLICT (winner_name) DO UPDATE
+    SET wins = wins + excluded.wins, games = games + excluded.games
+    """,
+    """
+    INSERT INTO leaderboard_lengths (cards_played, games)
+    SELECT cards_played, COUNT(*) FROM games WHERE game_id > ? GROUP BY cards_played
+    ON CONFLICT (cards_played) DO UPDATE SET games = games + excluded.games
+    """,
+    """
+    INSERT INTO leaderboard_cards (final_face, final_color, wins)
+    SELECT final_face, final_color, COUNT(*) FROM games WHERE game_id > ?
+    GROUP BY final_face, final_color
+    ON CONFLICT (final_face, final_color) DO UPDATE SET wins = wins + excluded.wins
+    """,
+)
+
+# Game length percentiles shown by the leaderboard
+length_percentiles = (50, 90, 99)
+
+
+########################################
+# Updating
+########################################
+
+
+def update_leaderboard(connection):
+    """
+    Folds the games recorded since the checkpoint into the leaderboard summary.
+
+    The work is proportional to the number of new games, which are found through the
+    games table's primary key. Call it inside the transaction that recorded them, so
+    concurrent writers can't fold the same games twice.
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection
+        Connection to a results store.
+
+    Returns
+    -------
+    int
+        Number of games folded in.
+    """
+    last_game_id = connection.execute(
+        "SELECT last_game_id FROM leaderboard_checkpoint"
+    ).fetchone()[0]
+    new_games, new_last_game_id, cards_played_total = connection.execute(
+        "SELECT COUNT(*), MAX(game_id), SUM(cards_played) FROM games WHERE game_id > ?",
+        (last_game_id,),
+    ).fetchone()
+    if new_games == 0:
+        return 0
+
+    for statement in update_statements:
+        connection.execute(statement, (last_game_id,))
+    connection.execute(
+        "UPDATE leaderboard_checkpoint SET last_game_id = ?, games = games + ?,"
+        " cards_played_total = cards_played_total + ?",
+        (new_last_game_id, new_games, cards_played_total),
+    )
+    return new_games
+
+
+def reset_leaderboard(connection):
+    """
+    Empties the leaderboard summary, so the next update folds in every recorded game.
+    """
+    for table in ("leaderboard_wins", "leaderboard_lengths", "leaderboard_cards"):
+        connection.execute(f"DELETE FROM {table}")
+    connection.execute(
+        "UPDATE leaderboard_checkpoint SET last_game_id = 0, games = 0,"
+        " cards_played_total = 0"
+    )
+
+
+def rebuild_leaderboard(connection):
+    """
+    Recomputes the leaderboard summary from every recorded game.
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection
+        Connection to a results store.
+
+    Returns
+    -------
+    int
+        Number of games in the rebuilt summary.
+    """
+    with connection:
+        reset_leaderboard(connection)
+        return update_leaderboard(connection)
+
+
+########################################
+# Reading
+########################################
+
+
+def histogram_percentile(histogram, total, percentile):
+    """
+    Finds a nearest-rank percentile from (value, count) pairs sorted by value.
+    """
+    rank = max(1, math.ceil(percentile / 100 * total))
+    seen = 0
+    for value, count in histogram:
+        seen += count
+        if seen >= rank:
+            return value
+    return None
+
+
+def load_leaderboard(connection, limit=10):
+    """
+    Reads the leaderboard summary, without touching the games table.
+
+    Loading costs the same whatever the number of recorded games, it only depends on
+    the number of distinct winners, game lengths and winning cards.
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection
+        Connection to a results store.
+    limit : int, optional
+        Number of players to list.
+
+    Returns
+    -------
+    dict
+        Dictionary with the number of games, the mean game length and its percentiles
+        (in cards played), the top winners as (name, wins, games played, win share) tuples,
+        the win share being of every recorded game, and the most common winning card as a
+        (face, color, wins) tuple.
+    """
+    games, cards_played_total = connection.execute(
+        "SELECT games, cards_played_total FROM leaderboard_checkpoint"
+    ).fetchone()
+    top_winners = connection.execute(
+        "SELECT winner_name, wins, games FROM leaderboard_wins WHERE wins > 0"
+        " ORDER BY wins DESC, winner_name LIMIT ?",
+        (limit,),
+    ).fetchall()
+    histogram = connection.execute(
+        "SELECT cards_played, games FROM leaderboard_lengths ORDER BY cards_played"
+    ).fetchall()
+    top_card = connection.execute(
+        "SELECT final_face, final_color, wins FROM leaderboard_cards ORDER BY wins DESC LIMIT 1"
+    ).fetchone()
+
+    return {
+        "games": games,
+        "mean_cards_played": cards_played_total / games if games else None,
+        "cards_played_percentiles": {
+            percentile: histogram_percentile(histogram, games, percentile)
+            for percentile in length_percentiles
+        },
+        "top_winners": [
+            (winner_name, wins, played, wins / games) for winner_name, wins, played in top_winners
+        ],
+        "top_winning_card": top_card,
+    }
@@ -1,12 +1,15 @@
-import random
-import pyinputplus as pyip
+from time import perf_counter_ns
+from . import profiling
 from .printing_functions import (
+    emit,
+    flush_frame,
     print_card,
     print_livecard,
     print_hand,
     print_available_moves,
 )
-from .game_management import print_game_over, play_again
+from .event_log import draw_event, pass_event, play_event
+from .game_management import print_game_over
 
 
 ########################################
@@ -14,190 +17,318 @@ from .game_management import print_game_over, play_again
 ########################################
 
 
-def turn_fixer(variable_list):
+def is_real_player(game_state, player_id):
+    """
+    Checks if the given player is the human seat of the game.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, including the headless flag.
+    player_id : int
+        The id of the player to check.
+
+    Returns
+    -------
+    bool
+        True if the player is the real player, False if it is an AI opponent or the game is headless.
+    """
+    return player_id == 1 and not game_state.headless
+
+
+def narrate(game_state, message):
+    """
+    Adds a game message to the turn's frame unless the game is running headless.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, including the headless flag.
+    message : str
+        The message to be printed.
+    """
+    if not game_state.headless:
+        emit(message)
+
+
+def seat_after(move_counter, steps, players_no):
+    """
+    Finds the seat reached by moving a number of steps around the table.
+
+    Seats form a ring, so any skip, reverse or multi-skip is a single modular step
+    whatever the number of players.
+
+    Parameters
+    ----------
+    move_counter : int
+        The id of the starting seat, between 1 and players_no.
+    steps : int
+        Number of seats to move, negative values move against the seat order.
+    players_no : int
+        Total number of players.
+
+    Returns
+    -------
+    int
+        The id of the seat reached, between 1 and players_no.
+    """
+    return (move_counter - 1 + steps) % players_no + 1
+
+
+def turn_fixer(game_state):
     """
     Adjusts the move counter to ensure it stays within the valid range of player numbers.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the move counter and number of players.
+    game_state : GameState
+        State of the game, including the move counter and number of players.
 
     Returns
     -------
-    dict
-        Updated dictionary with the corrected move counter.
-    """
-    move_counter = variable_list.get("move_counter")
-    players_no = variable_list.get("players_no")
-
-    if move_counter == players_no + 1:
-        move_counter = 1
-    elif move_counter == players_no + 2:
-        move_counter = 2
-    elif move_counter == 0:
-        move_counter = players_no
-    elif move_counter == -1:
-        move_counter = players_no - 1
-    else:
-        move_counter
+    GameState
+        Updated game state with the corrected move counter.
+    """
+    move_counter = game_state.move_counter
+    players_no = game_state.players_no
+
+    game_state.move_counter = seat_after(move_counter, 0, players_no)
+    return game_state
+
+
+def turn_switcher(game_state):
+    """
+    Passes the turn to the next seat in the current move direction.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, including the move counter and move direction.
+
+    Returns
+    -------
+    GameState
+        Updated game state with the adjusted move counter.
+    """
+    game_state.move_counter = seat_after(
+        game_state.move_counter,
+        game_state.move_direction,
+        game_state.players_no,
+    )
+    return game_state
+
+
+def ai_move(game_state, available_moves):
+    """
+    Picks the card an AI opponent plays from its available moves.
+
+    Seats with a strategy in game_state.ai_strategies ask it for the card and, for wild cards,
+    the color to declare. Other seats pick a random card.
 
-    variable_list["move_counter"] = move_counter
-    return variable_list
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, including the move counter and the AI strategies.
+    available_moves : list
+        List of available legal moves for the current player.
+
+    Returns
+    -------
+    int
+        The position of the chosen card in available_moves, starting from 1.
+    """
+    strategy = game_state.ai_strategies.get(game_state.move_counter)
+    if strategy is None:
+        return game_state.rng.randint(1, len(available_moves))
+    card_no, color = strategy.choose_move(game_state, available_moves)
+    game_state.declared_color = color
+    return card_no
 
 
-def turn_switcher(variable_list):
+def ai_wild_color(game_state, valid_colors):
     """
-    Updates the move counter based on the current move direction and ensures
-    it remains within the valid range of player numbers by calling turn_fixer.
+    Picks the color an AI opponent declares for its wild card.
+
+    Uses the color declared along with the card by the seat's strategy, if any,
+    otherwise picks a random color.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the move counter and move direction.
+    game_state : GameState
+        State of the game, including the declared color.
+    valid_colors : list
+        The colors that can be declared.
 
     Returns
     -------
-    dict
-        Updated dictionary with the adjusted move counter.
+    str
+        The declared color.
     """
-    move_counter = variable_list.get("move_counter")
-    move_direction = variable_list.get("move_direction")
+    color_change = game_state.declared_color
+    game_state.declared_color = None
+    if color_change is None:
+        color_change = game_state.rng.choice(valid_colors)
+    return color_change
 
-    move_counter = move_counter + move_direction
 
-    variable_list["move_counter"] = move_counter
-    variable_list = turn_fixer(variable_list)
+def pull_from_folded_deck(game_state):
+    """
+    Takes the top card of the folded deck.
 
-    return variable_list
+    The folded deck is kept shuffled, so drawing is an O(1) pop from its end. When it runs out,
+    every card of the table deck except the live card is recycled into a new shuffled folded deck.
 
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, including the folded deck and the table deck.
 
-def draw_card(variable_list):
+    Returns
+    -------
+    Card or None
+        The drawn card, or None if there is no card left to draw anywhere.
+    """
+    folded_deck = game_state.folded_deck
+    if not folded_deck:
+        table_deck = game_state.table_deck
+        if len(table_deck) <= 1:
+            return None
+        folded_deck.extend(table_deck[:-1])
+        if game_state.tracker is not None:
+            game_state.tracker.record_reshuffle(table_deck[:-1])
+        del table_deck[:-1]
+        game_state.rng.shuffle(folded_deck)
+        game_state.reshuffles += 1
+        narrate(game_state, "Folded deck ran out, reshuffling the table deck into it")
+    return folded_deck.pop()
+
+
+def draw_card(game_state):
     """
     Simulates drawing a card from the folded deck for the current player.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the move counter, folded deck, and player decks.
+    game_state : GameState
+        State of the game, including the move counter, folded deck, and player decks.
 
     Returns
     -------
     tuple
-        A tuple containing the drawn card and the updated dictionary with the adjusted player decks and folded deck.
+        A tuple containing the drawn card (None if there was nothing left to draw) and the updated
+        game state with the adjusted player decks and folded deck.
     """
-    move_counter = variable_list.get("move_counter")
-    folded_deck = variable_list.get("folded_deck")
-    all_players_deck = variable_list.get("all_players_deck")
+    move_counter = game_state.move_counter
+    all_players_deck = game_state.all_players_deck
 
     player_index = move_counter - 1
-    card_index = random.randint(0, len(folded_deck) - 1)
-    drawn_card = folded_deck.pop(card_index)
+    drawn_card = pull_from_folded_deck(game_state)
+    if drawn_card is None:
+        narrate(game_state, "No cards left to draw")
+        return drawn_card, game_state
     all_players_deck[player_index].append(drawn_card)
+    if game_state.event_log is not None:
+        game_state.event_log.record_card(draw_event, move_counter, drawn_card)
+    if game_state.tracker is not None:
+        game_state.tracker.record_draw(move_counter)
 
     # Only printing drawn card if player 1 i.e. real player's move
-    if move_counter == 1:
-        print("Drawn Card:-")
+    if is_real_player(game_state, move_counter):
+        emit("Drawn Card:-")
         print_card(drawn_card)
     else:
         pass
 
-    variable_list["all_players_deck"] = all_players_deck
-    variable_list["folded_deck"] = folded_deck
-    return drawn_card, variable_list
+    return drawn_card, game_state
 
 
-def checking_legal_move(card, variable_list):
+def checking_legal_move(card, game_state):
     """
     Checks if the given card is a legal move based on the current livecard.
 
     Parameters
     ----------
-    card : dict
-        Dictionary containing the card's face and color.
-    variable_list : dict
-        Dictionary containing game variables, including the livecard and possible colors.
+    card : Card
+        The card to be checked.
+    game_state : GameState
+        State of the game, including the livecard.
 
     Returns
     -------
     bool
         True if the move is legal, False otherwise.
     """
-    livecard = variable_list.get("livecard")
-    possible_colors = variable_list.get("possible_colors")
+    livecard = game_state.livecard
 
-    if (card.get("face") == livecard.get("face")) or (
-        card.get("color") in [livecard.get("color"), possible_colors[4]]
-    ):
-        result = True
-    else:
-        result = False
-    return result
+    return card.is_wild or card.face == livecard.face or card.color == livecard.color
 
 
-def player_available_moves(variable_list):
+def player_available_moves(game_state):
     """
     Determines the available legal moves for the current player based on their hand and the game's live card.
     If no legal moves are available, draws a card from the folded deck and checks its legality.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the move counter and all players' decks.
+    game_state : GameState
+        State of the game, including the move counter and all players' decks.
 
     Returns
     -------
     tuple
-        A tuple containing the list of available legal moves and the updated game variables dictionary.
+        A tuple containing the list of available legal moves and the updated game state.
     """
-    move_counter = variable_list.get("move_counter")
-    all_players_deck = variable_list.get("all_players_deck")
+    move_counter = game_state.move_counter
+    all_players_deck = game_state.all_players_deck
+    livecard = game_state.livecard
 
-    available_moves = []
     player_index = move_counter - 1
-    for card in all_players_deck[player_index]:
-        if checking_legal_move(card, variable_list):
-            available_moves.append(card)
-            continue
+    available_moves = all_players_deck[player_index].legal_moves(livecard)
     if available_moves == []:
-        print("No legal moves available, drawing one card from folded deck\n")
-        drawn_card, variable_list = draw_card(variable_list)
-        if checking_legal_move(drawn_card, variable_list):
+        narrate(
+            game_state,
+            "No legal moves available, drawing one card from folded deck\n",
+        )
+        drawn_card, game_state = draw_card(game_state)
+        if game_state.tracker is not None:
+            # Still out of the live card's color, a matching drawn card is played right away
+            game_state.tracker.record_void(move_counter, livecard)
+        if drawn_card is not None and checking_legal_move(drawn_card, game_state):
             available_moves.append(drawn_card)
         else:
             pass
 
-    return available_moves, variable_list
+    return available_moves, game_state
 
 
-def post_move_display(variable_list):
+def post_move_display(game_state):
     """
     Prints a message indicating the player who made the move and the move itself.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the move counter, livecard, and players' names.
+    game_state : GameState
+        State of the game, including the move counter, livecard, and players' names.
     """
-    player_id = variable_list.get("move_counter")
+    player_id = game_state.move_counter
     player_index = player_id - 1
-    livecard = variable_list.get("livecard")
-    players_names = variable_list.get("players_names")
+    livecard = game_state.livecard
+    players_names = game_state.players_names
     player_name = players_names[player_index].get("player_name")
 
     if player_id == 1:
         # i.e. Real Player Move
-        print(f"{player_name} (Player-{player_id}) plays :- ")
+        emit(f"{player_name} (Player-{player_id}) plays :- ")
 
     else:
         # i.e. AI opponent Move
-        print(f"AI Opponent ({player_name},Player-{player_id}) plays :- ")
+        emit(f"AI Opponent ({player_name},Player-{player_id}) plays :- ")
 
     print_card(livecard)
-    print("----------------------------------------------------------")
+    emit("----------------------------------------------------------")
 
 
-def play_card(card_id, variable_list, available_moves):
+def play_card(card_id, game_state, available_moves):
     """
     Simulates a player playing a card from their hand.
 
@@ -205,186 +336,133 @@ def play_card(card_id, variable_list, available_moves):
     ----------
     card_id : int
         The position of the card in the player's hand that they want to play.
-    variable_list : dict
-        Dictionary containing game variables, including the move counter, livecard, and players' decks.
+    game_state : GameState
+        State of the game, including the move counter, livecard, and players' decks.
     available_moves : list
         List of available moves for the current player.
 
     Returns
     -------
     tuple
-        A tuple containing the updated dictionary with the played card removed from the player's deck and added to the table deck, and a game over flag of 1 if the player has won, or 0 if the game is not over.
+        A tuple containing the updated game state with the played card removed from the player's deck and added to the table deck, and a game over flag of 1 if the player has won, or 0 if the game is not over.
     """
-    move_counter = variable_list.get("move_counter")
-    all_players_deck = variable_list.get("all_players_deck")
-    table_deck = variable_list.get("table_deck")
+    move_counter = game_state.move_counter
+    all_players_deck = game_state.all_players_deck
+    table_deck = game_state.table_deck
 
     player_index = move_counter - 1
     card_index = card_id - 1
 
-    player_deck_card_index = all_players_deck[player_index].index(
-        available_moves[card_index]
-    )
-    livecard = all_players_deck[player_index].pop(player_deck_card_index)
+    livecard = available_moves[card_index]
+    all_players_deck[player_index].remove(livecard)
     table_deck.append(livecard)
 
-    variable_list["livecard"] = livecard
-    variable_list["all_players_deck"] = all_players_deck
-    variable_list["table_deck"] = table_deck
+    game_state.cards_played += 1
+    game_state.livecard = livecard
 
     if len(all_players_deck[player_index]) == 0:
         game_over_flag = 1
     else:
         game_over_flag = 0
 
-    return variable_list, game_over_flag
+    if game_state.tracker is not None:
+        game_state.tracker.record_play(move_counter, livecard)
+
+    event_log = game_state.event_log
+    if event_log is not None:
+        event_log.record_card(play_event, move_counter, livecard)
+        if game_over_flag == 1:
+            event_log.record_win(game_state)
+
+    return game_state, game_over_flag
 
 
 # For +2, +4, Reverse and Skip
 
 
-def livecard_automove(variable_list):
+def livecard_automove(game_state):
     """
     Automates the moves for special cards (Reverse, Skip, +2, +4, Wild Card) and
     updates the game variables accordingly.
 
+    The effect of every card was compiled into game_state.effects from the game's rule set
+    when the cards were dealt (see engine.rules), so this is a single lookup by card id
+    whatever house rules are installed.
+
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the move counter, livecard, and players' decks.
+    game_state : GameState
+        State of the game, including the move counter, livecard, and players' decks.
 
     Returns
     -------
-    dict
-        Updated dictionary containing the game variables, including the move counter, livecard, and players' decks.
-    """
-    players_no = variable_list.get("players_no")
-    livecard = variable_list.get("livecard")
-    move_counter = variable_list.get("move_counter")
-    move_direction = variable_list.get("move_direction")
-    possible_faces = variable_list.get("possible_faces")
-    folded_deck = variable_list.get("folded_deck")
-    all_players_deck = variable_list.get("all_players_deck")
-    card_face = livecard.get("face")
-
-    player_index = move_counter - 1
-
-    if card_face == possible_faces[10]:
-        print("2 cards were added")
-        if move_counter == 1:
-            # If real player
-            print("Added Cards:-")
-        else:
-            # If AI opponent
-            pass
-        for _ in range(2):
-            card_index = random.randint(0, len(folded_deck) - 1)
-            addcard = folded_deck.pop(card_index)
-            all_players_deck[player_index].append(addcard)
-            if move_counter == 1:
-                # If real player
-                print_card(addcard)
-            else:
-                # If AI opponent
-                pass
-
-    elif card_face == possible_faces[11]:
-        move_direction = move_direction * -1
-        move_counter = move_counter + 2 * move_direction
-        print("Move Direction Reversed")
-
-    elif card_face == possible_faces[12]:
-        move_counter = move_counter + move_direction
-        print("Next Player's Move Skipped")
-
-    elif card_face == possible_faces[13]:
-        print("+4 Card")
-        valid_colors = ["red", "blue", "green", "yellow"]
-        prev_move_counter = move_counter - move_direction
-        if prev_move_counter in [1, players_no + 1]:
-            # Previous move player is Real Player
-            print("What color do you want played?\n")
-            color_change = pyip.inputChoice(valid_colors)
-        else:
-            #  Previous move player is AI opponent
-            color_change = random.choice(valid_colors)
-
-        livecard = {"face": "  ", "color": color_change}
-        if move_counter == 1:
-            # If real player
-            print("Added Cards:-")
-        else:
-            # If AI opponent
-            pass
-        for _ in range(4):
-            card_index = random.randint(0, len(folded_deck) - 1)
-            addcard = folded_deck.pop(card_index)
-            all_players_deck[player_index].append(addcard)
-            if move_counter == 1:
-                # If real player
-                print_card(addcard)
-            else:
-                # If AI opponent
-                pass
-
-    elif card_face == possible_faces[14]:
-        print("Wild Card")
-        valid_colors = ["red", "blue", "green", "yellow"]
-
-        prev_move_counter = move_counter - move_direction
-        if prev_move_counter in [1, players_no + 1]:
-            # Previous move player is Real Player
-            print("What color do you want played?\n")
-            color_change = pyip.inputChoice(valid_colors)
-        else:
-            #  Previous move player is AI opponent
-            color_change = random.choice(valid_colors)
-        livecard = {"face": "  ", "color": color_change}
-
-    variable_list["livecard"] = livecard
-    variable_list["move_counter"] = move_counter
-    variable_list["move_direction"] = move_direction
-    variable_list["folded_deck"] = folded_deck
-    variable_list["all_players_deck"] = all_players_deck
-
-    variable_list = turn_fixer(variable_list)
-    return variable_list
+    GameState
+        Updated game state, including the move counter, livecard, and players' decks.
+    """
+    effect = game_state.effects[game_state.livecard.card_id]
+    if effect is not None:
+        game_state = effect(game_state)
+    return game_state
 
 
-def pre_move_management(variable_list):
+def pre_move_management(game_state):
     """
     Manages the pre-move actions for the current player by displaying their hand,
     determining available legal moves, and printing them.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the move counter and all players' decks.
+    game_state : GameState
+        State of the game, including the move counter and all players' decks.
 
     Returns
     -------
     tuple
-        A tuple containing the updated game variables dictionary and the list of available legal moves.
+        A tuple containing the updated game state and the list of available legal moves.
     """
-    player_id = variable_list.get("move_counter")
-    print_livecard(variable_list)
+    player_id = game_state.move_counter
+    if game_state.headless:
+        # i.e. Headless simulation, no display at all
+        available_moves, game_state = player_available_moves(game_state)
+        return game_state, available_moves
+
+    print_livecard(game_state)
     if player_id == 1:
         # i.e. Real Player Move
-        print_hand(variable_list, player_nature="real")
-        available_moves, variable_list = player_available_moves(variable_list)
+        print_hand(game_state, player_nature="real")
+        available_moves, game_state = player_available_moves(game_state)
         print_available_moves(available_moves, player_nature="real")
 
     else:
         # i.e. AI opponent Move
-        print_hand(variable_list, player_nature="ai")
-        available_moves, variable_list = player_available_moves(variable_list)
+        print_hand(game_state, player_nature="ai")
+        available_moves, game_state = player_available_moves(game_state)
         print_available_moves(available_moves, player_nature="ai")
 
-    print("----------------------------------------------------------")
-    return variable_list, available_moves
+    emit("----------------------------------------------------------")
+    return game_state, available_moves
 
 
-def play_move_management(card_id, variable_list, available_moves):
+def pass_turn(game_state):
+    """
+    Passes the turn of a player who has nothing to play.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, including the move counter.
+
+    Returns
+    -------
+    GameState
+        Updated game state with the turn passed to the next player.
+    """
+    if game_state.event_log is not None:
+        game_state.event_log.record(pass_event, game_state.move_counter)
+    return turn_switcher(game_state)
+
+
+def play_move_management(card_id, game_state, available_moves):
     """
     Manages the post-move actions for the current player by displaying the played card,
     switching the turn, and checking for any automatic moves by the livecard.
@@ -393,28 +471,40 @@ def play_move_management(card_id, variable_list, available_moves):
     ----------
     card_id : int
         The position of the card in the player's hand that they want to play.
-    variable_list : dict
-        Dictionary containing game variables, including the move counter and all players' decks.
+    game_state : GameState
+        State of the game, including the move counter and all players' decks.
     available_moves : list
         List of available legal moves for the current player.
 
     Returns
     -------
-    dict
-        Updated dictionary containing the game variables.
+    GameState
+        Updated game state.
     """
-    variable_list, game_over_flag = play_card(card_id, variable_list, available_moves)
+    game_state, game_over_flag = play_card(card_id, game_state, available_moves)
     if game_over_flag == 1:
-        print_game_over(variable_list)
-        variable_list = play_again()
+        # The winner is recorded, the session running the game decides what comes next
+        game_state.winner = game_state.move_counter
+        if not game_state.headless:
+            flush_frame()
+            print_game_over(game_state)
     elif game_over_flag == 0:
-        post_move_display(variable_list)
-        variable_list = turn_switcher(variable_list)
-        variable_list = livecard_automove(variable_list)
-    return variable_list
+        if not game_state.headless:
+            post_move_display(game_state)
+        profiler = profiling.phase_profiler
+        if profiler is None:
+            game_state = turn_switcher(game_state)
+            game_state = livecard_automove(game_state)
+        else:
+            started = perf_counter_ns()
+            game_state = turn_switcher(game_state)
+            started = profiler.lap("turn_switcher", started)
+            game_state = livecard_automove(game_state)
+            profiler.lap("livecard_automove", started)
+    return game_state
 
 
-def main_move_manager(variable_list):
+def main_move_manager(game_state):
     """
     Manages the main game loop by calling pre_move_management to display the player's hand and available moves,
     and then either switching the turn if no moves are available or calling play_move_management to play a card
@@ -422,22 +512,34 @@ def main_move_manager(variable_list):
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the move counter, livecard, and players' decks.
+    game_state : GameState
+        State of the game, including the move counter, livecard, and players' decks.
 
     Returns
     -------
-    dict
-        Updated dictionary containing the game variables.
+    GameState
+        Updated game state.
     """
-    player_id = variable_list.get("move_counter")
-    variable_list, available_moves = pre_move_management(variable_list)
+    player_id = game_state.move_counter
+    game_state.turns += 1
+    # Phase timings are only taken when profiling was switched on for the session
+    profiler = profiling.phase_profiler
+    if profiler is not None:
+        started = perf_counter_ns()
+    game_state, available_moves = pre_move_management(game_state)
+    if profiler is not None:
+        started = profiler.lap("pre_move_management", started)
 
     if len(available_moves) == 0:
-        variable_list = turn_switcher(variable_list)
+        game_state = pass_turn(game_state)
+        if profiler is not None:
+            profiler.lap("turn_switcher", started)
     else:
-        if player_id == 1:
-            # i.e. Real Player
+        if is_real_player(game_state, player_id):
+            # i.e. Real Player, the prompt library is only imported for human seats
+            import pyinputplus as pyip
+
+            flush_frame()
             card_no = pyip.inputInt(
                 "Select card from available moves to play\n",
                 min=1,
@@ -445,7 +547,13 @@ def main_move_manager(variable_list):
             )
         else:
             # AI opponent
-            card_no = random.randint(1, len(available_moves))
-        variable_list = play_move_management(card_no, variable_list, available_moves)
-
-    return variable_list
+            card_no = ai_move(game_state, available_moves)
+        if profiler is not None:
+            started = profiler.lap("decision", started)
+        game_state = play_move_management(card_no, game_state, available_moves)
+        if profiler is not None:
+            profiler.lap("play_move_management", started)
+
+    # The whole turn goes out to the terminal in a single write
+    flush_frame()
+    return game_state
@@ -1,4 +1,6 @@
-from operator import itemgetter
+import sys
+from operator import attrgetter
+from .cards import all_cards
 
 ########################################
 # Welcome Screen
@@ -88,48 +90,114 @@ def begin_print():
 
 
 ########################################
-# Printing Cards
+# Card Glyphs and Frames
 ########################################
 
+color_codes = {
+    "red": "\033[91m",
+    "green": "\033[92m",
+    "yellow": "\033[93m",
+    "blue": "\033[94m",
+    "black": "\033[98m",
+}
+reset_code = "\033[00m"
+card_width = 7
 
-def prRed(skk):
-    """
-    Prints a string in red color
-    :param skk: String to be printed in red color
+
+def build_card_glyph(card):
     """
-    print("\033[91m {}\033[00m".format(skk))
+    Builds the five colored rows used to draw a card
 
+    Parameters
+    ----------
+    card : Card
+        The card to be drawn
 
-def prGreen(skk):
+    Returns
+    -------
+    tuple
+        The five rows of the card, each wrapped in the card's ANSI color
     """
-    Prints a string in green color
-    :param skk: String to be printed in green color
-    """
-    print("\033[92m {}\033[00m".format(skk))
+    card_print_rows = [
+        " _____ ",
+        "|     |",
+        "| " + card.face + "  |",
+        "|     |",
+        " ‾‾‾‾‾ ",
+    ]
+    color_code = color_codes[card.color]
+    return tuple(color_code + row + reset_code for row in card_print_rows)
+
+
+# Every card, recolored wilds included, is drawn once when the module is imported
+card_glyphs = {card: build_card_glyph(card) for card in all_cards}
+
+# Text of the frame being composed, written out in one go by flush_frame()
+frame_lines = []
 
 
-def prYellow(skk):
+def emit(text):
     """
-    Prints a string in yellow color
-    :param skk: String to be printed in yellow color
+    Adds text to the frame being composed
+
+    Parameters
+    ----------
+    text : str
+        The text to be shown, without a trailing newline
     """
-    print("\033[93m {}\033[00m".format(skk))
+    frame_lines.append(text)
 
 
-def prBlue(skk):
+def flush_frame():
     """
-    Prints a string in blue color
-    :param skk: String to be printed in blue color
+    Writes the composed frame to the terminal with a single write and starts a new one
     """
-    print("\033[94m {}\033[00m".format(skk))
+    if frame_lines:
+        frame_lines.append("")
+        sys.stdout.write("\n".join(frame_lines))
+        sys.stdout.flush()
+        frame_lines.clear()
 
 
-def prBlack(skk):
+def render_cards(cards, numbered=False, width=None):
     """
-    Prints a string in black color
-    :param skk: String to be printed in black color
+    Lays cards out side by side, wrapping them to the terminal width
+
+    Parameters
+    ----------
+    cards : list
+        The cards to be laid out
+    numbered : bool, optional
+        If True, each card gets its position (starting from 1) written under it
+    width : int, optional
+        Width of the terminal, detected when not given
+
+    Returns
+    -------
+    str
+        The rows of cards, ready to be emitted
     """
-    print("\033[98m {}\033[00m".format(skk))
+    if width is None:
+        # Imported here, it is slow to import and headless games never render cards
+        import shutil
+
+        width = shutil.get_terminal_size().columns
+    cards_per_line = max(1, (width - 1) // (card_width + 1))
+
+    lines = []
+    for start in range(0, len(cards), cards_per_line):
+        glyphs = [card_glyphs[card] for card in cards[start : start + cards_per_line]]
+        for row in range(5):
+            lines.append(" " + " ".join(glyph[row] for glyph in glyphs))
+        if numbered:
+            lines.append(
+                " "
+                + " ".join(
+                    str(card_no).center(card_width)
+                    for card_no in range(start + 1, start + len(glyphs) + 1)
+                )
+            )
+    return "\n".join(lines)
 
 
 # Print Cards
@@ -139,42 +207,23 @@ def print_card(card):
 
     Parameters
     ----------
-    card : dict
-        Dictionary containing the card's face and color
+    card : Card
+        The card to be printed
     """
-
-    card_color = card.get("color")
-    card_face = card.get("face")
-    card_print_rows = ["", "", "", "", ""]
-    card_print_rows[0] = " _____ "
-    card_print_rows[1] = "|     |"
-    card_print_rows[2] = "| " + card_face + "  |"
-    card_print_rows[3] = "|     |"
-    card_print_rows[4] = " ‾‾‾‾‾ "
-    for row in card_print_rows:
-        if card_color == "red":
-            prRed(row)
-        elif card_color == "blue":
-            prBlue(row)
-        elif card_color == "yellow":
-            prYellow(row)
-        elif card_color == "green":
-            prGreen(row)
-        elif card_color == "black":
-            prBlack(row)
+    emit("\n".join(" " + row for row in card_glyphs[card]))
 
 
 # Printing Cards for Display PlayerWise
 
 
-def print_hand(variable_list, player_nature):
+def print_hand(game_state, player_nature):
     """
     Displays the current player's hand of cards.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the move counter and all players' decks.
+    game_state : GameState
+        State of the game, including the move counter and all players' decks.
     player_nature : str
         A string indicating the player's nature, either "real" for a real player or "ai" for an AI opponent.
 
@@ -183,38 +232,37 @@ def print_hand(variable_list, player_nature):
     If the player_nature is "real", prints the player's name and their hand of cards.
     If the player_nature is "ai", prints a message indicating that the AI opponent is examining their hand.
     """
-    player_id = variable_list.get("move_counter")
-    all_players_deck = variable_list.get("all_players_deck")
-    players_names = variable_list.get("players_names")
+    player_id = game_state.move_counter
+    all_players_deck = game_state.all_players_deck
+    players_names = game_state.players_names
 
     player_index = player_id - 1
 
     player_name = players_names[player_index].get("player_name")
     if player_nature == "real":
-        print(f"{player_name} (Player-{player_id})'s Hand :-")
-        for card in all_players_deck[player_index]:
-            print_card(card)
+        emit(f"{player_name} (Player-{player_id})'s Hand :-")
+        emit(render_cards(list(all_players_deck[player_index])))
     elif player_nature == "ai":
-        print(
+        emit(
             f"AI Opponent ({player_name},Player-{player_id}) is examining their hand... "
         )
 
 
-def print_livecard(variable_list):
+def print_livecard(game_state):
     """
     Prints the current live card.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the move counter and the live card.
+    game_state : GameState
+        State of the game, including the move counter and the live card.
 
     Prints
     ------
     The current live card.
     """
-    livecard = variable_list.get("livecard")
-    print("Livecard")
+    livecard = game_state.livecard
+    emit("Livecard")
     print_card(livecard)
 
 
@@ -236,57 +284,56 @@ def print_available_moves(player_available_moves, player_nature):
     If the player_nature is "ai", doesn't print anything (for AI opponents).
     """
     if player_available_moves == []:
-        print(
+        emit(
             "No available moves since the drawn card isn't legal either, hence passing the turn"
         )
     else:
         if player_nature == "real":
-            print("Available Moves:-")
-            for card in player_available_moves:
-                print_card(card)
+            emit("Available Moves:-")
+            emit(render_cards(player_available_moves, numbered=True))
         elif player_nature == "ai":
             pass
 
 
-def print_table_deck(variable_list):
+def print_table_deck(game_state):
     """
     Prints the table deck of cards in a sorted order.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the table deck.
+    game_state : GameState
+        State of the game, including the table deck.
 
     Prints
     ------
     The cards in the table deck, sorted first by color and then by face value in ascending order.
     """
-    table_deck = variable_list.get("table_deck")
-    # Sort the dictionary by color and then by face value (ascending order)
-    sorted_table_deck = sorted(table_deck, key=itemgetter("color", "face"))
-    for card in sorted_table_deck:
-        print_card(card)
+    table_deck = game_state.table_deck
+    # Sort the cards by color and then by face value (ascending order)
+    sorted_table_deck = sorted(table_deck, key=attrgetter("color", "face"))
+    emit(render_cards(sorted_table_deck))
+    flush_frame()
 
 
-def print_all_cards_easyread(variable_list):
+def print_all_cards_easyread(game_state):
     """
     Prints all the cards in the game in an easy-to-read format.
 
     Parameters
     ----------
-    variable_list : dict
-        Dictionary containing game variables, including the folded deck, table deck, live card, all players' decks, and players' names.
+    game_state : GameState
+        State of the game, including the folded deck, table deck, live card, all players' decks, and players' names.
 
     Prints
     ------
     The live card, each player's hand (numbered for identification), the folded deck, and the table deck, all in an easy-to-read format.
     """
 
-    folded_deck = variable_list.get("folded_deck")
-    table_deck = variable_list.get("table_deck")
-    livecard = variable_list.get("livecard")
-    all_players_deck = variable_list.get("all_players_deck")
-    players_names = variable_list.get("players_names")
+    folded_deck = game_state.folded_deck
+    table_deck = game_state.table_deck
+    livecard = game_state.livecard
+    all_players_deck = game_state.all_players_deck
+    players_names = game_state.players_names
 
     print("         Live Card")
     print(livecard)
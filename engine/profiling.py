@@ -0,0 +1,164 @@
+import atexit
+import sys
+from time import perf_counter_ns
+
+
+########################################
+# Phase Profiler
+########################################
+
+# Phases of a turn timed by main_move_manager, play_move_management includes the last two
+turn_phases = (
+    "pre_move_management",
+    "decision",
+    "play_move_management",
+    "turn_switcher",
+    "livecard_automove",
+)
+
+# Profiler the engine reports phase timings to, None when profiling is off
+phase_profiler = None
+
+
+class PhaseProfiler:
+    """
+    Call counts, total time and a latency histogram for each phase of a turn.
+
+    Timings are perf_counter_ns() differences filed in power of two nanosecond buckets,
+    so recording a call is a few integer operations and the histograms stay small however
+    long the session is.
+    """
+
+    def __init__(self):
+        self.calls = dict.fromkeys(turn_phases, 0)
+        self.total_ns = dict.fromkeys(turn_phases, 0)
+        self.histograms = {phase: {} for phase in turn_phases}
+
+    def lap(self, phase, started):
+        """
+        Records a phase that began at started (a perf_counter_ns() reading).
+
+        Returns
+        -------
+        int
+            The perf_counter_ns() reading the phase ended at, to start timing the next phase.
+        """
+        now = perf_counter_ns()
+        elapsed = now - started
+        self.calls[phase] += 1
+        self.total_ns[phase] += elapsed
+        histogram = self.histograms[phase]
+        bucket = elapsed.bit_length()
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+        return now
+
+    def percentile_ns(self, phase, percentile):
+        """
+        Returns an upper bound of a phase's percentile latency in nanoseconds, from its histogram.
+        """
+        rank = percentile / 100 * self.calls[phase]
+        seen = 0
+        for bucket in sorted(self.histograms[phase]):
+            seen += self.histograms[phase][bucket]
+            if seen >= rank:
+                return 1 << bucket
+        return 0
+
+    def as_dict(self):
+        """
+        Returns the collected timings, with histograms as {bucket upper bound in ns: calls}.
+        """
+        return {
+            phase: {
+                "calls": self.calls[phase],
+                "total_ns": self.total_ns[phase],
+                "histogram": {
+                    1 << bucket: count
+                    for bucket, count in sorted(self.histograms[phase].items())
+                },
+            }
+            for phase in turn_phases
+        }
+
+    def report(self):
+        """
+        Returns a table of the calls, total, mean and percentile latencies of every phase.
+        """
+        lines = [
+            f"{'phase':<22}{'calls':>10}{'total ms':>12}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}"
+        ]
+        for phase in turn_phases:
+            calls = self.calls[phase]
+            if calls == 0:
+                continue
+            total_ns = self.total_ns[phase]
+            lines.append(
+                f"{phase:<22}{calls:>10}{total_ns / 1e6:>12.1f}{total_ns / calls / 1e3:>10.1f}"
+                f"{self.percentile_ns(phase, 50) / 1e3:>10.1f}{self.percentile_ns(phase, 99) / 1e3:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+########################################
+# Session Switches
+########################################
+
+
+def enable_phase_profiling(dump_path=None):
+    """
+    Starts timing the phases of every turn, and reports them when the process exits.
+
+    Parameters
+    ----------
+    dump_path : str, optional
+        JSON file the timings and histograms are written to. By default they are
+        printed as a table on stderr.
+
+    Returns
+    -------
+    PhaseProfiler
+        The profiler collecting the timings.
+    """
+    # Imported here rather than at startup, like cProfile, every game imports this module
+    import json
+
+    global phase_profiler
+    profiler = PhaseProfiler()
+    phase_profiler = profiler
+
+    def report_at_exit():
+        if dump_path is None:
+            sys.stderr.write(profiler.report() + "\n")
+        else:
+            with open(dump_path, "w", encoding="utf-8") as dump_file:
+                json.dump(profiler.as_dict(), dump_file, indent=2)
+
+    atexit.register(report_at_exit)
+    return profiler
+
+
+def enable_cprofile(prof_path):
+    """
+    Runs the rest of the session under cProfile and writes the stats when the process exits.
+
+    Parameters
+    ----------
+    prof_path : str
+        The .prof file the stats are written to, readable with pstats or snakeviz.
+
+    Returns
+    -------
+    cProfile.Profile
+        The running profiler.
+    """
+    import cProfile
+
+    profile = cProfile.Profile()
+
+    def dump_at_exit():
+        profile.disable()
+        profile.dump_stats(prof_path)
+
+    atexit.register(dump_at_exit)
+    profile.enable()
+    return profile
@@ -0,0 +1,316 @@
+import random
+import time
+from collections import Counter, namedtuple
+from .cards import card_from_id
+from .event_log import (
+    EventBuffer,
+    deal_event,
+    deal_header,
+    deal_rule_set,
+    describe_event,
+    draw_event,
+    event_names,
+    parse_events,
+    pass_event,
+    play_event,
+    read_events,
+    recolor_event,
+)
+from .game_state import GameState
+from .hand import Hand
+from .movements import pass_turn, play_move_management, pre_move_management
+from .rules import compile_effects
+
+
+########################################
+# Replaying Logs
+########################################
+
+# Outcome of replaying a log file
+ReplaySummary = namedtuple("ReplaySummary", ["games", "events", "elapsed", "final_states"])
+
+
+class ReplayError(ValueError):
+    """
+    Raised when a log doesn't describe a game the engine could have played.
+    """
+
+
+class ReplayRandom(random.Random):
+    """
+    Random number generator of a replayed game, whose shuffles deal the logged draws.
+
+    When the folded deck runs out the engine shuffles the table deck into it. The log doesn't
+    hold the order it was shuffled in, but it holds the cards drawn from it, so the shuffle
+    puts them on top of the pile in the order they are drawn. A card that isn't in the pile
+    is left out, and the engine then draws another card than the logged one.
+
+    Parameters
+    ----------
+    replay : GameReplay
+        The replay whose upcoming draws the shuffles deal.
+    """
+
+    def __init__(self, replay):
+        super().__init__(0)
+        self.replay = replay
+
+    def shuffle(self, cards):
+        left = Counter(cards)
+        drawn = []
+        for card in self.replay.upcoming_draws():
+            if len(drawn) == len(cards) or not left[card]:
+                break
+            left[card] -= 1
+            drawn.append(card)
+        pile = []
+        for card in cards:
+            if left[card]:
+                left[card] -= 1
+                pile.append(card)
+        drawn.reverse()
+        cards[:] = pile + drawn
+
+
+def deal_from_event(payload, rng=None):
+    """
+    Rebuilds a dealt game from the payload of a deal event.
+
+    Parameters
+    ----------
+    payload : bytes
+        Payload of the deal event.
+    rng : random.Random, optional
+        Random number generator of the rebuilt game.
+
+    Returns
+    -------
+    GameState
+        A headless game in the state it was dealt in, with the effects of its rule set.
+
+    Raises
+    ------
+    ReplayError
+        If the game's rule set isn't registered in this process.
+    """
+    players_no, first_hand_count, deck_count, rule_set_size = deal_header.unpack_from(payload)
+    rule_set = deal_rule_set(payload)
+    cards = [
+        card_from_id(card_id) for card_id in payload[deal_header.size + rule_set_size :]
+    ]
+    players_names = [
+        {"player_id": player + 1, "player_name": f"Player-{player + 1}"}
+        for player in range(players_no)
+    ]
+    game_state = GameState(
+        players_no, first_hand_count, players_names, rng=rng, headless=True, rule_set=rule_set
+    )
+    game_state.deck_count = deck_count
+    try:
+        game_state.effects = compile_effects(rule_set)
+    except ValueError as error:
+        raise ReplayError(str(error)) from None
+
+    dealt_count = players_no * first_hand_count
+    game_state.all_players_deck = [
+        Hand(cards[start : start + first_hand_count])
+        for start in range(0, dealt_count, first_hand_count)
+    ]
+    game_state.livecard = cards[dealt_count]
+    game_state.table_deck = [game_state.livecard]
+    game_state.folded_deck = cards[dealt_count + 1 :]
+    game_state.cards_played = 1
+    return game_state
+
+
+class GameReplay:
+    """
+    Plays a logged game again with the engine's own movement and effect code.
+
+    Every turn is played by the engine (pre_move_management draws when the player has no
+    legal move, play_move_management plays the card and applies its effect from the game's
+    compiled rule set, pass_turn passes), with the only choices left to the players, the
+    card played and the color declared, taken from the log. The events the engine records
+    for the turn must then be exactly the logged ones, so a log and a rule change can't
+    drift apart without replay noticing, and a pass or a draw is only accepted when the
+    player had no legal move.
+
+    Parameters
+    ----------
+    deal_payload : bytes
+        Payload of the game's deal event.
+    events : list
+        The (kind, player, payload) events of the game after its deal, in order.
+    """
+
+    def __init__(self, deal_payload, events):
+        self.events = events
+        self.cursor = 0
+        self.game_state = deal_from_event(deal_payload, rng=ReplayRandom(self))
+        self.game_state.event_log = EventBuffer()
+
+    def recorded_events(self):
+        """
+        Returns the events the engine recorded since the last checked turn.
+        """
+        return list(parse_events(self.game_state.event_log.buffer))
+
+    def upcoming_draws(self):
+        """
+        Yields the cards of the logged draws the engine hasn't made yet, in order.
+        """
+        position = self.cursor + len(self.recorded_events())
+        for kind, _, payload in self.events[position:]:
+            if kind == draw_event:
+                yield card_from_id(payload[0])
+
+    def play_turn(self):
+        """
+        Plays the next turn of the game and checks its events against the log.
+
+        Returns
+        -------
+        list
+            The (kind, player, payload) events of the turn.
+
+        Raises
+        ------
+        ReplayError
+            If the logged turn isn't the one the engine plays.
+        """
+        game_state = self.game_state
+        player_id = game_state.move_counter
+        game_state.turns += 1
+        game_state, available_moves = pre_move_management(game_state)
+
+        position = self.cursor + len(self.recorded_events())
+        if position >= len(self.events):
+            raise ReplayError("The log ends in the middle of a game")
+        kind, player, payload = self.events[position]
+        if not available_moves:
+            game_state = pass_turn(game_state)
+        elif kind == play_event and player == player_id:
+            card = card_from_id(payload[0])
+            if card not in available_moves:
+                raise ReplayError(f"Player-{player_id} played {card}, not one of their legal moves")
+            if card.is_wild:
+                game_state.declared_color = self.declared_color(position + 1)
+            card_no = available_moves.index(card) + 1
+            game_state = play_move_management(card_no, game_state, available_moves)
+        else:
+            raise ReplayError(
+                f"Player-{player_id} had a legal move but the log has "
+                f"{event_names[kind] if kind < len(event_names) else kind} by Player-{player}"
+            )
+        self.game_state = game_state
+        return self.check_turn()
+
+    def declared_color(self, position):
+        """
+        Returns the color logged for the wild card played at position - 1, None if none is logged.
+        """
+        for kind, _, payload in self.events[position:]:
+            if kind == recolor_event:
+                return card_from_id(payload[0]).color
+            if kind == play_event:
+                break
+        return None
+
+    def check_turn(self):
+        """
+        Compares the events the engine recorded for the turn with the next logged events.
+        """
+        recorded = self.recorded_events()
+        self.game_state.event_log.buffer.clear()
+        logged = self.events[self.cursor : self.cursor + len(recorded)]
+        for engine_event, logged_event in zip(recorded, logged):
+            if engine_event != logged_event:
+                raise ReplayError(
+                    f"The engine recorded '{describe_event(*engine_event).strip()}' where the "
+                    f"log has '{describe_event(*logged_event).strip()}'"
+                )
+        if len(logged) < len(recorded):
+            raise ReplayError("The log ends in the middle of a game")
+        self.cursor += len(recorded)
+        return recorded
+
+    def play(self, on_event=None):
+        """
+        Plays the game to its logged end.
+
+        Returns
+        -------
+        GameState
+            The final state of the game.
+        """
+        while self.game_state.winner is None:
+            for kind, player, payload in self.play_turn():
+                if on_event is not None:
+                    on_event(self.game_state, kind, player, payload)
+        if self.cursor < len(self.events):
+            kind = self.events[self.cursor][0]
+            raise ReplayError(f"{event_names[kind]} event outside of a game")
+        self.game_state.event_log = None
+        return self.game_state
+
+
+def logged_games(path):
+    """
+    Splits a log file into its games.
+
+    Yields
+    ------
+    tuple
+        The payload of each game's deal event and the list of the events that follow it.
+    """
+    deal_payload = None
+    events = []
+    for kind, player, payload in read_events(path):
+        if kind == deal_event:
+            if deal_payload is not None:
+                yield deal_payload, events
+            deal_payload = payload
+            events = []
+        elif deal_payload is None:
+            raise ReplayError(f"{event_names[kind]} event outside of a game")
+        else:
+            events.append((kind, player, payload))
+    if deal_payload is not None:
+        yield deal_payload, events
+
+
+def replay_log(path, on_event=None):
+    """
+    Replays every game of a log file through the engine and checks each of its events.
+
+    Parameters
+    ----------
+    path : str
+        Path of the log file.
+    on_event : callable, optional
+        Called with the game state, kind, player and payload of each event, used to step
+        through a replay. The state is the one after the event's turn.
+
+    Returns
+    -------
+    ReplaySummary
+        The number of games and events replayed, the elapsed seconds and the final state of each game.
+
+    Raises
+    ------
+    ReplayError
+        If an event couldn't have happened, or a game ends in a state other than the logged one.
+    """
+    start = time.perf_counter()
+    final_states = []
+    events = 0
+
+    for deal_payload, game_events in logged_games(path):
+        replay = GameReplay(deal_payload, game_events)
+        if on_event is not None:
+            on_event(replay.game_state, deal_event, 0, deal_payload)
+        final_states.append(replay.play(on_event))
+        events += 1 + len(game_events)
+
+    elapsed = time.perf_counter() - start
+    return ReplaySummary(len(final_states), events, elapsed, final_states)
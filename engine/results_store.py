@@ -0,0 +1,302 @@
+import ast
+import csv
+import json
+import sqlite3
+import time
+from .cards import card_lookup
+from .leaderboard import leaderboard_schema, load_leaderboard, update_leaderboard
+
+
+########################################
+# Schema
+########################################
+
+results_path = "data/report/uno_results.db"
+
+# Bumped whenever the schema changes, stored in the database's user_version
+schema_version = 1
+
+schema = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id INTEGER PRIMARY KEY,
+    winner_name TEXT NOT NULL,
+    winner_seat INTEGER,
+    players_no INTEGER,
+    first_hand_count INTEGER,
+    turns INTEGER,
+    cards_played INTEGER NOT NULL,
+    final_face TEXT NOT NULL,
+    final_color TEXT NOT NULL,
+    seed INTEGER,
+    duration REAL,
+    source TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    player_names TEXT
+);
+CREATE INDEX IF NOT EXISTS games_by_winner ON games (winner_name);
+CREATE INDEX IF NOT EXISTS games_by_table ON games (players_no, first_hand_count);
+CREATE INDEX IF NOT EXISTS games_by_seed ON games (seed);
+CREATE INDEX IF NOT EXISTS games_by_source ON games (source);
+"""
+
+insert_game = """
+INSERT INTO games (
+    winner_name, winner_seat, players_no, first_hand_count, turns, cards_played,
+    final_face, final_color, seed, duration, source, recorded_at, player_names
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+########################################
+# Results Store
+########################################
+
+
+class ResultsStore:
+    """
+    SQLite store of finished games.
+
+    The database runs in WAL mode, so several processes can record games while others read them.
+    Rows are buffered and inserted batch_size at a time with one executemany() per transaction,
+    which keeps the per-game cost of a simulation run to building a tuple. The same transaction
+    folds the new games into the leaderboard summary.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the database file, created along with its schema if needed.
+    batch_size : int, optional
+        Number of buffered games that triggers an insert.
+    """
+
+    def __init__(self, path=results_path, batch_size=5000):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > schema_version:
+            raise ValueError(
+                f"{path} has schema version {version}, newer than {schema_version}"
+            )
+        with self.connection:
+            self.connection.executescript(schema)
+            self.connection.executescript(leaderboard_schema)
+            update_leaderboard(self.connection)
+            self.connection.execute(f"PRAGMA user_version={schema_version}")
+
+    def add(
+        self,
+        winner_name,
+        cards_played,
+        final_card,
+        winner_seat=None,
+        players_no=None,
+        first_hand_count=None,
+        turns=None,
+        seed=None,
+        duration=None,
+        source="game",
+        player_names=None,
+    ):
+        """
+        Buffers one finished game, inserting the buffer once it holds batch_size games.
+
+        Parameters
+        ----------
+        winner_name : str
+            Name of the winning player.
+        cards_played : int
+            Number of cards played on the table deck, including the starting card.
+        final_card : Card
+            Live card at the end of the game.
+        winner_seat : int, optional
+            Player id of the winner.
+        players_no : int, optional
+            Total number of players.
+        first_hand_count : int, optional
+            Number of cards distributed to each player in the first hand.
+        turns : int, optional
+            Number of turns played.
+        seed : int, optional
+            Seed of the game's random number generator.
+        duration : float, optional
+            Seconds the game took.
+        source : str, optional
+            Where the game comes from: "game", "simulation" or "csv".
+        player_names : list, optional
+            Name of every player of the game, counted in each player's games on the
+            leaderboard. Only the winner's game is counted without them.
+        """
+        self.pending.append(
+            (
+                winner_name,
+                winner_seat,
+                players_no,
+                first_hand_count,
+                turns,
+                cards_played,
+                final_card.face,
+                final_card.color,
+                seed,
+                duration,
+                source,
+                time.time(),
+                None if player_names is None else json.dumps(player_names),
+            )
+        )
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def add_game(self, game_state):
+        """
+        Buffers the game a player has just won.
+
+        Parameters
+        ----------
+        game_state : GameState
+            State of the finished game, with the winner to move.
+        """
+        duration = None
+        if game_state.started_at is not None:
+            duration = time.perf_counter() - game_state.started_at
+        self.add(
+            game_state.player_name(game_state.move_counter),
+            game_state.cards_played,
+            game_state.livecard,
+            winner_seat=game_state.move_counter,
+            players_no=game_state.players_no,
+            first_hand_count=game_state.first_hand_count,
+            turns=game_state.turns,
+            seed=game_state.seed,
+            duration=duration,
+            player_names=[player["player_name"] for player in game_state.players_names],
+        )
+
+    def add_result(self, result, players_no, first_hand_count):
+        """
+        Buffers the result of a headless game.
+
+        Parameters
+        ----------
+        result : GameResult
+            Result of the game.
+        players_no : int
+            Total number of players.
+        first_hand_count : int
+            Number of cards distributed to each player in the first hand.
+        """
+        self.add(
+            result.winner_name,
+            result.cards_played,
+            result.final_card,
+            winner_seat=result.winner,
+            players_no=players_no,
+            first_hand_count=first_hand_count,
+            turns=result.turns,
+            seed=result.seed,
+            duration=result.duration,
+            source="simulation",
+            # Headless games name their seats like headless_inputs() does
+            player_names=[f"Seat{seat}-AI" for seat in range(1, players_no + 1)],
+        )
+
+    def flush(self):
+        """
+        Inserts the buffered games and updates the leaderboard in a single transaction.
+        """
+        if self.pending:
+            with self.connection:
+                self.connection.executemany(insert_game, self.pending)
+                update_leaderboard(self.connection)
+            self.pending.clear()
+
+    def leaderboard(self, limit=10):
+        """
+        Returns the leaderboard summary of every recorded game, see load_leaderboard().
+        """
+        self.flush()
+        return load_leaderboard(self.connection, limit)
+
+    def wins_by_name(self, limit=None):
+        """
+        Counts the wins of each winner name, most wins first.
+
+        Parameters
+        ----------
+        limit : int, optional
+            Number of names to return, all of them by default.
+
+        Returns
+        -------
+        list
+            (winner_name, wins) tuples.
+        """
+        self.flush()
+        return self.connection.execute(
+            "SELECT winner_name, COUNT(*) AS wins FROM games"
+            " GROUP BY winner_name ORDER BY wins DESC LIMIT ?",
+            (-1 if limit is None else limit,),
+        ).fetchall()
+
+    def close(self):
+        """
+        Inserts the buffered games and closes the database.
+        """
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+########################################
+# CSV Import
+########################################
+
+
+def import_csv(store, csv_path):
+    """
+    Copies the games of the old winners CSV report into the store, once.
+
+    Each row holds the winner's name, the final card as a {"face": ..., "color": ...}
+    dict literal and the number of cards played. Nothing is imported if the store
+    already holds games from a CSV report.
+
+    Parameters
+    ----------
+    store : ResultsStore
+        The store receiving the games.
+    csv_path : str
+        Path of the CSV report, saved as UTF-8 with or without a BOM.
+
+    Returns
+    -------
+    int
+        Number of games imported.
+    """
+    already_imported = store.connection.execute(
+        "SELECT 1 FROM games WHERE source = 'csv' LIMIT 1"
+    ).fetchone()
+    if already_imported:
+        return 0
+
+    imported = 0
+    with open(csv_path, newline="", encoding="utf-8-sig") as csvfile:
+        for row in csv.DictReader(csvfile):
+            final_card = ast.literal_eval(row["FinalCard"])
+            store.add(
+                row["Name"],
+                int(row["CardsPlayed"]),
+                card_lookup(final_card["face"], final_card["color"]),
+                source="csv",
+            )
+            imported += 1
+    store.flush()
+    return imported
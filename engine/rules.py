@@ -0,0 +1,292 @@
+from .cards import all_cards, possible_faces, wild_recolors
+from .event_log import (
+    draw_event,
+    recolor_event,
+    reverse_event,
+    skip_event,
+    swap_event,
+    swap_payload,
+)
+from .movements import (
+    ai_wild_color,
+    is_real_player,
+    narrate,
+    pull_from_folded_deck,
+    seat_after,
+)
+from .printing_functions import emit, flush_frame, print_card
+
+
+########################################
+# Shared Effect Steps
+########################################
+
+
+def forced_draw(game_state, count):
+    """
+    Makes the player to move draw cards from the folded deck, showing them to a real player.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, including the move counter and the folded deck.
+    count : int
+        Number of cards to draw, fewer are drawn if the piles run out.
+    """
+    move_counter = game_state.move_counter
+    hand = game_state.all_players_deck[move_counter - 1]
+    event_log = game_state.event_log
+    real_player_move = is_real_player(game_state, move_counter)
+    if real_player_move:
+        emit("Added Cards:-")
+    for _ in range(count):
+        addcard = pull_from_folded_deck(game_state)
+        if addcard is None:
+            break
+        hand.append(addcard)
+        if event_log is not None:
+            event_log.record_card(draw_event, move_counter, addcard)
+        if game_state.tracker is not None:
+            game_state.tracker.record_draw(move_counter)
+        if real_player_move:
+            print_card(addcard)
+
+
+def declare_color(game_state):
+    """
+    Asks the player of a wild card for the color to play, and makes it the live card.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, with the turn already passed on from the player of the wild card.
+    """
+    valid_colors = ["red", "blue", "green", "yellow"]
+    prev_move_counter = seat_after(
+        game_state.move_counter, -game_state.move_direction, game_state.players_no
+    )
+    if is_real_player(game_state, prev_move_counter):
+        # Previous move player is Real Player
+        import pyinputplus as pyip
+
+        emit("What color do you want played?\n")
+        flush_frame()
+        color_change = pyip.inputChoice(valid_colors)
+    else:
+        #  Previous move player is AI opponent
+        color_change = ai_wild_color(game_state, valid_colors)
+
+    livecard = wild_recolors[color_change]
+    game_state.livecard = livecard
+    if game_state.event_log is not None:
+        game_state.event_log.record_card(recolor_event, prev_move_counter, livecard)
+
+
+def skip_next(game_state):
+    """
+    Skips the player to move, logging the skip.
+    """
+    if game_state.event_log is not None:
+        game_state.event_log.record(skip_event, game_state.move_counter)
+    game_state.move_counter = seat_after(
+        game_state.move_counter, game_state.move_direction, game_state.players_no
+    )
+
+
+def swap_hands(game_state, player_id, other_player_id):
+    """
+    Swaps the hands of two players, logging and tracking the swap.
+    """
+    all_players_deck = game_state.all_players_deck
+    all_players_deck[player_id - 1], all_players_deck[other_player_id - 1] = (
+        all_players_deck[other_player_id - 1],
+        all_players_deck[player_id - 1],
+    )
+    if game_state.event_log is not None:
+        game_state.event_log.record(swap_event, player_id, swap_payload.pack(other_player_id))
+    if game_state.tracker is not None:
+        game_state.tracker.record_swap(player_id, other_player_id)
+
+
+########################################
+# Standard Effects
+########################################
+
+# Every effect takes the game state right after the turn passed on from the card's player,
+# updates it in place and returns it
+
+
+def draw_two_effect(game_state):
+    narrate(game_state, "2 cards were added")
+    forced_draw(game_state, 2)
+    return game_state
+
+
+def reverse_effect(game_state):
+    if game_state.event_log is not None:
+        game_state.event_log.record(reverse_event, game_state.move_counter)
+    game_state.move_direction = game_state.move_direction * -1
+    game_state.move_counter = seat_after(
+        game_state.move_counter, 2 * game_state.move_direction, game_state.players_no
+    )
+    narrate(game_state, "Move Direction Reversed")
+    return game_state
+
+
+def skip_effect(game_state):
+    skip_next(game_state)
+    narrate(game_state, "Next Player's Move Skipped")
+    return game_state
+
+
+def draw_four_effect(game_state):
+    narrate(game_state, "+4 Card")
+    declare_color(game_state)
+    forced_draw(game_state, 4)
+    return game_state
+
+
+def wild_effect(game_state):
+    narrate(game_state, "Wild Card")
+    declare_color(game_state)
+    return game_state
+
+
+########################################
+# House Rule Effects
+########################################
+
+
+def draw_two_and_skip_effect(game_state):
+    draw_two_effect(game_state)
+    skip_next(game_state)
+    narrate(game_state, "and their move is skipped")
+    return game_state
+
+
+def draw_four_and_skip_effect(game_state):
+    draw_four_effect(game_state)
+    skip_next(game_state)
+    narrate(game_state, "and their move is skipped")
+    return game_state
+
+
+def seven_swap_effect(game_state):
+    """
+    7 card: its player swaps hands with the opponent holding the fewest cards.
+    """
+    players_no = game_state.players_no
+    player_id = seat_after(game_state.move_counter, -game_state.move_direction, players_no)
+    opponents = [seat for seat in range(1, players_no + 1) if seat != player_id]
+    other_player_id = min(
+        opponents, key=lambda seat: len(game_state.all_players_deck[seat - 1])
+    )
+    swap_hands(game_state, player_id, other_player_id)
+    narrate(game_state, f"Hands swapped with {game_state.player_name(other_player_id)}")
+    return game_state
+
+
+def zero_rotate_effect(game_state):
+    """
+    0 card: every hand is passed on to the next player in the direction of play.
+    """
+    players_no = game_state.players_no
+    direction = game_state.move_direction
+    # Swapping the first seat's hand with each following seat in turn rotates them all by one
+    seats = [seat_after(1, step * direction, players_no) for step in range(players_no)]
+    for seat in seats[1:]:
+        swap_hands(game_state, seats[0], seat)
+    narrate(game_state, "Every hand was passed on")
+    return game_state
+
+
+########################################
+# Rule Sets
+########################################
+
+# Effect of each card face under a rule set, faces without an effect are left out
+rule_sets = {
+    "standard": {
+        possible_faces[10]: draw_two_effect,
+        possible_faces[11]: reverse_effect,
+        possible_faces[12]: skip_effect,
+        possible_faces[13]: draw_four_effect,
+        possible_faces[14]: wild_effect,
+    },
+}
+
+# Dispatch tables already compiled, keyed by rule set name
+_compiled_effects = {}
+
+
+def register_rule_set(name, effects, base="standard"):
+    """
+    Registers a house rule variant, as changes to the effects of an existing rule set.
+
+    Parameters
+    ----------
+    name : str
+        Name the rule set is selected by.
+    effects : dict
+        Effect function for each changed card face, None removes the face's effect.
+        An effect takes the game state right after the turn passed on from the card's
+        player, updates it in place and returns it.
+    base : str, optional
+        Rule set the variant starts from.
+    """
+    combined = dict(rule_sets[base])
+    for face, effect in effects.items():
+        if effect is None:
+            combined.pop(face, None)
+        else:
+            combined[face] = effect
+    rule_sets[name] = combined
+    _compiled_effects.clear()
+
+
+def compile_effects(rule_set):
+    """
+    Builds the dispatch table of a rule set.
+
+    Parameters
+    ----------
+    rule_set : str
+        Name of a registered rule set.
+
+    Returns
+    -------
+    tuple
+        The effect function of every card, indexed by card_id, None for cards without an effect.
+
+    Raises
+    ------
+    ValueError
+        If no rule set has that name.
+    """
+    effects = _compiled_effects.get(rule_set)
+    if effects is None:
+        if rule_set not in rule_sets:
+            raise ValueError(
+                f"Unknown rule set {rule_set!r}, choose from {', '.join(rule_sets)}"
+            )
+        face_effects = rule_sets[rule_set]
+        effects = tuple(face_effects.get(card.face) for card in all_cards)
+        _compiled_effects[rule_set] = effects
+    return effects
+
+
+# House rule variants shipped with the game
+register_rule_set(
+    "draw_skips",
+    {
+        possible_faces[10]: draw_two_and_skip_effect,
+        possible_faces[13]: draw_four_and_skip_effect,
+    },
+)
+register_rule_set(
+    "seven_o",
+    {
+        possible_faces[0]: zero_rotate_effect,
+        possible_faces[7]: seven_swap_effect,
+    },
+)
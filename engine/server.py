@@ -0,0 +1,417 @@
+import asyncio
+import json
+import logging
+import random
+from .game_management import distribute_deck, full_uno_deck
+from .game_state import GameState
+from .movements import (
+    ai_move,
+    pass_turn,
+    play_move_management,
+    pre_move_management,
+)
+
+# Colors a human can declare for a wild card
+declarable_colors = ("red", "blue", "green", "yellow")
+
+# Longest accepted line from a client, in bytes
+max_line_length = 4096
+
+# Number of AI turns a table plays in a row before letting the other tables run
+ai_turns_per_slice = 64
+
+# Largest table a client can ask for, and largest first hand dealt at it
+max_players = 10
+max_hand = 20
+
+logger = logging.getLogger(__name__)
+
+
+########################################
+# Protocol Helpers
+########################################
+
+
+def card_json(card):
+    return [card.face, card.color]
+
+
+async def send(writer, message):
+    """
+    Writes one message to a client, waiting if its connection is backed up.
+    """
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+########################################
+# Tables
+########################################
+
+
+class Table:
+    """
+    One game hosted by the server.
+
+    The game runs headless through the regular engine, as an asyncio task. AI seats are
+    decided in-process, human seats are awaited on a future resolved by their connection,
+    so an idle table is a suspended task and a few small objects.
+
+    Parameters
+    ----------
+    name : str
+        Name clients use to join the table.
+    players_no : int
+        Total number of players.
+    humans : int
+        Number of seats taken by connecting players, the first ones.
+    first_hand_count : int
+        Number of cards distributed to each player in the first hand.
+    """
+
+    __slots__ = (
+        "name",
+        "players_no",
+        "humans",
+        "first_hand_count",
+        "writers",
+        "names",
+        "pending_move",
+        "offered_moves",
+        "game_state",
+        "task",
+    )
+
+    def __init__(self, name, players_no, humans, first_hand_count):
+        if not 2 <= players_no <= max_players:
+            raise ValueError(f"players must be between 2 and {max_players}")
+        if not 1 <= humans <= players_no:
+            raise ValueError(f"humans must be between 1 and {players_no}")
+        if not 1 <= first_hand_count <= max_hand:
+            raise ValueError(f"hand must be between 1 and {max_hand}")
+        self.name = name
+        self.players_no = players_no
+        self.humans = humans
+        self.first_hand_count = first_hand_count
+        self.writers = {}
+        self.names = {}
+        self.pending_move = None
+        self.offered_moves = None
+        self.game_state = None
+        self.task = None
+
+    def seat_player(self, player_name, writer):
+        """
+        Gives the next free human seat to a connecting player.
+
+        Returns
+        -------
+        int
+            The player id of the seat.
+        """
+        if self.task is not None or len(self.names) >= self.humans:
+            raise ValueError(f"Table {self.name} is full")
+        seat = min(set(range(1, self.humans + 1)) - set(self.names))
+        self.names[seat] = player_name
+        self.writers[seat] = writer
+        return seat
+
+    def is_full(self):
+        return len(self.names) == self.humans
+
+    def new_game(self):
+        """
+        Deals a headless game, with the connected players' names on the human seats.
+        """
+        players_names = [
+            {
+                "player_id": seat,
+                "player_name": self.names.get(seat, f"Seat{seat}-AI"),
+            }
+            for seat in range(1, self.players_no + 1)
+        ]
+        game_state = GameState(
+            self.players_no,
+            self.first_hand_count,
+            players_names,
+            rng=random.Random(),
+            headless=True,
+        )
+        game_state = full_uno_deck(game_state)
+        return distribute_deck(game_state)
+
+    async def broadcast(self, message):
+        for writer in list(self.writers.values()):
+            try:
+                await send(writer, message)
+            except ConnectionError:
+                pass
+
+    def leave(self, seat):
+        """
+        Hands a disconnected player's seat over to an AI opponent.
+        """
+        self.writers.pop(seat, None)
+        if self.pending_move is not None and not self.pending_move.done():
+            if self.game_state.move_counter == seat:
+                self.pending_move.set_result(None)
+
+    def finished(self, task):
+        """
+        Done callback of the table's game task, reports a game that crashed to its players.
+
+        The error is logged, every connected player is sent an error message and their
+        connection is closed, which ends their handler and frees the table.
+        """
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error(
+            "The game at table %s crashed", self.name, exc_info=task.exception()
+        )
+        message = {"type": "error", "message": "The game crashed and was stopped"}
+        for writer in list(self.writers.values()):
+            writer.write(json.dumps(message).encode() + b"\n")
+            writer.close()
+        self.writers.clear()
+
+    def submit_move(self, seat, message):
+        """
+        Resolves the move a human seat was asked for.
+
+        Raises
+        ------
+        ValueError
+            If it isn't the seat's turn or the move isn't one of the offered moves.
+        """
+        if self.pending_move is None or self.pending_move.done():
+            raise ValueError("It isn't your turn")
+        if self.game_state.move_counter != seat:
+            raise ValueError("It isn't your turn")
+        card_no = message.get("card")
+        if not isinstance(card_no, int) or not 1 <= card_no <= len(self.offered_moves):
+            raise ValueError(f"card must be between 1 and {len(self.offered_moves)}")
+        color = None
+        if self.offered_moves[card_no - 1].is_wild:
+            color = message.get("color")
+            if color not in declarable_colors:
+                raise ValueError(f"color must be one of {', '.join(declarable_colors)}")
+        self.pending_move.set_result((card_no, color))
+
+    async def human_move(self, seat, available_moves):
+        """
+        Asks a connected player for their move and waits for it.
+
+        Returns
+        -------
+        tuple or None
+            The position of the card in available_moves and the declared color,
+            None if the player left.
+        """
+        game_state = self.game_state
+        self.offered_moves = available_moves
+        self.pending_move = asyncio.get_running_loop().create_future()
+        try:
+            await send(
+                self.writers[seat],
+                {
+                    "type": "your_move",
+                    "livecard": card_json(game_state.livecard),
+                    "hand": [card_json(card) for card in game_state.all_players_deck[seat - 1]],
+                    "moves": [card_json(card) for card in available_moves],
+                },
+            )
+        except ConnectionError:
+            self.leave(seat)
+        try:
+            return await self.pending_move
+        finally:
+            self.pending_move = None
+            self.offered_moves = None
+
+    async def play(self):
+        """
+        Plays the table's game to its end, one turn at a time.
+        """
+        game_state = self.game_state = self.new_game()
+        await self.broadcast(
+            {
+                "type": "start",
+                "names": [game_state.player_name(seat) for seat in range(1, self.players_no + 1)],
+            }
+        )
+
+        ai_turns = 0
+        while game_state.winner is None:
+            seat = game_state.move_counter
+            game_state.turns += 1
+            game_state, available_moves = pre_move_management(game_state)
+            played = None
+
+            if len(available_moves) == 0:
+                game_state = pass_turn(game_state)
+            else:
+                move = None
+                if seat in self.writers:
+                    move = await self.human_move(seat, available_moves)
+                    ai_turns = 0
+                if move is None:
+                    card_no = ai_move(game_state, available_moves)
+                else:
+                    card_no, game_state.declared_color = move
+                played = available_moves[card_no - 1]
+                game_state = play_move_management(card_no, game_state, available_moves)
+
+            if self.writers:
+                await self.broadcast(
+                    {
+                        "type": "turn",
+                        "seat": seat,
+                        "played": card_json(played) if played is not None else None,
+                        "livecard": card_json(game_state.livecard),
+                        "hand_sizes": [len(hand) for hand in game_state.all_players_deck],
+                        "next": game_state.move_counter,
+                    }
+                )
+            ai_turns += 1
+            if ai_turns >= ai_turns_per_slice:
+                # Long runs of AI turns share the event loop with the other tables
+                ai_turns = 0
+                await asyncio.sleep(0)
+
+        await self.broadcast(
+            {
+                "type": "game_over",
+                "winner": game_state.winner,
+                "name": game_state.player_name(game_state.winner),
+            }
+        )
+
+
+########################################
+# Server
+########################################
+
+
+class GameServer:
+    """
+    Hosts any number of tables, each client connection taking a human seat at one of them.
+
+    Everything runs on one asyncio event loop: no thread per connection or per table.
+    Clients and the server exchange JSON objects, one per line:
+
+    - join (client): {"type": "join", "table": "t1", "name": "Ann", "players": 4, "humans": 2, "hand": 7},
+      players, humans and hand are only read when the join creates the table, with 2 to 10
+      players and a first hand of 1 to 20 cards.
+    - joined (server): {"type": "joined", "table": "t1", "seat": 1, "players": 4}
+    - start (server): {"type": "start", "names": [...]}, once every human seat is taken.
+    - your_move (server): {"type": "your_move", "livecard": [face, color], "hand": [...], "moves": [...]}
+    - move (client): {"type": "move", "card": 2, "color": "red"}, the position of the card in
+      the offered moves starting from 1, and the declared color for a wild card.
+    - turn (server): {"type": "turn", "seat": 3, "played": [face, color] or null,
+      "livecard": [face, color], "hand_sizes": [...], "next": 4}
+    - game_over (server): {"type": "game_over", "winner": 2, "name": "Bob"}
+    - error (server): {"type": "error", "message": "..."}, the connection is closed after it
+      when the table's game crashed.
+    """
+
+    def __init__(self):
+        self.tables = {}
+
+    def join(self, message, writer):
+        """
+        Seats a client at the table named in a join message, creating the table if needed.
+
+        Returns
+        -------
+        tuple
+            The table and the player id of the seat.
+        """
+        table_name = str(message.get("table", ""))
+        player_name = str(message.get("name", "Player"))
+        table = self.tables.get(table_name)
+        if table is None:
+            table = Table(
+                table_name,
+                int(message.get("players", 4)),
+                int(message.get("humans", 1)),
+                int(message.get("hand", 7)),
+            )
+            self.tables[table_name] = table
+        seat = table.seat_player(player_name, writer)
+        return table, seat
+
+    async def run_table(self, table):
+        try:
+            await table.play()
+        finally:
+            self.tables.pop(table.name, None)
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves one client connection until it closes.
+        """
+        table = None
+        seat = None
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await send(writer, {"type": "error", "message": "Line too long"})
+                    break
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("Messages must be JSON objects")
+                    kind = message.get("type")
+                    if kind == "join":
+                        if table is not None:
+                            raise ValueError("Already seated at a table")
+                        table, seat = self.join(message, writer)
+                        await send(
+                            writer,
+                            {
+                                "type": "joined",
+                                "table": table.name,
+                                "seat": seat,
+                                "players": table.players_no,
+                            },
+                        )
+                        if table.is_full():
+                            table.task = asyncio.create_task(self.run_table(table))
+                            table.task.add_done_callback(table.finished)
+                    elif kind == "move":
+                        if table is None:
+                            raise ValueError("Join a table first")
+                        table.submit_move(seat, message)
+                    else:
+                        raise ValueError(f"Unknown message type {kind!r}")
+                except (ValueError, TypeError) as error:
+                    await send(writer, {"type": "error", "message": str(error)})
+        except (ConnectionError, asyncio.CancelledError):
+            # A dropped connection, or the server shutting down, just ends the handler
+            pass
+        finally:
+            if table is not None:
+                table.leave(seat)
+                if table.task is not None and not table.writers:
+                    # Everyone left, the game isn't played out for nobody
+                    table.task.cancel()
+                if table.task is None and self.tables.get(table.name) is table:
+                    # Nobody plays at a table that never started
+                    table.names.pop(seat, None)
+                    if not table.names:
+                        del self.tables[table.name]
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=7777):
+        """
+        Accepts connections until cancelled.
+        """
+        server = await asyncio.start_server(
+            self.handle_client, host, port, limit=max_line_length
+        )
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,137 @@
+import os
+from collections import Counter
+from .game_management import play_again, reset_game
+from .movements import main_move_manager
+from .printing_functions import begin_print
+
+
+########################################
+# Game Sessions
+########################################
+
+
+class Session:
+    """
+    Plays games back to back with the same players, owning the game loop.
+
+    Each game is played turn by turn in a flat loop, and a finished game is reset in place
+    for the next one, so a session of any length keeps a constant call stack and memory.
+
+    Parameters
+    ----------
+    game_state : GameState
+        A dealt game, from set_game() or new_headless_game().
+    games : int, optional
+        Number of games to play, none at all for 0. By default interactive sessions ask
+        after every game whether to play again, and headless sessions play a single game.
+    on_game_over : callable, optional
+        Called with the game state of every finished game, before it is reset.
+    save_path : str, optional
+        Snapshot file of the game in progress (see engine.snapshot). Interactive sessions
+        write it when the player interrupts the game with Ctrl-C, and it is removed once the
+        game is over. By default nothing is saved.
+    autosave_every : int, optional
+        Also write the snapshot every this many turns, so a crash loses at most that many.
+
+    Attributes
+    ----------
+    games_played : int
+        Number of finished games.
+    wins : Counter
+        Number of games won by each player id.
+    """
+
+    def __init__(
+        self, game_state, games=None, on_game_over=None, save_path=None, autosave_every=None
+    ):
+        self.game_state = game_state
+        self.games = games
+        self.on_game_over = on_game_over
+        self.save_path = save_path
+        self.autosave_every = autosave_every
+        self.games_played = 0
+        self.wins = Counter()
+
+    def play_game(self):
+        """
+        Plays the current game to its end.
+
+        Returns
+        -------
+        int
+            Player id of the winner.
+        """
+        game_state = self.game_state
+        if self.save_path is None:
+            while game_state.winner is None:
+                game_state = main_move_manager(game_state)
+        else:
+            game_state = self.play_saved_game(game_state)
+        self.game_state = game_state
+        self.games_played += 1
+        self.wins[game_state.winner] += 1
+        if self.on_game_over is not None:
+            self.on_game_over(game_state)
+        return game_state.winner
+
+    def play_saved_game(self, game_state):
+        """
+        Plays the current game to its end, saving it to save_path along the way.
+
+        Interactive games are serialized at the start of every turn, which takes a few tens of
+        microseconds, so that an interrupted turn is saved as it was before it started rather
+        than halfway through. Headless games are only serialized when they are autosaved.
+        """
+        # Imported here, sessions that don't save never load the snapshot module and json
+        from .snapshot import dump_game, save_snapshot
+
+        save_path = self.save_path
+        autosave_every = self.autosave_every
+        snapshot = None
+        try:
+            while game_state.winner is None:
+                autosave = autosave_every and game_state.turns % autosave_every == 0
+                if autosave or not game_state.headless:
+                    snapshot = dump_game(game_state)
+                if autosave:
+                    save_snapshot(snapshot, save_path)
+                game_state = main_move_manager(game_state)
+        except KeyboardInterrupt:
+            if game_state.headless or snapshot is None:
+                raise
+            save_snapshot(snapshot, save_path)
+            print(f"\nGame saved, resume it with: python run_game.py --resume {save_path}")
+            raise SystemExit(0) from None
+        # A finished game can't be resumed
+        if os.path.exists(save_path):
+            os.remove(save_path)
+        return game_state
+
+    def wants_another_game(self):
+        """
+        Checks whether the session goes on after a finished game.
+        """
+        if self.games is not None:
+            return self.games_played < self.games
+        if self.game_state.headless:
+            return False
+        return play_again()
+
+    def run(self):
+        """
+        Plays games until the requested number is reached or the player stops.
+
+        Returns
+        -------
+        Counter
+            Number of games won by each player id.
+        """
+        if self.games is not None and self.games < 1:
+            return self.wins
+        self.play_game()
+        while self.wants_another_game():
+            reset_game(self.game_state)
+            if not self.game_state.headless:
+                begin_print()
+            self.play_game()
+        return self.wins
@@ -0,0 +1,240 @@
+import random
+import time
+from collections import namedtuple
+from .game_management import full_uno_deck, distribute_deck
+from .game_state import GameState
+from .movements import main_move_manager
+
+
+########################################
+# Results
+########################################
+
+# Compact outcome of one headless game, winner is the player id of the winning seat
+# and duration the seconds it took to deal and play. cards_drawn counts the cards drawn
+# after the deal, reshuffles the times the draw pile ran out, and starting_card is the
+# live card the game was dealt with. They are None when the engine playing the game
+# doesn't report them.
+GameResult = namedtuple(
+    "GameResult",
+    [
+        "seed",
+        "winner",
+        "winner_name",
+        "turns",
+        "cards_played",
+        "final_card",
+        "duration",
+        "cards_drawn",
+        "reshuffles",
+        "starting_card",
+    ],
+    defaults=(None, None, None),
+)
+
+# Outcome of a batch of headless games along with its measured throughput
+SimulationSummary = namedtuple(
+    "SimulationSummary", ["results", "elapsed", "games_per_second"]
+)
+
+
+########################################
+# Headless Games
+########################################
+
+
+def headless_inputs(players_no, first_hand_count, seed=None, rule_set="standard"):
+    """
+    Builds the game variables of an all-AI game without prompting anyone.
+
+    Parameters
+    ----------
+    players_no : int
+        Total number of players, every one of them is an AI seat.
+    first_hand_count : int
+        Number of cards distributed to each player in the first hand.
+    seed : int, optional
+        Seed for the game's random number generator, None seeds from the OS.
+    rule_set : str, optional
+        Name of the rule set the game is played with, see engine.rules.
+
+    Returns
+    -------
+    GameState
+        A new all-AI game with no cards dealt yet, like the one initializing_inputs() returns.
+    """
+    players_names = []
+    for player in range(players_no):
+        players_names.append(
+            {"player_id": player + 1, "player_name": f"Seat{player + 1}-AI"}
+        )
+
+    game_state = GameState(
+        players_no,
+        first_hand_count,
+        players_names,
+        rng=random.Random(seed),
+        headless=True,
+        rule_set=rule_set,
+        seed=seed,
+    )
+    return game_state
+
+
+def new_headless_game(
+    players_no, first_hand_count, seed=None, event_log=None, rule_set="standard"
+):
+    """
+    Sets up a dealt all-AI game ready for main_move_manager, with no terminal I/O.
+
+    Parameters
+    ----------
+    players_no : int
+        Total number of players.
+    first_hand_count : int
+        Number of cards distributed to each player in the first hand.
+    seed : int, optional
+        Seed for the game's random number generator.
+    event_log : EventLog, optional
+        Log the game's events are recorded to, starting with the deal.
+    rule_set : str, optional
+        Name of the rule set the game is played with, see engine.rules.
+
+    Returns
+    -------
+    GameState
+        The dealt game.
+    """
+    game_state = headless_inputs(players_no, first_hand_count, seed, rule_set)
+    game_state.event_log = event_log
+    game_state = full_uno_deck(game_state)
+    game_state = distribute_deck(game_state)
+    return game_state
+
+
+def play_headless_game(game_state):
+    """
+    Plays a headless game to completion through main_move_manager.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of a headless game.
+
+    Returns
+    -------
+    tuple
+        A tuple containing the number of turns taken and the updated game state.
+    """
+    turns = 0
+    while game_state.winner is None:
+        game_state = main_move_manager(game_state)
+        turns += 1
+    return turns, game_state
+
+
+def simulate_game(
+    players_no, first_hand_count, seed=None, event_log=None, rule_set="standard"
+):
+    """
+    Plays one complete all-AI game with no prompts or printing.
+
+    Parameters
+    ----------
+    players_no : int
+        Total number of players.
+    first_hand_count : int
+        Number of cards distributed to each player in the first hand.
+    seed : int, optional
+        Seed for the game's random number generator.
+    event_log : EventLog, optional
+        Log the game's events are recorded to.
+    rule_set : str, optional
+        Name of the rule set the game is played with, see engine.rules.
+
+    Returns
+    -------
+    GameResult
+        The winner, number of turns, cards played, final card and duration of the game,
+        the cards drawn, the reshuffles of the draw pile and the starting card.
+    """
+    start = time.perf_counter()
+    game_state = new_headless_game(
+        players_no, first_hand_count, seed, event_log, rule_set
+    )
+    starting_card = game_state.livecard
+    turns, game_state = play_headless_game(game_state)
+    duration = time.perf_counter() - start
+
+    winner = game_state.winner
+    winner_name = game_state.player_name(winner)
+    # Every card that left a hand was played (all but the starting card), and every card
+    # that entered one was dealt or drawn, hand swaps only move cards between hands
+    cards_drawn = (
+        game_state.cards_played
+        - 1
+        + sum(map(len, game_state.all_players_deck))
+        - players_no * first_hand_count
+    )
+    return GameResult(
+        seed,
+        winner,
+        winner_name,
+        turns,
+        game_state.cards_played,
+        game_state.livecard,
+        duration,
+        cards_drawn,
+        game_state.reshuffles,
+        starting_card,
+    )
+
+
+def simulate_games(
+    games,
+    players_no,
+    first_hand_count,
+    seed=None,
+    event_log=None,
+    rule_set="standard",
+    on_result=None,
+):
+    """
+    Plays a batch of all-AI games back to back and measures the throughput.
+
+    Parameters
+    ----------
+    games : int
+        Number of games to play.
+    players_no : int
+        Total number of players in each game.
+    first_hand_count : int
+        Number of cards distributed to each player in the first hand.
+    seed : int, optional
+        Seed of the first game, game i is played with seed + i. None seeds every game from the OS.
+    event_log : EventLog, optional
+        Log every game's events are recorded to, one after the other.
+    rule_set : str, optional
+        Name of the rule set every game is played with, see engine.rules.
+    on_result : callable, optional
+        Called with every GameResult as soon as its game ends. The results are then not
+        kept, so runs of any length take constant memory.
+
+    Returns
+    -------
+    SimulationSummary
+        The results of every game (none with on_result), the elapsed wall-clock seconds and
+        the games played per second.
+    """
+    results = []
+    keep_result = results.append if on_result is None else on_result
+    start = time.perf_counter()
+    for game_no in range(games):
+        game_seed = None if seed is None else seed + game_no
+        keep_result(
+            simulate_game(players_no, first_hand_count, game_seed, event_log, rule_set)
+        )
+    elapsed = time.perf_counter() - start
+
+    games_per_second = games / elapsed if elapsed > 0 else float("inf")
+    return SimulationSummary(results, elapsed, games_per_second)
@@ -0,0 +1,301 @@
+import json
+import os
+import random
+import struct
+import time
+from .cards import card_from_id
+from .event_log import card_id_of
+from .game_management import full_uno_deck
+from .game_state import GameState
+from .hand import Hand
+from .rules import compile_effects
+from .strategies import Strategy, builtin_strategies
+from .tracker import attach_tracker
+
+# Every snapshot file starts with this, so loading can refuse anything else
+snapshot_magic = b"UNOSAVE\n"
+
+# Version of the snapshot layout, bumped whenever it changes
+snapshot_version = 1
+
+# Snapshot version and length of the JSON metadata that follows it
+snapshot_header = struct.Struct("<HI")
+# Number of card ids of a pile, followed by one byte per card
+pile_header = struct.Struct("<I")
+# State words of the Mersenne Twister, the last one being its position
+rng_words = struct.Struct("<625I")
+
+
+class SnapshotError(ValueError):
+    """
+    Raised when a file isn't a snapshot this version of the game can load.
+    """
+
+
+########################################
+# AI Seats
+########################################
+
+
+def strategy_settings(strategy):
+    """
+    Describes an AI seat's strategy as JSON, None for strategies that can't be saved.
+    """
+    if isinstance(strategy, Strategy) and strategy.name in builtin_strategies:
+        return {"kind": strategy.name}
+    # Imported here, the search is only needed by games with ISMCTS opponents
+    from .ismcts import ISMCTS
+
+    if isinstance(strategy, ISMCTS):
+        return {
+            "kind": "ismcts",
+            "time_budget": strategy.time_budget,
+            "rollouts": strategy.rollouts,
+            "exploration": strategy.exploration,
+            "max_rollout_turns": strategy.max_rollout_turns,
+        }
+    return None
+
+
+def strategy_from_settings(settings):
+    """
+    Rebuilds a strategy described by strategy_settings().
+    """
+    settings = dict(settings)
+    kind = settings.pop("kind")
+    if kind == "ismcts":
+        from .ismcts import ISMCTS
+
+        return ISMCTS(**settings)
+    if kind in builtin_strategies:
+        return builtin_strategies[kind]()
+    raise SnapshotError(f"Unknown AI strategy {kind!r}")
+
+
+########################################
+# Card Tracker
+########################################
+
+
+def tracker_settings(tracker):
+    """
+    Describes what a game's card tracker knows as JSON, None for games that aren't tracked.
+
+    The unseen cards and hand sizes follow from the piles, so only the cards each seat was
+    seen playing and the colors it is known to be out of are kept.
+    """
+    if tracker is None:
+        return None
+    return {
+        "played": [
+            {str(card_id): count for card_id, count in enumerate(played) if count}
+            for played in tracker.played
+        ],
+        "voids": [sorted(voids) for voids in tracker.voids],
+    }
+
+
+def tracker_from_settings(game_state, settings):
+    """
+    Tracks a loaded game again, with the knowledge described by tracker_settings().
+    """
+    tracker = attach_tracker(game_state)
+    for seat_played, played in zip(tracker.played, settings["played"], strict=True):
+        for card_id, count in played.items():
+            seat_played[int(card_id)] = count
+    tracker.voids = [set(voids) for voids in settings["voids"]]
+    return tracker
+
+
+########################################
+# Snapshots
+########################################
+
+
+def dump_game(game_state):
+    """
+    Serializes a game between two turns into a snapshot.
+
+    The layout is the magic line, a version and metadata length header, the metadata as JSON
+    (players, counters, live card, rule set, seed, AI seats and what the card tracker knows),
+    then the hands, the folded deck and the table deck as one byte per card, in order, and
+    the 625 words of the random number generator, so a resumed game goes on exactly as the
+    saved one would have. The event log isn't saved.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, between two turns.
+
+    Returns
+    -------
+    bytes
+        The snapshot.
+    """
+    rng_version, rng_state, gauss_next = game_state.rng.getstate()
+    metadata = {
+        "players_no": game_state.players_no,
+        "first_hand_count": game_state.first_hand_count,
+        "players_names": game_state.players_names,
+        "headless": game_state.headless,
+        "deck_count": game_state.deck_count,
+        "move_counter": game_state.move_counter,
+        "move_direction": game_state.move_direction,
+        "livecard": game_state.livecard.card_id,
+        "cards_played": game_state.cards_played,
+        "reshuffles": game_state.reshuffles,
+        "turns": game_state.turns,
+        "rule_set": game_state.rule_set,
+        "seed": game_state.seed,
+        "ai_strategies": {
+            str(player_id): settings
+            for player_id, strategy in game_state.ai_strategies.items()
+            if (settings := strategy_settings(strategy)) is not None
+        },
+        "tracker": tracker_settings(game_state.tracker),
+        "rng_version": rng_version,
+        "gauss_next": gauss_next,
+    }
+    encoded = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+    parts = [
+        snapshot_magic,
+        snapshot_header.pack(snapshot_version, len(encoded)),
+        encoded,
+    ]
+    for pile in (*game_state.all_players_deck, game_state.folded_deck, game_state.table_deck):
+        parts.append(pile_header.pack(len(pile)))
+        parts.append(bytes(map(card_id_of, pile)))
+    parts.append(rng_words.pack(*rng_state))
+    return b"".join(parts)
+
+
+def load_game_bytes(data):
+    """
+    Rebuilds a game from a snapshot made by dump_game().
+
+    Parameters
+    ----------
+    data : bytes
+        The snapshot.
+
+    Returns
+    -------
+    GameState
+        The game, ready for its next turn. It isn't logged, and is tracked if the saved
+        game was.
+
+    Raises
+    ------
+    SnapshotError
+        If the data isn't a snapshot of a supported version, or its rule set isn't registered
+        in this process.
+    """
+    if not data.startswith(snapshot_magic):
+        raise SnapshotError("Not an UNO snapshot")
+    offset = len(snapshot_magic)
+    try:
+        version, metadata_size = snapshot_header.unpack_from(data, offset)
+        if version != snapshot_version:
+            raise SnapshotError(f"Snapshot version {version} isn't supported")
+        offset += snapshot_header.size
+        metadata = json.loads(data[offset : offset + metadata_size])
+        offset += metadata_size
+
+        piles = []
+        for _ in range(metadata["players_no"] + 2):
+            (pile_size,) = pile_header.unpack_from(data, offset)
+            offset += pile_header.size
+            piles.append([card_from_id(card_id) for card_id in data[offset : offset + pile_size]])
+            offset += pile_size
+        rng_state = rng_words.unpack_from(data, offset)
+
+        rng = random.Random()
+        rng.setstate((metadata["rng_version"], rng_state, metadata["gauss_next"]))
+        game_state = GameState(
+            metadata["players_no"],
+            metadata["first_hand_count"],
+            metadata["players_names"],
+            rng=rng,
+            headless=metadata["headless"],
+            rule_set=metadata["rule_set"],
+            seed=metadata["seed"],
+        )
+        game_state.deck_count = metadata["deck_count"]
+        game_state = full_uno_deck(game_state)
+        game_state.all_players_deck = [Hand(pile) for pile in piles[:-2]]
+        game_state.folded_deck = piles[-2]
+        game_state.table_deck = piles[-1]
+        game_state.livecard = card_from_id(metadata["livecard"])
+        game_state.move_counter = metadata["move_counter"]
+        game_state.move_direction = metadata["move_direction"]
+        game_state.cards_played = metadata["cards_played"]
+        game_state.reshuffles = metadata["reshuffles"]
+        game_state.turns = metadata["turns"]
+        game_state.ai_strategies = {
+            int(player_id): strategy_from_settings(settings)
+            for player_id, settings in metadata["ai_strategies"].items()
+        }
+        if metadata["tracker"] is not None:
+            tracker_from_settings(game_state, metadata["tracker"])
+    except SnapshotError:
+        raise
+    except (struct.error, LookupError, TypeError, ValueError) as error:
+        # Decoding errors of the metadata are ValueErrors too
+        raise SnapshotError(f"Truncated or corrupt snapshot: {error!r}") from None
+
+    try:
+        game_state.effects = compile_effects(game_state.rule_set)
+    except ValueError as error:
+        raise SnapshotError(str(error)) from None
+    game_state.started_at = time.perf_counter()
+    return game_state
+
+
+def save_game(game_state, path):
+    """
+    Writes a snapshot of the game to a file, replacing it atomically.
+
+    The snapshot is written next to the file first and renamed over it, so a crash while
+    saving leaves the previous snapshot intact.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, between two turns.
+    path : str
+        Path of the snapshot file.
+    """
+    save_snapshot(dump_game(game_state), path)
+
+
+def save_snapshot(snapshot, path):
+    """
+    Writes a snapshot made by dump_game() to a file, replacing it atomically.
+    """
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as snapshot_file:
+        snapshot_file.write(snapshot)
+    os.replace(temporary_path, path)
+
+
+def load_game(path):
+    """
+    Loads a game saved by save_game().
+
+    Parameters
+    ----------
+    path : str
+        Path of the snapshot file.
+
+    Returns
+    -------
+    GameState
+        The game, ready for its next turn.
+
+    Raises
+    ------
+    SnapshotError
+        If the file isn't a snapshot of a supported version.
+    """
+    with open(path, "rb") as snapshot_file:
+        return load_game_bytes(snapshot_file.read())
@@ -0,0 +1,263 @@
+import random
+from collections import namedtuple
+from .cards import possible_colors, possible_faces
+
+
+########################################
+# Seat View
+########################################
+
+# What an AI seat knows when it has to move: its own hand and the public table information.
+# Every field but the tracker is immutable, so a strategy can't change the game it is asked about.
+SeatView = namedtuple(
+    "SeatView",
+    [
+        "player_id",
+        "hand",
+        "available_moves",
+        "livecard",
+        "hand_sizes",
+        "move_direction",
+        "folded_count",
+        "cards_played",
+        "rule_set",
+        "tracker",
+    ],
+)
+
+
+def seat_view(game_state, available_moves):
+    """
+    Builds the view of the game the player to move is allowed to see.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of the game, with the AI seat to move.
+    available_moves : list
+        List of available legal moves for the seat.
+
+    Returns
+    -------
+    SeatView
+        The seat's hand and available moves as tuples, the live card, every hand size
+        (indexed by player id - 1), the move direction, the folded deck size, the number
+        of cards played, the rule set and the game's CardTracker (None when the game isn't
+        tracked, its counts must only be read).
+    """
+    player_id = game_state.move_counter
+    return SeatView(
+        player_id,
+        tuple(game_state.all_players_deck[player_id - 1]),
+        tuple(available_moves),
+        game_state.livecard,
+        tuple(len(hand) for hand in game_state.all_players_deck),
+        game_state.move_direction,
+        len(game_state.folded_deck),
+        game_state.cards_played,
+        game_state.rule_set,
+        game_state.tracker,
+    )
+
+
+def majority_color(hand):
+    """
+    Returns the color the hand holds most cards of, red when it only holds wild cards.
+    """
+    counts = dict.fromkeys(possible_colors[:4], 0)
+    for card in hand:
+        if not card.is_wild:
+            counts[card.color] += 1
+    return max(counts, key=counts.get)
+
+
+########################################
+# Strategies
+########################################
+
+
+class Strategy:
+    """
+    Base class of the AI strategies that decide from a SeatView.
+
+    The engine asks the strategy of an AI seat (game_state.ai_strategies) for its move through
+    choose_move(game_state, available_moves), like it asks ISMCTS. This class answers it by
+    building the seat's view and calling choose(view), so a subclass only sees what the seat
+    is allowed to see and only has to implement choose().
+
+    Parameters
+    ----------
+    seed : int, optional
+        Seed of the strategy's random number generator, for the strategies that use one.
+    """
+
+    name = "strategy"
+
+    # Whether the strategy reads view.tracker, the ladder then tracks the games it plays
+    uses_tracker = False
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def choose(self, view):
+        """
+        Picks the card to play and, for wild cards, the color to declare.
+
+        Parameters
+        ----------
+        view : SeatView
+            What the seat to move knows of the game.
+
+        Returns
+        -------
+        tuple
+            A card of view.available_moves and the color to declare, None for cards
+            other than wild cards.
+        """
+        raise NotImplementedError
+
+    def choose_move(self, game_state, available_moves):
+        """
+        Adapts choose() to the engine, returning the position of the card in available_moves
+        (starting from 1) and the color to declare.
+        """
+        card, color = self.choose(seat_view(game_state, available_moves))
+        return available_moves.index(card) + 1, color
+
+
+class RandomStrategy(Strategy):
+    """
+    Plays a random available card and declares a random color, like the easy AI.
+    """
+
+    name = "random"
+
+    def choose(self, view):
+        card = self.rng.choice(view.available_moves)
+        color = self.rng.choice(possible_colors[:4]) if card.is_wild else None
+        return card, color
+
+
+class ActionFirstStrategy(Strategy):
+    """
+    Dumps action cards as soon as it can (+2, skip, reverse, then +4), then numbers from the
+    highest, and keeps the plain wild card for last. Declares the hand's majority color.
+    """
+
+    name = "action_first"
+
+    # Lower plays first
+    priorities = {
+        possible_faces[10]: 0,
+        possible_faces[12]: 1,
+        possible_faces[11]: 2,
+        possible_faces[13]: 3,
+        possible_faces[14]: 15,
+    }
+
+    def choose(self, view):
+        priorities = self.priorities
+        card = min(
+            view.available_moves,
+            key=lambda card: priorities.get(card.face, 13 - possible_faces.index(card.face)),
+        )
+        return card, majority_color(view.hand) if card.is_wild else None
+
+
+class HoldWildsStrategy(Strategy):
+    """
+    Keeps its wild cards until it has nothing else to play, shedding its highest card first
+    otherwise. Declares the hand's majority color.
+    """
+
+    name = "hold_wilds"
+
+    def choose(self, view):
+        card = max(
+            view.available_moves,
+            key=lambda card: (not card.is_wild, possible_faces.index(card.face)),
+        )
+        return card, majority_color(view.hand) if card.is_wild else None
+
+
+class MajorityColorStrategy(Strategy):
+    """
+    Plays a card of the color it holds most of, so its next turn is the likeliest to have a
+    move, and plays wild cards only when forced. Declares the hand's majority color.
+    """
+
+    name = "majority_color"
+
+    def choose(self, view):
+        counts = dict.fromkeys(possible_colors[:4], 0)
+        for card in view.hand:
+            if not card.is_wild:
+                counts[card.color] += 1
+        card = max(
+            view.available_moves,
+            key=lambda card: -1 if card.is_wild else counts[card.color],
+        )
+        return card, max(counts, key=counts.get) if card.is_wild else None
+
+
+class CardCounterStrategy(Strategy):
+    """
+    Counts cards with the game's tracker: plays a color the next seat is known to be out of,
+    otherwise the color the other seats are the least likely to follow (the fewest unseen
+    cards), and plays wild cards only when forced, declaring a color the next seat is out of
+    when it can. Plays like majority_color in games without a tracker.
+    """
+
+    name = "card_counter"
+    uses_tracker = True
+
+    def choose(self, view):
+        tracker = view.tracker
+        counts = dict.fromkeys(possible_colors[:4], 0)
+        for card in view.hand:
+            if not card.is_wild:
+                counts[card.color] += 1
+        if tracker is None:
+            card = max(
+                view.available_moves,
+                key=lambda card: -1 if card.is_wild else counts[card.color],
+            )
+            return card, max(counts, key=counts.get) if card.is_wild else None
+
+        players_no = len(view.hand_sizes)
+        next_player = (view.player_id - 1 + view.move_direction) % players_no + 1
+        # Cards of each color the seat can't see, a count per color of the hand is all it needs
+        unseen = {
+            color: tracker.unseen_color(color) - counts[color] for color in counts
+        }
+        card = max(
+            view.available_moves,
+            key=lambda card: (
+                not card.is_wild,
+                not card.is_wild and tracker.is_void(next_player, card.color),
+                0 if card.is_wild else -unseen[card.color],
+            ),
+        )
+        if not card.is_wild:
+            return card, None
+        color = max(
+            counts,
+            key=lambda color: (
+                counts[color] > 0 and tracker.is_void(next_player, color),
+                counts[color],
+            ),
+        )
+        return card, color
+
+
+# Built-in strategies by name
+builtin_strategies = {
+    strategy.name: strategy
+    for strategy in (
+        RandomStrategy,
+        ActionFirstStrategy,
+        HoldWildsStrategy,
+        MajorityColorStrategy,
+        CardCounterStrategy,
+    )
+}
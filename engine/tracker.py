@@ -0,0 +1,220 @@
+from math import exp, lgamma
+from .cards import all_cards, possible_colors
+
+
+########################################
+# Card Tracker
+########################################
+
+
+class CardTracker:
+    """
+    Public knowledge of a game, kept up to date card by card as the game is played.
+
+    The engine reports every play, draw, reshuffle and hand swap to the tracker of a
+    tracked game (game_state.tracker), so the counts an AI seat asks about are maintained
+    incrementally instead of being recounted from the piles every turn:
+
+    - unseen cards: copies of each card kind, color and face not visible on the table deck,
+    - per seat: the cards it was seen playing, its hand size, and the colors it is known to
+      be out of. A seat that has to draw because it can't follow the live card holds no card
+      of that color and no wild card, and stays so until it draws again from a forced draw or
+      a later turn (the card drawn to follow is played at once when it matches).
+
+    Queries take the asking seat's hand, whose cards it can see, and answer in constant
+    time (a scan of at most one color or face bucket of the hand).
+
+    Parameters
+    ----------
+    players_no : int
+        Total number of players.
+    """
+
+    __slots__ = (
+        "players_no",
+        "unseen",
+        "unseen_colors",
+        "unseen_faces",
+        "unseen_total",
+        "played",
+        "hand_sizes",
+        "voids",
+    )
+
+    def __init__(self, players_no):
+        self.players_no = players_no
+        self.unseen = [0] * len(all_cards)
+        self.unseen_colors = {}
+        self.unseen_faces = {}
+        self.unseen_total = 0
+        self.played = [[0] * len(all_cards) for _ in range(players_no)]
+        self.hand_sizes = [0] * players_no
+        self.voids = [set() for _ in range(players_no)]
+
+    def reset(self, game_state):
+        """
+        Starts tracking a freshly dealt game: every card is unseen but the starting live card.
+        """
+        unseen = self.unseen = [0] * len(all_cards)
+        unseen_colors = self.unseen_colors = {}
+        unseen_faces = self.unseen_faces = {}
+        for card in game_state.card_deck:
+            unseen[card.card_id] += 1
+            unseen_colors[card.color] = unseen_colors.get(card.color, 0) + 1
+            unseen_faces[card.face] = unseen_faces.get(card.face, 0) + 1
+        self.unseen_total = len(game_state.card_deck)
+        self.played = [[0] * len(all_cards) for _ in range(self.players_no)]
+        self.hand_sizes = [len(hand) for hand in game_state.all_players_deck]
+        self.voids = [set() for _ in range(self.players_no)]
+        for card in game_state.table_deck:
+            self._reveal(card)
+
+    def _reveal(self, card):
+        self.unseen[card.card_id] -= 1
+        self.unseen_colors[card.color] -= 1
+        self.unseen_faces[card.face] -= 1
+        self.unseen_total -= 1
+
+    ########################################
+    # Engine Hooks
+    ########################################
+
+    def record_play(self, player_id, card):
+        self._reveal(card)
+        self.played[player_id - 1][card.card_id] += 1
+        self.hand_sizes[player_id - 1] -= 1
+
+    def record_draw(self, player_id):
+        self.hand_sizes[player_id - 1] += 1
+        # The drawn card is unknown, whatever the seat was out of it may hold now
+        self.voids[player_id - 1].clear()
+
+    def record_void(self, player_id, livecard):
+        """
+        Records that a seat had to draw because it couldn't follow the live card.
+        """
+        self.voids[player_id - 1].update((livecard.color, possible_colors[4]))
+
+    def record_reshuffle(self, cards):
+        """
+        Records cards of the table deck going back into the folded deck, unseen again.
+        """
+        unseen = self.unseen
+        unseen_colors = self.unseen_colors
+        unseen_faces = self.unseen_faces
+        for card in cards:
+            unseen[card.card_id] += 1
+            unseen_colors[card.color] += 1
+            unseen_faces[card.face] += 1
+        self.unseen_total += len(cards)
+
+    def record_swap(self, player_id, other_player_id):
+        """
+        Records two seats swapping hands, what is known of a hand goes along with it.
+        """
+        first, second = player_id - 1, other_player_id - 1
+        hand_sizes = self.hand_sizes
+        voids = self.voids
+        hand_sizes[first], hand_sizes[second] = hand_sizes[second], hand_sizes[first]
+        voids[first], voids[second] = voids[second], voids[first]
+
+    ########################################
+    # Queries
+    ########################################
+
+    def unseen_count(self, card, hand=None):
+        """
+        Returns how many copies of a card kind the owner of hand hasn't seen yet.
+        """
+        count = self.unseen[card.card_id]
+        return count if hand is None else count - hand.count(card)
+
+    def unseen_color(self, color, hand=None):
+        """
+        Returns how many cards of a color the owner of hand hasn't seen yet, "black" for wild cards.
+        """
+        count = self.unseen_colors.get(color, 0)
+        return count if hand is None else count - hand.color_count(color)
+
+    def unseen_face(self, face, hand=None):
+        """
+        Returns how many cards with a face the owner of hand hasn't seen yet.
+        """
+        count = self.unseen_faces.get(face, 0)
+        return count if hand is None else count - hand.face_count(face)
+
+    def played_count(self, player_id, card):
+        """
+        Returns how many copies of a card kind a seat was seen playing this game.
+        """
+        return self.played[player_id - 1][card.card_id]
+
+    def hand_size(self, player_id):
+        return self.hand_sizes[player_id - 1]
+
+    def is_void(self, player_id, color):
+        """
+        Checks whether a seat is known to hold no card of a color, "black" for wild cards.
+        """
+        return color in self.voids[player_id - 1]
+
+    def holding_probability(self, player_id, card, hand):
+        """
+        Estimates the probability that a seat holds at least one copy of a card kind.
+
+        The cards the owner of hand can't see (the other hands and the folded deck) are
+        taken as equally likely to be anywhere, except that a seat known to be out of the
+        card's color holds none.
+
+        Parameters
+        ----------
+        player_id : int
+            Id of the seat asked about.
+        card : Card
+            The card kind.
+        hand : Hand
+            Hand of the asking seat.
+
+        Returns
+        -------
+        float
+            The probability, between 0 and 1.
+        """
+        if card.color in self.voids[player_id - 1]:
+            return 0.0
+        copies = self.unseen[card.card_id] - hand.count(card)
+        pool = self.unseen_total - len(hand)
+        held = self.hand_sizes[player_id - 1]
+        if copies <= 0 or held <= 0:
+            return 0.0
+        if pool - copies < held:
+            return 1.0
+        # 1 - C(pool - copies, held) / C(pool, held), through log-gamma to stay constant time
+        none_held = exp(
+            lgamma(pool - copies + 1)
+            - lgamma(pool - copies - held + 1)
+            - lgamma(pool + 1)
+            + lgamma(pool - held + 1)
+        )
+        return 1.0 - none_held
+
+
+def attach_tracker(game_state):
+    """
+    Starts tracking public card knowledge in a game, available as game_state.tracker.
+
+    Parameters
+    ----------
+    game_state : GameState
+        State of a game, dealt or not. Games dealt later are tracked from their deal.
+
+    Returns
+    -------
+    CardTracker
+        The game's tracker.
+    """
+    tracker = CardTracker(game_state.players_no)
+    game_state.tracker = tracker
+    if game_state.table_deck:
+        tracker.reset(game_state)
+    return tracker
@@ -0,0 +1,41 @@
+import argparse
+from engine.analytics import GameAnalytics
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report the streaming analytics saved by run_simulation.py --analytics"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        metavar="JSON_PATH",
+        help="analytics files, several files (e.g. one per worker or machine) are merged",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="confidence level of the intervals",
+    )
+    parser.add_argument(
+        "--merge-into",
+        default=None,
+        metavar="JSON_PATH",
+        help="also save the merged analytics to JSON_PATH",
+    )
+    args = parser.parse_args()
+    if not 0 < args.confidence < 1:
+        parser.error("--confidence must be between 0 and 1")
+
+    analytics = GameAnalytics.load(args.paths[0])
+    for path in args.paths[1:]:
+        analytics.merge(GameAnalytics.load(path))
+    if args.merge_into is not None:
+        analytics.save(args.merge_into)
+
+    print(analytics.report(args.confidence))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import sys
+from benchmarks.suite import (
+    baseline_path,
+    baseline_runs,
+    compare_memory,
+    confirm_regressions,
+    default_threshold,
+    load_baseline,
+    median_results,
+    print_report,
+    run_suite,
+    save_baseline,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the engine's hot paths and full headless games"
+    )
+    parser.add_argument(
+        "--baseline", default=baseline_path, help="path of the JSON baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=default_threshold,
+        help="largest accepted throughput drop or peak memory growth, as a fraction of the "
+        "baseline",
+    )
+    parser.add_argument(
+        "--scale", type=int, default=1, help="multiplies the work of every benchmark"
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help=f"write the median of {baseline_runs} runs as the new baseline",
+    )
+    args = parser.parse_args()
+
+    results = run_suite(args.scale)
+    baseline = load_baseline(args.baseline)
+    rows = memory_rows = []
+    if baseline:
+        rows = confirm_regressions(results, baseline, args.threshold, args.scale)
+        memory_rows = compare_memory(results, baseline, args.threshold)
+    print_report(results, rows, memory_rows)
+
+    if args.save:
+        runs = [results] + [run_suite(args.scale) for _ in range(baseline_runs - 1)]
+        save_baseline(median_results(runs), args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+    elif baseline is None:
+        print(f"No baseline at {args.baseline}, run with --save to create one")
+    regressions = [row[0] for row in rows if row[4]]
+    regressions += [f"{row[0]} peak memory" for row in memory_rows if row[4]]
+    if regressions and not args.save:
+        print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,129 @@
-from engine import set_game, main_move_manager
+import argparse
+from engine import set_game, rule_sets, Session, load_game
+from engine.game_management import difficulty_names
 
-variable_list = set_game()
+parser = argparse.ArgumentParser(description="Play UNO on the command line")
+parser.add_argument(
+    "--config",
+    default=None,
+    metavar="JSON_PATH",
+    help="JSON file of default options, keyed by their names (players, names, hand, seed, "
+    "difficulty, skip_intro, rules, ...), the command line overrides them",
+)
+parser.add_argument("--players", type=int, default=None, help="total number of players")
+parser.add_argument(
+    "--names",
+    nargs="+",
+    default=None,
+    help="names of the players, yours first, then the AI opponents'",
+)
+parser.add_argument(
+    "--hand", type=int, default=None, help="number of cards in the first hand"
+)
+parser.add_argument(
+    "--difficulty", choices=difficulty_names, default=None, help="AI difficulty"
+)
+parser.add_argument(
+    "--seed", type=int, default=None, help="seed of the shuffles and of the easy AI"
+)
+parser.add_argument(
+    "--skip-intro",
+    action="store_true",
+    help="skip the welcome screen and the rules prompt",
+)
+parser.add_argument(
+    "--profile-phases",
+    nargs="?",
+    const="",
+    default=None,
+    metavar="JSON_PATH",
+    help="time each phase of every turn, printed at exit or written to JSON_PATH",
+)
+parser.add_argument(
+    "--cprofile",
+    default=None,
+    metavar="PROF_PATH",
+    help="run the session under cProfile and write the stats to PROF_PATH",
+)
+parser.add_argument(
+    "--games",
+    type=int,
+    default=None,
+    help="number of games to play back to back, by default you are asked after each game",
+)
+parser.add_argument(
+    "--rules",
+    choices=sorted(rule_sets),
+    default="standard",
+    help="house rule variant to play with",
+)
+parser.add_argument(
+    "--resume",
+    default=None,
+    metavar="SAVE_PATH",
+    help="resume the game saved in SAVE_PATH, which keeps being saved there",
+)
+parser.add_argument(
+    "--save",
+    default=None,
+    metavar="SAVE_PATH",
+    help="save the game to SAVE_PATH when it is interrupted with Ctrl-C",
+)
+parser.add_argument(
+    "--autosave",
+    type=int,
+    default=None,
+    metavar="TURNS",
+    help="also save the game every TURNS turns, needs --save or --resume",
+)
+args = parser.parse_args()
+if args.config is not None:
+    import json
 
-while True:
-    variable_list = main_move_manager(variable_list)
+    with open(args.config, encoding="utf-8") as config_file:
+        config = json.load(config_file)
+    unknown = [key for key in config if key not in vars(args) or key == "config"]
+    if unknown:
+        parser.error(f"unknown options in {args.config}: {', '.join(unknown)}")
+    # The file's values become the defaults, argparse doesn't check defaults against choices
+    parser.set_defaults(**config)
+    args = parser.parse_args()
+    if args.rules not in rule_sets:
+        parser.error(f"unknown rules in {args.config}: {args.rules}")
+    if args.difficulty not in (None, *difficulty_names):
+        parser.error(f"unknown difficulty in {args.config}: {args.difficulty}")
+if args.players is not None and args.players < 2:
+    parser.error("--players needs at least 2 players")
+if args.names is not None and len(args.names) < 2:
+    parser.error("--names needs your name and at least one AI opponent's")
+if args.hand is not None and args.hand < 1:
+    parser.error("--hand needs at least 1 card")
+if args.games is not None and args.games < 1:
+    parser.error("--games needs at least 1 game")
+if args.names is not None and args.players not in (None, len(args.names)):
+    parser.error("--names needs one name per player")
+save_path = args.save or args.resume
+if args.autosave is not None and (save_path is None or args.autosave < 1):
+    parser.error("--autosave needs a positive number of turns and --save or --resume")
+if args.profile_phases is not None or args.cprofile is not None:
+    from engine.profiling import enable_cprofile, enable_phase_profiling
+
+    if args.profile_phases is not None:
+        enable_phase_profiling(args.profile_phases or None)
+    if args.cprofile is not None:
+        enable_cprofile(args.cprofile)
+
+if args.resume is not None:
+    game_state = load_game(args.resume)
+    print(f"Resuming the game saved after {game_state.turns} turns")
+else:
+    game_state = set_game(
+        args.rules,
+        players_no=args.players,
+        first_hand_count=args.hand,
+        players_names=args.names,
+        difficulty=args.difficulty,
+        seed=args.seed,
+        skip_intro=args.skip_intro,
+    )
+Session(game_state, games=args.games, save_path=save_path, autosave_every=args.autosave).run()
@@ -0,0 +1,77 @@
+import argparse
+import sys
+from engine import rule_sets, run_ladder
+from engine.strategies import builtin_strategies
+
+
+def print_progress(games_done, ladder):
+    """
+    Prints the games played and the current leader on a single stderr line.
+    """
+    name, rating, _, _ = ladder.ranking()[0]
+    sys.stderr.write(f"\r{games_done} games played, leader {name} ({rating:.0f})")
+    sys.stderr.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rate AI strategies against each other on an Elo ladder"
+    )
+    parser.add_argument("--games", type=int, default=10000, help="number of games")
+    parser.add_argument("--players", type=int, default=4, help="players per game")
+    parser.add_argument("--hand", type=int, default=7, help="cards in the first hand")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the ladder")
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=sorted(builtin_strategies) + ["endgame", "ismcts"],
+        default=sorted(builtin_strategies),
+        help="strategies to rate, endgame solves the last cards exactly and ismcts plays a fast "
+        "search, both are much slower than the others",
+    )
+    parser.add_argument(
+        "--rules",
+        choices=sorted(rule_sets),
+        default="standard",
+        help="house rule variant every game is played with",
+    )
+    args = parser.parse_args()
+    if len(set(args.strategies)) < 2:
+        parser.error("--strategies needs at least two different strategies")
+
+    strategies = {}
+    for offset, name in enumerate(dict.fromkeys(args.strategies)):
+        strategy_seed = None if args.seed is None else args.seed + offset
+        if name == "ismcts":
+            # Imported here, it is only needed when the search plays on the ladder
+            from engine.ismcts import ISMCTS
+
+            strategies[name] = ISMCTS(time_budget=0.02, rollouts=50, seed=strategy_seed)
+        elif name == "endgame":
+            from engine.endgame import EndgameSolver
+
+            strategies[name] = EndgameSolver(
+                fallback=builtin_strategies["hold_wilds"](strategy_seed), seed=strategy_seed
+            )
+        else:
+            strategies[name] = builtin_strategies[name](strategy_seed)
+
+    ladder, elapsed = run_ladder(
+        strategies,
+        args.games,
+        args.players,
+        args.hand,
+        seed=args.seed,
+        progress=print_progress,
+        rule_set=args.rules,
+    )
+    sys.stderr.write("\n")
+
+    print(f"{'strategy':<16}{'rating':>8}{'games':>10}{'win rate':>10}")
+    for name, rating, games, wins in ladder.ranking():
+        print(f"{name:<16}{rating:>8.0f}{games:>10}{wins / max(games, 1):>10.1%}")
+    print(f"Games per second: {args.games / elapsed if elapsed > 0 else 0:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+from engine import replay_log
+from engine.event_log import describe_event
+from engine.printing_functions import emit, flush_frame, print_livecard
+
+
+def step_through(game_state, kind, player, payload):
+    """
+    Shows an event and the live card after it, then waits for Enter.
+    """
+    emit(describe_event(kind, player, payload))
+    print_livecard(game_state)
+    flush_frame()
+    input("Press Enter for the next event\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a game event log through the rules and verify every game"
+    )
+    parser.add_argument("log", help="path of the binary event log")
+    parser.add_argument(
+        "--step", action="store_true", help="show the events one at a time"
+    )
+    args = parser.parse_args()
+
+    summary = replay_log(args.log, on_event=step_through if args.step else None)
+
+    print(f"Games replayed  : {summary.games}")
+    print(f"Events replayed : {summary.events}")
+    print(f"Elapsed seconds : {summary.elapsed:.3f}")
+    print(
+        f"Events per second: {summary.events / summary.elapsed if summary.elapsed > 0 else 0:.0f}"
+    )
+    print("Every final state matches the log")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import argparse
+import asyncio
+import logging
+from engine.server import GameServer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Host UNO tables for players connecting over TCP"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=7777, help="port to listen on")
+    args = parser.parse_args()
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(message)s")
+
+    print(f"Serving UNO tables on {args.host}:{args.port}, press Ctrl+C to stop")
+    try:
+        asyncio.run(GameServer().serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import argparse
+import os
+import sys
+from engine import simulate_games, run_farm, rule_sets, EventLog, ResultsStore
+from engine.profiling import enable_cprofile, enable_phase_profiling
+
+
+def print_progress(games_done, games):
+    """
+    Prints the progress of a simulation farm run on a single stderr line.
+    """
+    sys.stderr.write(f"\r{games_done}/{games} games played")
+    if games_done >= games:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless all-AI UNO simulations")
+    parser.add_argument("--games", type=int, default=1000, help="number of games")
+    parser.add_argument("--players", type=int, default=4, help="players per game")
+    parser.add_argument("--hand", type=int, default=7, help="cards in the first hand")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the first game")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes, 0 uses every CPU and 1 plays in this process",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=250, help="games per worker batch"
+    )
+    parser.add_argument(
+        "--numpy",
+        action="store_true",
+        help="play all games in lockstep with the NumPy batch engine",
+    )
+    parser.add_argument(
+        "--rules",
+        choices=sorted(rule_sets),
+        default="standard",
+        help="house rule variant every game is played with",
+    )
+    parser.add_argument(
+        "--log",
+        default=None,
+        help="append every game's events to this binary log, played in this process",
+    )
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="record every game in this SQLite results store, e.g. data/report/uno_results.db",
+    )
+    parser.add_argument(
+        "--analytics",
+        default=None,
+        metavar="JSON_PATH",
+        help="stream every game into constant-memory analytics saved to JSON_PATH, merged into "
+        "it if it exists, show them with run_analytics.py",
+    )
+    parser.add_argument(
+        "--profile-phases",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="JSON_PATH",
+        help="time each phase of every turn played in this process, printed at exit or written to JSON_PATH",
+    )
+    parser.add_argument(
+        "--cprofile",
+        default=None,
+        metavar="PROF_PATH",
+        help="run under cProfile and write the stats to PROF_PATH",
+    )
+    args = parser.parse_args()
+    if args.profile_phases is not None:
+        enable_phase_profiling(args.profile_phases or None)
+    if args.cprofile is not None:
+        enable_cprofile(args.cprofile)
+    if args.log is not None and (args.numpy or args.workers != 1):
+        parser.error("--log plays the games in this process, without --numpy or --workers")
+    if args.numpy and args.rules != "standard":
+        parser.error("--numpy only plays the standard rules")
+
+    store = ResultsStore(args.store) if args.store is not None else None
+    analytics = None
+    if args.analytics is not None:
+        from engine.analytics import GameAnalytics
+
+        if os.path.exists(args.analytics):
+            analytics = GameAnalytics.load(args.analytics)
+        else:
+            analytics = GameAnalytics()
+    recording = store is not None or analytics is not None
+
+    def record_result(result):
+        if store is not None:
+            store.add_result(result, args.players, args.hand)
+        if analytics is not None:
+            analytics.add(result, args.players)
+
+    if args.numpy:
+        # Imported here so NumPy is only needed for the batch engine
+        from engine.batch import batch_game_results, simulate_batch
+
+        batch_result = simulate_batch(args.games, args.players, args.hand, args.seed)
+        total_turns = int(batch_result.turns.sum())
+        games_played = int((batch_result.winner > 0).sum())
+        elapsed = batch_result.elapsed
+        if recording:
+            for result in batch_game_results(batch_result):
+                record_result(result)
+    elif args.workers == 1:
+        # Results are counted and recorded as the games end, none of them is kept
+        totals = {"games": 0, "turns": 0}
+
+        def count_result(result):
+            totals["games"] += 1
+            totals["turns"] += result.turns
+            if recording:
+                record_result(result)
+
+        event_log = EventLog(args.log) if args.log is not None else None
+        try:
+            summary = simulate_games(
+                args.games,
+                args.players,
+                args.hand,
+                args.seed,
+                event_log,
+                args.rules,
+                on_result=count_result,
+            )
+        finally:
+            if event_log is not None:
+                event_log.close()
+        total_turns = totals["turns"]
+        games_played = totals["games"]
+        elapsed = summary.elapsed
+    else:
+        report, elapsed, cancelled = run_farm(
+            args.games,
+            args.players,
+            args.hand,
+            seed=args.seed,
+            workers=args.workers or None,
+            batch_size=args.batch_size,
+            progress=print_progress,
+            on_result=record_result if recording else None,
+            rule_set=args.rules,
+        )
+        total_turns = report["turns_total"]
+        games_played = report["games"]
+        if cancelled:
+            print("\nCancelled, showing the games finished so far")
+        for winner_name, wins in report["wins"].most_common(5):
+            print(f"{winner_name:<16}: {wins} wins")
+        if games_played:
+            print(
+                f"Mean cards played: {report['cards_played_total'] / games_played:.1f}"
+            )
+
+    print(f"Games played    : {games_played}")
+    print(f"Mean turns      : {total_turns / max(games_played, 1):.1f}")
+    print(f"Elapsed seconds : {elapsed:.3f}")
+    print(f"Games per second: {games_played / elapsed if elapsed > 0 else 0:.1f}")
+    if store is not None:
+        store.close()
+        print(f"Results recorded in {args.store}")
+    if analytics is not None:
+        analytics.save(args.analytics)
+        print(f"Analytics of {analytics.games} games saved to {args.analytics}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+from engine import ResultsStore
+from engine.leaderboard import rebuild_leaderboard
+from engine.results_store import results_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Show the leaderboard of the games in the results store"
+    )
+    parser.add_argument(
+        "--store", default=results_path, help="path of the SQLite results store"
+    )
+    parser.add_argument("--top", type=int, default=10, help="number of players to list")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="recompute the summary from every recorded game first",
+    )
+    args = parser.parse_args()
+
+    with ResultsStore(args.store) as store:
+        if args.rebuild:
+            rebuild_leaderboard(store.connection)
+        leaderboard = store.leaderboard(args.top)
+
+    games = leaderboard["games"]
+    print(f"Games recorded  : {games}")
+    if not games:
+        return
+    percentiles = leaderboard["cards_played_percentiles"]
+    print(f"Mean game length: {leaderboard['mean_cards_played']:.1f} cards played")
+    print(
+        "Game length     : "
+        + ", ".join(
+            f"p{percentile} {length}" for percentile, length in percentiles.items()
+        )
+    )
+    face, color, wins = leaderboard["top_winning_card"]
+    print(f"Top winning card: {color} {face.strip() or 'wild'} ({wins} wins)")
+    print("Leaderboard:-")
+    for rank, (winner_name, wins, played, win_share) in enumerate(
+        leaderboard["top_winners"], start=1
+    ):
+        print(
+            f"{rank:>3}. {winner_name:<16} {wins:>8} wins {played:>8} games {win_share:>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import random
+import statistics
+import pytest
+from engine.analytics import GameAnalytics, QuantileSketch, RunningStats
+from engine.simulation import simulate_games
+
+
+def test_running_stats_match_the_whole_sample():
+    rng = random.Random(1)
+    values = [rng.expovariate(0.1) for _ in range(5000)]
+    whole, first, second = RunningStats(), RunningStats(), RunningStats()
+    for value in values:
+        whole.add(value)
+    for value in values[:1234]:
+        first.add(value)
+    for value in values[1234:]:
+        second.add(value)
+    merged = first.merge(second)
+
+    for stats in (whole, merged):
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(statistics.fmean(values))
+        assert stats.variance == pytest.approx(statistics.variance(values))
+        assert (stats.minimum, stats.maximum) == (min(values), max(values))
+
+
+def test_quantile_sketch_stays_within_its_accuracy():
+    rng = random.Random(2)
+    values = sorted(rng.lognormvariate(3, 1) for _ in range(20000))
+    sketch, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in values:
+        sketch.add(value)
+    for index, value in enumerate(values):
+        (first if index % 2 else second).add(value)
+    merged = first.merge(second)
+
+    for share in (0.01, 0.25, 0.5, 0.9, 0.99):
+        exact = values[int(share * (len(values) - 1))]
+        assert sketch.quantile(share) == pytest.approx(exact, rel=0.011)
+        assert merged.quantile(share) == sketch.quantile(share)
+    with pytest.raises(ValueError):
+        sketch.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_merged_game_analytics_match_one_run(tmp_path):
+    results = simulate_games(300, 4, 7, seed=1).results
+    whole, first, second = GameAnalytics(), GameAnalytics(), GameAnalytics()
+    for result in results:
+        whole.add(result, 4)
+    for result in results[:100]:
+        first.add(result, 4)
+    for result in results[100:]:
+        second.add(result, 4)
+    path = tmp_path / "analytics.json"
+    second.save(path)
+    merged = first.merge(GameAnalytics.load(path))
+
+    seat_wins = [sum(result.winner == seat for result in results) for seat in range(1, 5)]
+    mean_turns = statistics.fmean(result.turns for result in results)
+
+    for analytics in (whole, merged):
+        assert analytics.games == len(results)
+        assert analytics.seat_wins == {4: seat_wins}
+        assert analytics.turns.stats.mean == pytest.approx(mean_turns)
+        assert analytics.exhausted_games == sum(result.reshuffles > 0 for result in results)
+        assert sum(games for games, _, _ in analytics.starting_faces.values()) == len(results)
+    assert merged.report() == whole.report()
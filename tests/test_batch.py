@@ -0,0 +1,39 @@
+import statistics
+import pytest
+from engine.batch import BatchGames, batch_game_results, simulate_batch
+from engine.simulation import simulate_games
+
+
+@pytest.mark.parametrize("players_no, first_hand_count", [(2, 7), (4, 7), (6, 10)])
+def test_batch_games_play_like_the_scalar_engine(players_no, first_hand_count):
+    results = []
+    simulate_games(2000, players_no, first_hand_count, seed=1, on_result=results.append)
+    batch = simulate_batch(2000, players_no, first_hand_count, seed=1)
+
+    assert batch.winner.min() >= 1
+    scalar_turns = statistics.mean(result.turns for result in results)
+    assert batch.turns.mean() == pytest.approx(scalar_turns, rel=0.05)
+    scalar_cards = statistics.mean(result.cards_played for result in results)
+    assert batch.cards_played.mean() == pytest.approx(scalar_cards, rel=0.05)
+
+
+def test_batch_keeps_every_card():
+    batch = BatchGames(500, 4, 7, seed=2)
+    total = batch.hands.sum(axis=(1, 2)) + batch.folded.sum(axis=1) + batch.table.sum(axis=1) + 1
+    for _ in range(30):
+        batch.step()
+        # The live card of a wild play is a recolored wild, counted as the card on top
+        counted = (
+            batch.hands.sum(axis=(1, 2)) + batch.folded.sum(axis=1) + batch.table.sum(axis=1) + 1
+        )
+        assert (counted == total).all()
+        assert (batch.hands.sum(axis=2) == batch.hand_sizes).all()
+        assert (batch.folded.sum(axis=1) == batch.folded_sizes).all()
+        assert (batch.folded >= 0).all()
+
+
+def test_batch_game_results_skip_unfinished_games():
+    batch = simulate_batch(100, 4, 7, seed=3, max_turns=20)
+    results = list(batch_game_results(batch))
+    assert len(results) == int((batch.winner > 0).sum())
+    assert all(result.turns <= 20 for result in results)
@@ -0,0 +1,38 @@
+from engine.endgame import EndgameSolver
+from engine.movements import player_available_moves
+from engine.simulation import new_headless_game
+
+
+def endgame_position(seed):
+    """
+    Deals the first seeded two player game of two cards each whose seat to move has a choice.
+    """
+    while True:
+        game_state = new_headless_game(2, 2, seed=seed)
+        available_moves, game_state = player_available_moves(game_state)
+        if len(available_moves) > 1:
+            return game_state, available_moves
+        seed += 1
+
+
+def test_repeated_position_hits_the_table():
+    game_state, available_moves = endgame_position(1)
+    solver = EndgameSolver(seed=1)
+
+    scores = solver.evaluate(game_state, available_moves)
+    hits, misses = solver.table.hits, solver.table.misses
+    assert misses > 0
+
+    assert solver.evaluate(game_state, available_moves) == scores
+    assert solver.table.hits > hits
+    assert solver.table.misses == misses
+
+
+def test_perfect_info_repeated_position_hits_the_table():
+    game_state, available_moves = endgame_position(2)
+    solver = EndgameSolver(perfect_info=True, seed=1)
+
+    scores = solver.evaluate(game_state, available_moves)
+    misses = solver.table.misses
+    assert solver.evaluate(game_state, available_moves) == scores
+    assert solver.table.misses == misses
@@ -0,0 +1,51 @@
+import pytest
+from engine.ladder import EloLadder, run_ladder
+from engine.strategies import builtin_strategies
+
+
+def test_strategy_in_several_seats_is_one_opponent():
+    heads_up = EloLadder(["a", "b"])
+    heads_up.record_game(["a", "b"], "a")
+    crowded = EloLadder(["a", "b"])
+    crowded.record_game(["a", "b", "b", "b"], "a")
+    assert crowded.ratings == pytest.approx(heads_up.ratings)
+    assert crowded.games == {"a": 1, "b": 1}
+
+
+def test_table_of_one_strategy_keeps_its_rating():
+    ladder = EloLadder(["a", "b"])
+    ladder.record_game(["a", "a"], "a")
+    assert ladder.ratings == {"a": 1500.0, "b": 1500.0}
+    assert ladder.wins["a"] == 1
+
+
+def seeded_strategies(names, seed):
+    return {name: builtin_strategies[name](seed) for name in names}
+
+
+def test_seeded_ladder_is_reproducible():
+    names = ["random", "majority_color", "hold_wilds", "card_counter"]
+    first, _ = run_ladder(seeded_strategies(names, 1), 200, 3, 7, seed=1)
+    second, _ = run_ladder(seeded_strategies(names, 1), 200, 3, 7, seed=1)
+    assert first.ranking() == second.ranking()
+    # Three distinct strategies at every table
+    assert sum(first.games.values()) == 3 * 200
+    assert sum(first.wins.values()) == 200
+
+
+def test_ladder_ranks_random_play_last():
+    strategies = seeded_strategies(["random", "majority_color"], 1)
+    ladder, _ = run_ladder(strategies, 1000, 2, 7, seed=1)
+    assert [name for name, _, _, _ in ladder.ranking()] == ["majority_color", "random"]
+    # Heads-up, the points one side gains the other loses
+    assert sum(ladder.ratings.values()) == pytest.approx(2 * 1500.0)
+
+
+def test_continued_ladder_keeps_its_ratings():
+    strategies = seeded_strategies(["random", "majority_color"], 2)
+    ladder, _ = run_ladder(strategies, 100, 2, 7, seed=2)
+    ratings = dict(ladder.ratings)
+    continued, _ = run_ladder(strategies, 100, 2, 7, seed=3, ladder=ladder)
+    assert continued is ladder
+    assert ladder.games == {"random": 200, "majority_color": 200}
+    assert ladder.ratings != ratings
@@ -0,0 +1,49 @@
+from collections import Counter
+from engine.cards import card_lookup, possible_faces
+from engine.leaderboard import load_leaderboard, rebuild_leaderboard
+from engine.results_store import ResultsStore
+from engine.simulation import simulate_games
+
+
+def test_incremental_leaderboard_matches_a_rebuild(tmp_path):
+    results = []
+    # A small batch size folds the games in over many incremental updates
+    with ResultsStore(str(tmp_path / "results.db"), batch_size=7) as store:
+        for players_no in (2, 3, 4):
+            for result in simulate_games(40, players_no, 7, seed=players_no).results:
+                store.add_result(result, players_no, 7)
+                results.append(result)
+        incremental = store.leaderboard(limit=100)
+        rebuild_leaderboard(store.connection)
+        assert load_leaderboard(store.connection, limit=100) == incremental
+
+    wins = Counter(result.winner_name for result in results)
+    assert incremental["games"] == len(results)
+    assert {name: won for name, won, _, _ in incremental["top_winners"]} == wins
+    played = {name: games for name, _, games, _ in incremental["top_winners"]}
+    # Seat 1 and 2 sit at every table, seat 4 only at the 4 player ones
+    assert played["Seat1-AI"] == played["Seat2-AI"] == 120
+    assert played["Seat4-AI"] == 40
+    cards_played = sum(result.cards_played for result in results)
+    assert incremental["mean_cards_played"] == cards_played / len(results)
+
+
+def test_every_player_counts_their_games(tmp_path):
+    card = card_lookup(possible_faces[1], "red")
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        store.add("Ann", 20, card, player_names=["Ann", "Bob"])
+        store.add("Ann", 25, card, player_names=["Ann", "Bob", "Cy", "Dee"])
+        store.add("Bob", 30, card, player_names=["Ann", "Bob"])
+        # Games from the CSV report only name their winner
+        store.add("Cy", 35, card)
+        leaderboard = store.leaderboard()
+
+    assert leaderboard["games"] == 4
+    # Players who never won are left off the list
+    assert leaderboard["top_winners"] == [
+        ("Ann", 2, 3, 0.5),
+        ("Bob", 1, 3, 0.25),
+        ("Cy", 1, 2, 0.25),
+    ]
+    assert leaderboard["cards_played_percentiles"][50] == 25
+    assert leaderboard["top_winning_card"] == (possible_faces[1], "red", 4)
@@ -0,0 +1,49 @@
+import pytest
+from engine.event_log import card_id_of
+from engine.movements import draw_card, pull_from_folded_deck, seat_after
+from engine.simulation import new_headless_game
+
+
+@pytest.mark.parametrize("players_no", [2, 3, 4, 7, 10])
+def test_seat_after_walks_the_ring(players_no):
+    for seat in range(1, players_no + 1):
+        assert seat_after(seat, 0, players_no) == seat
+        assert seat_after(seat, players_no, players_no) == seat
+        assert seat_after(seat, 1, players_no) == seat % players_no + 1
+        assert seat_after(seat_after(seat, 1, players_no), -1, players_no) == seat
+        for steps in range(-2 * players_no, 2 * players_no + 1):
+            assert 1 <= seat_after(seat, steps, players_no) <= players_no
+
+
+def test_seat_after_reverse_and_skip():
+    # A reverse at 4 players hands the turn back to the previous seat
+    assert seat_after(2, -1, 4) == 1
+    assert seat_after(1, -1, 4) == 4
+    # A skip moves two seats on
+    assert seat_after(3, 2, 4) == 1
+
+
+def test_table_deck_is_reshuffled_when_the_folded_deck_runs_out():
+    game_state = new_headless_game(4, 7, seed=3)
+    livecard = game_state.livecard
+    # Move all but three of the folded cards to the table, under the live card
+    game_state.table_deck[:0] = game_state.folded_deck[3:]
+    del game_state.folded_deck[3:]
+    recycled = sorted(map(card_id_of, game_state.table_deck[:-1]))
+    drawn = [pull_from_folded_deck(game_state) for _ in range(3)]
+    assert game_state.folded_deck == [] and game_state.reshuffles == 0
+
+    drawn.append(pull_from_folded_deck(game_state))
+    assert game_state.reshuffles == 1
+    assert game_state.table_deck == [livecard]
+    assert sorted(map(card_id_of, game_state.folded_deck + drawn[3:])) == recycled
+    assert None not in drawn
+
+
+def test_nothing_is_drawn_when_every_card_is_held():
+    game_state = new_headless_game(2, 7, seed=3)
+    game_state.folded_deck.clear()
+    hand = len(game_state.all_players_deck[game_state.move_counter - 1])
+    drawn_card, game_state = draw_card(game_state)
+    assert drawn_card is None and game_state.reshuffles == 0
+    assert len(game_state.all_players_deck[game_state.move_counter - 1]) == hand
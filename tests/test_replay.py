@@ -0,0 +1,105 @@
+import pytest
+from engine.event_log import EventLog, card_id_of, draw_event, play_event, read_events
+from engine.replay import ReplayError, replay_log
+from engine.simulation import new_headless_game, play_headless_game
+
+
+def log_games(path, games, players_no, first_hand_count, rule_set="standard"):
+    """
+    Plays seeded games into a log file and returns their final states.
+    """
+    event_log = EventLog(path)
+    final_states = []
+    for seed in range(games):
+        game_state = new_headless_game(
+            players_no, first_hand_count, seed=seed, event_log=event_log, rule_set=rule_set
+        )
+        _, game_state = play_headless_game(game_state)
+        final_states.append(game_state)
+        event_log.flush()
+    event_log.close()
+    return final_states
+
+
+@pytest.mark.parametrize("rule_set", ["standard", "draw_skips", "seven_o"])
+@pytest.mark.parametrize("players_no, first_hand_count", [(2, 7), (4, 7), (8, 15)])
+def test_replay_matches_played_games(tmp_path, players_no, first_hand_count, rule_set):
+    path = tmp_path / "games.unolog"
+    played = log_games(path, 10, players_no, first_hand_count, rule_set)
+
+    summary = replay_log(path)
+    assert summary.games == len(played)
+    for replayed, game_state in zip(summary.final_states, played):
+        assert replayed.winner == game_state.winner
+        assert replayed.turns == game_state.turns
+        assert replayed.reshuffles == game_state.reshuffles
+        assert [list(map(card_id_of, hand)) for hand in replayed.all_players_deck] == [
+            list(map(card_id_of, hand)) for hand in game_state.all_players_deck
+        ]
+
+
+def test_truncated_log_is_rejected(tmp_path):
+    path = tmp_path / "games.unolog"
+    log_games(path, 1, 4, 7)
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) // 2])
+    with pytest.raises(ValueError):
+        replay_log(path)
+
+
+def rewrite_log(source, target, change):
+    """
+    Copies a log event by event, change(index, event) returning the events to write instead.
+    """
+    events = list(read_events(source))
+    with EventLog(target) as event_log:
+        for index, event in enumerate(events):
+            for kind, player, payload in change(index, event):
+                event_log.record(kind, player, payload)
+
+
+def test_tampered_logs_are_rejected(tmp_path):
+    path = tmp_path / "games.unolog"
+    log_games(path, 1, 4, 7)
+    events = list(read_events(path))
+    first_play = next(index for index, event in enumerate(events) if event[0] == play_event)
+    first_draw = next(index for index, event in enumerate(events) if event[0] == draw_event)
+
+    def other_card(index, event):
+        kind, player, payload = event
+        if index == first_play:
+            payload = bytes([(payload[0] + 1) % 54])
+        return [(kind, player, payload)]
+
+    def dropped_draw(index, event):
+        return [] if index == first_draw else [event]
+
+    untouched = tmp_path / "untouched.unolog"
+    rewrite_log(path, untouched, lambda index, event: [event])
+    assert replay_log(untouched).games == 1
+
+    for number, change in enumerate((other_card, dropped_draw)):
+        tampered = tmp_path / f"tampered-{number}.unolog"
+        rewrite_log(path, tampered, change)
+        with pytest.raises(ReplayError):
+            replay_log(tampered)
+
+
+def test_games_are_appended_to_an_existing_log(tmp_path):
+    path = tmp_path / "games.unolog"
+    played = log_games(path, 3, 3, 7)
+    played += log_games(path, 2, 3, 7)
+    summary = replay_log(path)
+    assert summary.games == 5
+    assert [game_state.winner for game_state in summary.final_states] == [
+        game_state.winner for game_state in played
+    ]
+
+
+@pytest.mark.parametrize("header", [b"not a log at all\n", b"UNOLOG9\n"])
+def test_appending_to_another_file_is_refused(tmp_path, header):
+    path = tmp_path / "games.unolog"
+    path.write_bytes(header)
+    with pytest.raises(ValueError):
+        EventLog(path)
+    assert path.read_bytes() == header
@@ -0,0 +1,18 @@
+from engine.game_management import reset_game
+from engine.results_store import ResultsStore
+from engine.simulation import new_headless_game, play_headless_game
+
+
+def test_games_are_stored_with_their_seed(tmp_path):
+    _, game_state = play_headless_game(new_headless_game(3, 7, seed=42))
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        store.add_game(game_state)
+        # A new deal goes on from the last game's generator, it has no seed of its own
+        _, game_state = play_headless_game(reset_game(game_state))
+        store.add_game(game_state)
+        store.flush()
+        rows = store.connection.execute(
+            "SELECT seed, winner_seat, players_no FROM games ORDER BY game_id"
+        ).fetchall()
+    assert [seed for seed, _, _ in rows] == [42, None]
+    assert all(1 <= seat <= players_no == 3 for _, seat, players_no in rows)
@@ -0,0 +1,83 @@
+import pytest
+from engine.cards import all_cards, card_lookup, possible_faces
+from engine.movements import livecard_automove, turn_switcher
+from engine.rules import (
+    _compiled_effects,
+    compile_effects,
+    draw_two_and_skip_effect,
+    draw_two_effect,
+    register_rule_set,
+    rule_sets,
+    zero_rotate_effect,
+)
+from engine.simulation import new_headless_game
+
+
+def after_play(face, color, rule_set, players_no=4):
+    # The card was just played by seat 1, the turn has already passed to seat 2
+    game_state = new_headless_game(players_no, 7, seed=1, rule_set=rule_set)
+    game_state.livecard = card_lookup(face, color)
+    return turn_switcher(game_state)
+
+
+def test_dispatch_table_follows_card_faces():
+    for rule_set, face_effects in rule_sets.items():
+        effects = compile_effects(rule_set)
+        assert len(effects) == len(all_cards)
+        for card in all_cards:
+            assert effects[card.card_id] is face_effects.get(card.face)
+    assert compile_effects("standard")[card_lookup(possible_faces[10], "red").card_id] is (
+        draw_two_effect
+    )
+    assert compile_effects("draw_skips")[card_lookup(possible_faces[10], "red").card_id] is (
+        draw_two_and_skip_effect
+    )
+
+
+def test_unknown_rule_set_is_rejected():
+    with pytest.raises(ValueError):
+        compile_effects("unregistered")
+    with pytest.raises(ValueError):
+        new_headless_game(2, 7, seed=1, rule_set="unregistered")
+
+
+def test_registered_variant_replaces_the_compiled_table():
+    try:
+        register_rule_set(
+            "no_skips", {possible_faces[12]: None, possible_faces[0]: zero_rotate_effect}
+        )
+        effects = compile_effects("no_skips")
+        assert effects[card_lookup(possible_faces[12], "red").card_id] is None
+        assert effects[card_lookup(possible_faces[0], "red").card_id] is zero_rotate_effect
+        assert compile_effects("standard")[card_lookup(possible_faces[12], "red").card_id]
+    finally:
+        rule_sets.pop("no_skips")
+        _compiled_effects.clear()
+
+
+def test_draw_two_is_a_skip_only_under_draw_skips():
+    standard = after_play(possible_faces[10], "red", "standard")
+    hand = len(standard.all_players_deck[1])
+    standard = livecard_automove(standard)
+    assert len(standard.all_players_deck[1]) == hand + 2
+    assert standard.move_counter == 2
+
+    draw_skips = after_play(possible_faces[10], "red", "draw_skips")
+    hand = len(draw_skips.all_players_deck[1])
+    draw_skips = livecard_automove(draw_skips)
+    assert len(draw_skips.all_players_deck[1]) == hand + 2
+    assert draw_skips.move_counter == 3
+
+
+def test_zero_passes_every_hand_on_under_seven_o():
+    game_state = after_play(possible_faces[0], "red", "seven_o")
+    hands = [list(hand) for hand in game_state.all_players_deck]
+    game_state = livecard_automove(game_state)
+    # Play goes 1 -> 2 -> 3 -> 4, so seat 2 now holds the hand seat 1 had
+    for seat in range(4):
+        assert list(game_state.all_players_deck[(seat + 1) % 4]) == hands[seat]
+
+    standard = after_play(possible_faces[0], "red", "standard")
+    hands = [list(hand) for hand in standard.all_players_deck]
+    standard = livecard_automove(standard)
+    assert [list(hand) for hand in standard.all_players_deck] == hands
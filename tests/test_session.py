@@ -0,0 +1,18 @@
+import pytest
+from engine.session import Session
+from engine.simulation import new_headless_game
+
+
+@pytest.mark.parametrize("games", [0, 1, 3])
+def test_session_plays_the_requested_games(games):
+    finished = []
+    session = Session(new_headless_game(3, 7, seed=1), games=games, on_game_over=finished.append)
+    wins = session.run()
+    assert session.games_played == len(finished) == games
+    assert sum(wins.values()) == games
+
+
+def test_headless_session_plays_one_game_by_default():
+    session = Session(new_headless_game(3, 7, seed=1))
+    session.run()
+    assert session.games_played == 1
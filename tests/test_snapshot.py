@@ -0,0 +1,112 @@
+import json
+import pytest
+from engine.event_log import card_id_of
+from engine.movements import main_move_manager
+from engine.simulation import new_headless_game, play_headless_game
+from engine.snapshot import (
+    SnapshotError,
+    dump_game,
+    load_game,
+    load_game_bytes,
+    save_game,
+    snapshot_header,
+    snapshot_magic,
+)
+from engine.tracker import attach_tracker
+
+
+def hands_of(game_state):
+    return [list(map(card_id_of, hand)) for hand in game_state.all_players_deck]
+
+
+@pytest.mark.parametrize("rule_set", ["standard", "draw_skips", "seven_o"])
+@pytest.mark.parametrize("seed", range(5))
+def test_resumed_game_plays_on_like_the_saved_one(seed, rule_set):
+    game_state = new_headless_game(4, 7, seed=seed, rule_set=rule_set)
+    for _ in range(10):
+        if game_state.winner is None:
+            game_state = main_move_manager(game_state)
+
+    resumed = load_game_bytes(dump_game(game_state))
+    assert hands_of(resumed) == hands_of(game_state)
+    assert resumed.folded_deck == game_state.folded_deck
+    assert resumed.livecard == game_state.livecard
+
+    _, game_state = play_headless_game(game_state)
+    _, resumed = play_headless_game(resumed)
+    assert resumed.winner == game_state.winner
+    assert resumed.turns == game_state.turns
+    assert hands_of(resumed) == hands_of(game_state)
+
+
+def test_save_and_load_file(tmp_path):
+    game_state = new_headless_game(3, 7, seed=1)
+    path = tmp_path / "game.unosave"
+    save_game(game_state, path)
+    assert hands_of(load_game(path)) == hands_of(game_state)
+
+
+def test_pile_larger_than_two_bytes():
+    game_state = new_headless_game(2, 7, seed=1)
+    game_state.folded_deck = game_state.folded_deck * 1000
+    assert load_game_bytes(dump_game(game_state)).folded_deck == game_state.folded_deck
+
+
+def test_rejects_bad_snapshots():
+    game_state = new_headless_game(2, 7, seed=1)
+    snapshot = dump_game(game_state)
+    with pytest.raises(SnapshotError):
+        load_game_bytes(b"not a snapshot")
+    with pytest.raises(SnapshotError):
+        load_game_bytes(snapshot[:-10])
+
+    game_state.rule_set = "unregistered"
+    with pytest.raises(SnapshotError):
+        load_game_bytes(dump_game(game_state))
+
+
+def with_metadata(snapshot, change):
+    # Rewrites the JSON metadata of a snapshot, keeping the piles and generator after it
+    offset = len(snapshot_magic)
+    version, metadata_size = snapshot_header.unpack_from(snapshot, offset)
+    offset += snapshot_header.size
+    metadata = json.loads(snapshot[offset : offset + metadata_size])
+    change(metadata)
+    encoded = json.dumps(metadata).encode("utf-8")
+    return b"".join(
+        [
+            snapshot_magic,
+            snapshot_header.pack(version, len(encoded)),
+            encoded,
+            snapshot[offset + metadata_size :],
+        ]
+    )
+
+
+@pytest.mark.parametrize("key", ["rng_version", "gauss_next", "livecard", "seed", "tracker"])
+def test_missing_metadata_is_a_snapshot_error(key):
+    snapshot = dump_game(new_headless_game(2, 7, seed=1))
+    with pytest.raises(SnapshotError):
+        load_game_bytes(with_metadata(snapshot, lambda metadata: metadata.pop(key)))
+
+
+@pytest.mark.parametrize("key", ["rng_version", "livecard", "players_no", "tracker"])
+def test_malformed_metadata_is_a_snapshot_error(key):
+    snapshot = dump_game(new_headless_game(2, 7, seed=1))
+    with pytest.raises(SnapshotError):
+        load_game_bytes(with_metadata(snapshot, lambda metadata: metadata.update({key: "x"})))
+
+
+def test_tracker_is_restored():
+    game_state = new_headless_game(4, 7, seed=3)
+    attach_tracker(game_state)
+    for _ in range(25):
+        if game_state.winner is None:
+            game_state = main_move_manager(game_state)
+    tracker = game_state.tracker
+
+    resumed = load_game_bytes(dump_game(game_state))
+    assert resumed.seed == 3
+    for field in tracker.__slots__:
+        assert getattr(resumed.tracker, field) == getattr(tracker, field), field
+    assert load_game_bytes(dump_game(new_headless_game(2, 7, seed=1))).tracker is None